@@ -0,0 +1,175 @@
+"""
+Admission control for Job Application Tracker.
+
+Routes are assigned a cost class with ``AdmissionController.limit``. Each
+class admits at most ``limit`` requests at a time; up to ``queue`` more wait
+for a slot, each for at most ``max_wait`` seconds. A request arriving to a
+full queue, or whose wait runs out, is shed: ``Overloaded`` is raised and
+the app answers ``503`` with ``Retry-After`` straight away instead of tying
+up a worker thread. Classes are independent, so a burst of full-table reads
+cannot starve summary counts or writes.
+
+Limits apply per process; with several workers each enforces its own.
+"""
+
+import functools
+import math
+import threading
+import time
+from collections import Counter
+
+# name -> (concurrent requests, queued requests, seconds a queued request waits)
+DEFAULT_CLASSES = {
+    'heavy': (2, 4, 1.0),
+    'light': (8, 16, 0.5),
+    'write': (4, 16, 2.0),
+}
+
+# Weight of the newest request in the running average of service times
+SERVICE_TIME_WEIGHT = 0.2
+
+class Overloaded(Exception):
+    """A request was shed; ``retry_after`` is a hint in whole seconds"""
+
+    def __init__(self, cost_class, reason, retry_after):
+        super().__init__(f'{cost_class} requests are over capacity ({reason})')
+        self.cost_class = cost_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+class CostClass:
+    """Concurrency limit with a bounded, time-limited wait queue"""
+
+    def __init__(self, name, limit, queue, max_wait):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.peak_active = 0
+        self.peak_waiting = 0
+        self.counts = Counter()
+        # Running average of how long an admitted request holds its slot
+        self.service_time = None
+
+    def acquire(self):
+        """Take a slot, waiting in the queue if needed; raises ``Overloaded``"""
+        with self._cond:
+            # Newcomers queue behind existing waiters instead of overtaking them
+            if self.active < self.limit and not self.waiting:
+                self._admit()
+                return
+            if self.waiting >= self.queue:
+                self.counts['shed_queue_full'] += 1
+                raise Overloaded(self.name, 'queue full', self.retry_after())
+
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            self.counts['queued'] += 1
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counts['shed_timeout'] += 1
+                        raise Overloaded(self.name, 'wait timed out', self.retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self._admit()
+
+    def _admit(self):
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        self.counts['admitted'] += 1
+
+    def release(self, duration):
+        """Free a slot held for ``duration`` seconds and wake one waiter"""
+        with self._cond:
+            self.active -= 1
+            if self.service_time is None:
+                self.service_time = duration
+            else:
+                self.service_time += SERVICE_TIME_WEIGHT * (duration - self.service_time)
+            self._cond.notify()
+
+    def retry_after(self):
+        """Seconds until the current queue should have drained, at least 1"""
+        service_time = self.service_time or 0
+        return max(1, math.ceil(service_time * (self.waiting + 1) / max(self.limit, 1)))
+
+    def status(self):
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'queue': self.queue,
+                'max_wait': self.max_wait,
+                'active': self.active,
+                'waiting': self.waiting,
+                'peak_active': self.peak_active,
+                'peak_waiting': self.peak_waiting,
+                'service_time_ms': round(self.service_time * 1000, 1) if self.service_time is not None else None,
+                'admitted': self.counts['admitted'],
+                'queued': self.counts['queued'],
+                'shed_queue_full': self.counts['shed_queue_full'],
+                'shed_timeout': self.counts['shed_timeout'],
+            }
+
+class AdmissionController:
+    """Cost classes plus per-endpoint admitted/shed counts
+
+    ``classes`` maps a class name to ``(limit, queue, max_wait)``, by default
+    ``DEFAULT_CLASSES``. With ``enabled`` false every request is admitted.
+    """
+
+    def __init__(self, classes=None, enabled=True):
+        self.enabled = enabled
+        self.classes = {name: CostClass(name, *settings)
+                        for name, settings in (classes or DEFAULT_CLASSES).items()}
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def limit(self, cost_class):
+        """Decorator admitting a view's requests through ``cost_class``"""
+        if cost_class not in self.classes:
+            raise ValueError(f'Unknown cost class: {cost_class}')
+
+        def decorator(view):
+            name = view.__name__
+            with self._lock:
+                self._endpoints[name] = {'class': cost_class, 'admitted': 0, 'shed': 0}
+
+            @functools.wraps(view)
+            def wrapped(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+                limiter = self.classes[cost_class]
+                try:
+                    limiter.acquire()
+                except Overloaded:
+                    self._count(name, 'shed')
+                    raise
+                self._count(name, 'admitted')
+                start = time.monotonic()
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    limiter.release(time.monotonic() - start)
+            return wrapped
+        return decorator
+
+    def _count(self, endpoint, outcome):
+        with self._lock:
+            self._endpoints[endpoint][outcome] += 1
+
+    def status(self):
+        """Limits, current load and counters for every class and endpoint"""
+        with self._lock:
+            endpoints = {name: dict(stats) for name, stats in self._endpoints.items()}
+        return {
+            'enabled': self.enabled,
+            'classes': {name: limiter.status() for name, limiter in self.classes.items()},
+            'endpoints': endpoints,
+        }
@@ -1,10 +1,21 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import Flask, Response, render_template, send_file, request, jsonify, redirect, url_for, flash, session, g, abort
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import sqlite3
 import os
 from dotenv import load_dotenv
 import hashlib
+import tempfile
+from maintenance import MaintenanceScheduler
+from backup import BackupError, backup_database, default_backup_dir, list_snapshots
+from templating import PageCache, use_precompiled
+from profiling import RequestProfile, default_profile_dir, list_profiles, save_profile
+from admission import AdmissionController, DEFAULT_CLASSES as ADMISSION_CLASSES, Overloaded
+from events import EventBroker, stream_events
+from export import EXPORT_TABLES, FORMATS as EXPORT_FORMATS, export_table, import_pyarrow
+from repository import (APPLICATION_COLUMNS, AUTOCOMPLETE_FIELDS, SORT_COLUMNS, STATUSES, STATUS_ALIASES, STATUS_LABEL,
+                        SQLiteRepository, MemoryRepository, make_dedupe_key, canonicalize_url, filter_clause,
+                        normalize_date, normalize_timestamp)
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +23,12 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
+# Load templates from the build made by `python templating.py` when it matches the sources
+templates_precompiled = use_precompiled(app)
+
+# Rendered /login and /add pages, reused across requests
+pages = PageCache(app)
+
 # Initialize Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -22,6 +39,94 @@ login_manager.login_message_category = 'info'
 # Database configuration
 DATABASE = 'job_tracker.db'
 
+def create_repository():
+    """Storage engine selected by STORAGE_ENGINE (``sqlite``, the default, or ``memory``)
+
+    The memory engine persists to MEMORY_STORE_PATH when it is set.
+    """
+    if os.getenv('STORAGE_ENGINE', 'sqlite') == 'memory':
+        return MemoryRepository(os.getenv('MEMORY_STORE_PATH') or None,
+                                snapshot_every=int(os.getenv('MEMORY_SNAPSHOT_EVERY', 1000)))
+    return SQLiteRepository(lambda: app.config.get('DATABASE', DATABASE))
+
+# Applications, history and summary counts; routes go through this instead of SQL
+repository = create_repository()
+
+def create_admission():
+    """Admission control, on unless ADMISSION_CONTROL=0
+
+    Each cost class can be resized with ``ADMISSION_<CLASS>=limit,queue,max_wait``,
+    for example ``ADMISSION_HEAVY=4,8,2.5``.
+    """
+    classes = {}
+    for name, defaults in ADMISSION_CLASSES.items():
+        setting = os.getenv(f'ADMISSION_{name.upper()}')
+        if setting:
+            limit, queue, max_wait = setting.split(',')
+            classes[name] = (int(limit), int(queue), float(max_wait))
+        else:
+            classes[name] = defaults
+    return AdmissionController(classes, enabled=os.getenv('ADMISSION_CONTROL', '1') != '0')
+
+# Per-class concurrency limits; overloaded routes answer 503 instead of queueing forever
+admission = create_admission()
+
+# Background ANALYZE / optimize / checkpoint / vacuum (started by start_maintenance)
+maintenance = MaintenanceScheduler(lambda: app.config.get('DATABASE', DATABASE))
+
+# Change feed for /api/events; write routes publish after they commit
+events = EventBroker()
+
+@app.before_request
+def count_request():
+    """Feed request traffic to the maintenance scheduler so heavy tasks can back off"""
+    maintenance.record_request()
+
+def profiling_settings():
+    """(enabled, profile directory, profiles kept) from PROFILING_ENABLED, PROFILE_DIR and PROFILE_KEEP"""
+    directory = os.getenv('PROFILE_DIR') or default_profile_dir(app.config.get('DATABASE', DATABASE))
+    return os.getenv('PROFILING_ENABLED', '0') == '1', directory, int(os.getenv('PROFILE_KEEP', 20))
+
+@app.before_request
+def start_profile():
+    """Profile this request when a logged-in user opts in with ``X-Profile: 1`` or ``_profile=1``"""
+    if '1' not in (request.headers.get('X-Profile'), request.args.get('_profile')):
+        return
+    if not current_user.is_authenticated:
+        return
+    if not profiling_settings()[0]:
+        g.profile_skipped = 'disabled'
+        return
+    g.profile = RequestProfile.start()
+    if g.profile is None:
+        g.profile_skipped = 'busy'
+
+@app.after_request
+def finish_profile(response):
+    """Save the request's profile and name it in ``X-Profile-Id``"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        _, directory, keep = profiling_settings()
+        response.headers['X-Profile-Id'] = save_profile(profile.stop(), directory, keep, request.method,
+                                                        request.full_path.rstrip('?'), response.status_code)
+    elif 'profile_skipped' in g:
+        response.headers['X-Profile-Skipped'] = g.profile_skipped
+    return response
+
+@app.teardown_request
+def stop_profile(error=None):
+    """Release the profiler when the request failed before ``finish_profile``"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.stop()
+
+@app.errorhandler(Overloaded)
+def overloaded(error):
+    """Shed requests get a fast 503 with a hint of when to come back"""
+    response = jsonify({'success': False, 'message': f'Server busy: {error}, retry shortly'})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
 # Simple User class for authentication
 class User(UserMixin):
     def __init__(self, id):
@@ -45,12 +150,33 @@ def verify_credentials(username, password):
     
     return username == expected_username and hash_password(password) == hash_password(expected_password)
 
-def init_db():
-    """Initialize the database with the required tables"""
-    db_path = app.config.get('DATABASE', DATABASE)
+def init_db(db_path=None):
+    """Initialize the database with the required tables
+
+    Works on ``db_path`` when given, otherwise on the configured database.
+    """
+    db_path = db_path or app.config.get('DATABASE', DATABASE)
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
+    # Lets the maintenance scheduler release free pages with incremental_vacuum.
+    # Only takes effect on new databases; older ones switch on their next VACUUM.
+    cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    
+    # Status lookup: rows store the integer id, the API and the UI use the label
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS statuses (
+            id INTEGER PRIMARY KEY,
+            label TEXT NOT NULL UNIQUE,
+            ordinal INTEGER NOT NULL,
+            is_terminal INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.executemany('''
+        INSERT OR IGNORE INTO statuses (id, label, ordinal, is_terminal) VALUES (?, ?, ?, ?)
+    ''', [(status_id, label, ordinal, int(is_terminal))
+          for ordinal, (status_id, label, is_terminal) in enumerate(STATUSES)])
+    
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS job_applications (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -58,7 +184,7 @@ def init_db():
             job_role TEXT NOT NULL,
             applied_date DATE NOT NULL,
             url TEXT,
-            status TEXT NOT NULL DEFAULT 'Applied',
+            status_id INTEGER NOT NULL DEFAULT 1 REFERENCES statuses(id),
             notes TEXT,
             last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
@@ -69,16 +195,17 @@ def init_db():
         CREATE TABLE IF NOT EXISTS status_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             application_id INTEGER NOT NULL,
-            status TEXT NOT NULL,
+            status_id INTEGER NOT NULL REFERENCES statuses(id),
             changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (application_id) REFERENCES job_applications(id) ON DELETE CASCADE
         )
     ''')
     
-    # Create index for faster queries
+    # Index backing the /api/applications company prefix filter; the status
+    # and date range indexes are created by migrate_date_columns
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_status_history_app_id 
-        ON status_history(application_id)
+        CREATE INDEX IF NOT EXISTS idx_job_applications_company 
+        ON job_applications(company_name COLLATE NOCASE)
     ''')
 
     # Ensure the notes column exists for databases created before notes was added
@@ -88,53 +215,421 @@ def init_db():
         # Column already exists; ignore
         pass
     
-    # Migrate old status values to new ones
+    # Normalized lookup keys for duplicate detection (see make_dedupe_key)
+    for column in ('dedupe_key', 'url_key'):
+        try:
+            cursor.execute(f"ALTER TABLE job_applications ADD COLUMN {column} TEXT")
+        except Exception:
+            # Column already exists; ignore
+            pass
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_applications_dedupe_key ON job_applications(dedupe_key)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_applications_url_key ON job_applications(url_key)')
+    backfill_dedupe_keys(cursor)
+    
+    # When the current status was entered, written together with its
+    # status_history entry; indexed with status for /api/followups
     try:
-        cursor.execute("UPDATE job_applications SET status = 'Applied' WHERE status = 'Waiting for hearback'")
-        cursor.execute("UPDATE job_applications SET status = 'Denied without interview (visa related)' WHERE status = 'Denied'")
-        cursor.execute("UPDATE job_applications SET status = 'Interview 1' WHERE status = 'Interview'")
+        cursor.execute("ALTER TABLE job_applications ADD COLUMN stage_entered_at TIMESTAMP")
     except Exception:
+        # Column already exists; ignore
         pass
+    else:
+        cursor.execute('''
+            UPDATE job_applications SET stage_entered_at = COALESCE(
+                (SELECT changed_at FROM status_history 
+                 WHERE application_id = job_applications.id 
+                 ORDER BY id DESC LIMIT 1),
+                last_updated)
+        ''')
+    
+    # Archive tier: closed applications moved out of the hot tables (see archive_applications)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_applications (
+            id INTEGER PRIMARY KEY,
+            company_name TEXT NOT NULL,
+            job_role TEXT NOT NULL,
+            applied_date DATE NOT NULL,
+            url TEXT,
+            status_id INTEGER NOT NULL REFERENCES statuses(id),
+            notes TEXT,
+            last_updated TIMESTAMP,
+            dedupe_key TEXT,
+            url_key TEXT,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_status_history (
+            id INTEGER PRIMARY KEY,
+            application_id INTEGER NOT NULL,
+            status_id INTEGER NOT NULL REFERENCES statuses(id),
+            changed_at TIMESTAMP
+        )
+    ''')
     
     conn.commit()
-    conn.close()
-
-def get_db_connection():
-    """Get database connection"""
-    db_path = app.config.get('DATABASE', DATABASE)
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def record_status_change(application_id, status):
-    """Record a status change in the history table"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    migrate_status_ids(conn)
+    unparsed = migrate_date_columns(cursor)
+    if unparsed:
+        app.logger.warning('%d stored dates could not be parsed; those rows are left out of date filters '
+                           'and sorts until fixed (see GET /admin/maintenance)', unparsed)
     
+    # Bookkeeping for the background maintenance scheduler (see maintenance.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS maintenance_runs (
+            task TEXT PRIMARY KEY,
+            last_started REAL,
+            last_finished REAL,
+            last_duration_ms REAL,
+            last_status TEXT,
+            last_detail TEXT
+        )
+    ''')
     cursor.execute('''
-        INSERT INTO status_history (application_id, status, changed_at)
-        VALUES (?, ?, CURRENT_TIMESTAMP)
-    ''', (application_id, status))
+        CREATE TABLE IF NOT EXISTS maintenance_lock (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+    
+    # Bumped by triggers on every application write; read endpoints use it as
+    # their ETag so clients can revalidate cached data with If-None-Match
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+    for table, operations in (('job_applications', ('INSERT', 'UPDATE', 'DELETE')),
+                              ('archived_applications', ('INSERT', 'DELETE'))):
+        for operation in operations:
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS bump_data_version_{table}_{operation.lower()}
+                AFTER {operation} ON {table}
+                BEGIN
+                    UPDATE data_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+    
+    # Distinct company names and roles with how many applications use each,
+    # for /api/autocomplete; kept current by the triggers below
+    created = cursor.execute('''
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'field_values'
+    ''').fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS field_values (
+            field TEXT NOT NULL,
+            value TEXT NOT NULL COLLATE NOCASE,
+            uses INTEGER NOT NULL,
+            PRIMARY KEY (field, value)
+        ) WITHOUT ROWID
+    ''')
+    if created:
+        for field in AUTOCOMPLETE_FIELDS:
+            cursor.execute(f'''
+                INSERT INTO field_values (field, value, uses)
+                SELECT ?, MIN({field}), COUNT(*) FROM (
+                    SELECT {field} FROM job_applications
+                    UNION ALL SELECT {field} FROM archived_applications
+                )
+                GROUP BY {field} COLLATE NOCASE
+            ''', (field,))
+    # Archiving inserts into archived_applications before deleting from
+    # job_applications, so archived applications keep counting
+    for table in ('job_applications', 'archived_applications'):
+        for field in AUTOCOMPLETE_FIELDS:
+            count_new = f'''
+                INSERT INTO field_values (field, value, uses) VALUES ('{field}', NEW.{field}, 1)
+                ON CONFLICT (field, value) DO UPDATE SET uses = uses + 1;
+            '''
+            uncount_old = f'''
+                UPDATE field_values SET uses = uses - 1 WHERE field = '{field}' AND value = OLD.{field};
+                DELETE FROM field_values WHERE field = '{field}' AND value = OLD.{field} AND uses <= 0;
+            '''
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS count_{field}_{table}_insert
+                AFTER INSERT ON {table}
+                BEGIN {count_new} END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS count_{field}_{table}_delete
+                AFTER DELETE ON {table}
+                BEGIN {uncount_old} END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS count_{field}_{table}_update
+                AFTER UPDATE OF {field} ON {table}
+                WHEN OLD.{field} IS NOT NEW.{field}
+                BEGIN {uncount_old} {count_new} END
+            ''')
     
     conn.commit()
     conn.close()
 
-def get_status_history(application_id):
-    """Get status history for an application"""
+# Integer shadows of the text date columns: (table, text column, shadow column, kind).
+# Days are Julian day numbers, epochs Unix seconds (UTC).
+DATE_SHADOWS = [
+    ('job_applications', 'applied_date', 'applied_day', 'day'),
+    ('job_applications', 'last_updated', 'last_updated_epoch', 'epoch'),
+    ('job_applications', 'stage_entered_at', 'stage_entered_epoch', 'epoch'),
+    ('archived_applications', 'applied_date', 'applied_day', 'day'),
+    ('archived_applications', 'last_updated', 'last_updated_epoch', 'epoch'),
+    ('status_history', 'changed_at', 'changed_at_epoch', 'epoch'),
+    ('archived_status_history', 'changed_at', 'changed_at_epoch', 'epoch'),
+]
+
+SHADOW_EXPRESSIONS = {
+    'day': 'CAST(julianday(date({column})) + 0.5 AS INTEGER)',
+    'epoch': "CAST(strftime('%s', {column}) AS INTEGER)",
+}
+
+def migrate_date_columns(cursor):
+    """Normalize stored dates to ISO text and add indexed integer columns derived from them
+
+    Runs once per table: existing values are rewritten as ``YYYY-MM-DD``
+    (dates) or UTC ``YYYY-MM-DD HH:MM:SS`` (timestamps), then a virtual
+    generated column holding the Julian day or Unix time is added. Values
+    that cannot be parsed are left as they are and get a NULL shadow.
+    Range filters and date sorts compare these integers through their
+    indexes, while the API keeps returning the ISO text. Returns the number
+    of unparseable values found.
+    """
+    unparsed = 0
+    for table, column, shadow, kind in DATE_SHADOWS:
+        existing = {row[1] for row in cursor.execute(f'PRAGMA table_xinfo({table})')}
+        if shadow in existing:
+            continue
+        normalize = normalize_date if kind == 'day' else normalize_timestamp
+        updates = []
+        for rowid, value in cursor.execute(f'SELECT rowid, {column} FROM {table} WHERE {column} IS NOT NULL').fetchall():
+            try:
+                normalized = normalize(value)
+            except ValueError:
+                unparsed += 1
+                continue
+            if normalized != value:
+                updates.append((normalized, rowid))
+        cursor.executemany(f'UPDATE {table} SET {column} = ? WHERE rowid = ?', updates)
+        expression = SHADOW_EXPRESSIONS[kind].format(column=column)
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {shadow} INTEGER GENERATED ALWAYS AS ({expression}) VIRTUAL')
+    
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_applications_applied_day ON job_applications(applied_day)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_applications_last_updated_epoch ON job_applications(last_updated_epoch)')
+    # Status filters and summary counts, and the follow-up queue: one range
+    # seek per status (see /api/followups)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_job_applications_followup 
+        ON job_applications(status_id, stage_entered_epoch)
+    ''')
+    # Covers the per-application lookup, the oldest-first history order and
+    # the "latest entry at or before" seek of as_of reads (the rowid breaks ties)
+    for table in ('status_history', 'archived_status_history'):
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{table}_app_changed 
+            ON {table}(application_id, changed_at_epoch)
+        ''')
+    # Superseded by the indexes above
+    for index in ('idx_job_applications_status', 'idx_job_applications_applied_date',
+                  'idx_job_applications_last_updated', 'idx_status_history_app_id',
+                  'idx_archived_status_history_app_id'):
+        cursor.execute(f'DROP INDEX IF EXISTS {index}')
+    return unparsed
+
+def unparsed_dates(cursor):
+    """``{'table.column': n}`` for stored dates whose shadow column is NULL, i.e. that could not be parsed"""
+    counts = {}
+    for table, column, shadow, _ in DATE_SHADOWS:
+        count = cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE {column} IS NOT NULL AND {shadow} IS NULL').fetchone()[0]
+        if count:
+            counts[f'{table}.{column}'] = count
+    return counts
+
+# Tables that store a status, converted from label text to status_id by migrate_status_ids
+STATUS_TABLES = ['job_applications', 'status_history', 'archived_applications', 'archived_status_history']
+
+def migrate_status_ids(conn, batch_size=500):
+    """Convert the ``status`` text column of ``STATUS_TABLES`` to a ``status_id`` into ``statuses``
+
+    For databases from before the lookup table. Per table: old labels are
+    mapped through ``STATUS_ALIASES``, labels not in ``statuses`` are added
+    to it, a ``status_id`` column is added and filled in transactions of
+    ``batch_size`` rows, so the write lock is released between batches,
+    and finally the text column and the indexes on it are dropped. An
+    interrupted run resumes with the rows still missing their id. Returns
+    the number of rows converted.
+    """
+    cursor = conn.cursor()
+    converted = 0
+    for table in STATUS_TABLES:
+        columns = {row[1] for row in cursor.execute(f'PRAGMA table_xinfo({table})')}
+        if 'status' not in columns:
+            continue
+        with conn:
+            for old, new in STATUS_ALIASES.items():
+                cursor.execute(f'UPDATE {table} SET status = ? WHERE status = ?', (new, old))
+            known = {row[0] for row in cursor.execute('SELECT label FROM statuses')}
+            for (label,) in cursor.execute(f'SELECT DISTINCT status FROM {table}').fetchall():
+                if label not in known:
+                    cursor.execute('''
+                        INSERT INTO statuses (label, ordinal, is_terminal)
+                        VALUES (?, (SELECT MAX(ordinal) + 1 FROM statuses), 0)
+                    ''', (label,))
+                    known.add(label)
+            if 'status_id' not in columns:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN status_id INTEGER REFERENCES statuses(id)')
+        
+        # Walk rowid ranges rather than re-scanning for NULLs on every batch
+        last_rowid = 0
+        while True:
+            with conn:
+                end = cursor.execute(f'''
+                    SELECT MAX(rowid) FROM (SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?)
+                ''', (last_rowid, batch_size)).fetchone()[0]
+                if end is None:
+                    break
+                cursor.execute(f'''
+                    UPDATE {table} SET status_id = (SELECT id FROM statuses WHERE label = {table}.status)
+                    WHERE rowid > ? AND rowid <= ? AND status_id IS NULL
+                ''', (last_rowid, end))
+                converted += cursor.rowcount
+            last_rowid = end
+        
+        with conn:
+            for index in [row[1] for row in cursor.execute(f'PRAGMA index_list({table})')]:
+                indexed = {row[2] for row in cursor.execute(f'PRAGMA index_info({index})')}
+                if 'status' in indexed:
+                    cursor.execute(f'DROP INDEX {index}')
+            cursor.execute(f'ALTER TABLE {table} DROP COLUMN status')
+    return converted
+
+def backfill_dedupe_keys(cursor, batch_size=500):
+    """Fill in lookup keys for rows written before duplicate detection existed"""
+    while True:
+        rows = cursor.execute('''
+            SELECT id, company_name, job_role, url FROM job_applications 
+            WHERE dedupe_key IS NULL LIMIT ?
+        ''', (batch_size,)).fetchall()
+        if not rows:
+            break
+        cursor.executemany(
+            'UPDATE job_applications SET dedupe_key = ?, url_key = ? WHERE id = ?',
+            [(make_dedupe_key(company, role), canonicalize_url(url), app_id)
+             for app_id, company, role, url in rows]
+        )
+
+# Statuses after which an application is closed and can be archived; the
+# archive policy reads is_terminal from the statuses table
+TERMINAL_STATUSES = [label for _, label, is_terminal in STATUSES if is_terminal]
+
+# Columns copied between job_applications and archived_applications
+ARCHIVE_COLUMNS = ['id', 'company_name', 'job_role', 'applied_date', 'url', 'status_id', 'notes',
+                   'last_updated', 'dedupe_key', 'url_key']
+
+ARCHIVE_BATCH_SIZE = 500
+
+def archive_applications(app_ids=None, older_than_days=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move applications and their history into the archive tables
+
+    With ``app_ids`` the given applications are archived whatever their
+    status. Otherwise the policy applies: applications in a terminal status
+    whose ``last_updated`` is more than ``older_than_days`` days old. Rows are
+    moved in transactions of ``batch_size`` applications so the write lock is
+    released between batches. Returns the number of applications archived.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-        SELECT status, changed_at 
-        FROM status_history 
-        WHERE application_id = ? 
-        ORDER BY changed_at ASC
-    ''', (application_id,))
+    if app_ids is not None:
+        candidates = [int(app_id) for app_id in app_ids]
+    else:
+        candidates = [row[0] for row in cursor.execute('''
+            SELECT id FROM job_applications 
+            WHERE status_id IN (SELECT id FROM statuses WHERE is_terminal)
+              AND last_updated_epoch <= CAST(strftime('%s', 'now') AS INTEGER) - ?
+            ORDER BY id
+        ''', (int(older_than_days or 0) * 24 * 60 * 60,))]
     
-    history = cursor.fetchall()
-    conn.close()
+    columns = ', '.join(ARCHIVE_COLUMNS)
+    archived = 0
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        placeholders = ', '.join('?' for _ in batch)
+        
+        with conn:
+            cursor.execute(f'''
+                INSERT OR REPLACE INTO archived_applications ({columns}) 
+                SELECT {columns} FROM job_applications WHERE id IN ({placeholders})
+            ''', batch)
+            archived += cursor.rowcount
+            cursor.execute(f'''
+                INSERT OR REPLACE INTO archived_status_history (id, application_id, status_id, changed_at) 
+                SELECT id, application_id, status_id, changed_at FROM status_history 
+                WHERE application_id IN ({placeholders})
+            ''', batch)
+            cursor.execute(f'DELETE FROM status_history WHERE application_id IN ({placeholders})', batch)
+            cursor.execute(f'DELETE FROM job_applications WHERE id IN ({placeholders})', batch)
     
-    return history
+    conn.close()
+    return archived
+
+def parse_bool_arg(name):
+    """Read a true/false query parameter"""
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+def get_db_connection():
+    """Get database connection"""
+    db_path = app.config.get('DATABASE', DATABASE)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def normalize_status(value):
+    """Label of a submitted status, mapping old labels through ``STATUS_ALIASES``
+
+    Raises ``ValueError`` for a label not in the statuses table.
+    """
+    label = STATUS_ALIASES.get(value, value)
+    if label not in {status['label'] for status in repository.statuses()}:
+        raise ValueError(f'Unknown status: {value}')
+    return label
+
+def summary_delta(old_status, new_status):
+    """Change in /api/summary counts caused by one write
+
+    ``old_status`` is None for an insert and ``new_status`` None for a delete.
+    """
+    delta = {'total': 0, 'by_status': {}}
+    if old_status == new_status:
+        return delta
+    if old_status is not None:
+        delta['total'] -= 1
+        delta['by_status'][old_status] = -1
+    if new_status is not None:
+        delta['total'] += 1
+        delta['by_status'][new_status] = 1
+    return delta
+
+def publish_change(event_type, app_id, application=None):
+    """Publish a committed change with the row's new state and the new summary counts
+
+    Published even with nobody listening, so a dashboard that comes back
+    with its last event id can replay what changed while it was away.
+    """
+    if application is None and event_type != 'deleted':
+        application = repository.get(app_id)
+    events.publish(event_type, {
+        'id': app_id,
+        'application': application,
+        'summary': repository.summary()
+    })
+
+def sqlite_only():
+    """400 response for SQLite-only features when another storage engine is configured"""
+    if isinstance(repository, SQLiteRepository):
+        return None
+    return jsonify({'success': False, 'message': f'Not supported by the {repository.name} storage engine'}), 400
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -152,7 +647,7 @@ def login():
         else:
             flash('Invalid username or password', 'error')
     
-    return render_template('login.html')
+    return pages.render('login.html')
 
 @app.route('/logout')
 @login_required
@@ -164,38 +659,39 @@ def logout():
 
 @app.route('/')
 @login_required
+@admission.limit('light')
 def index():
-    """Main page showing all job applications"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+    """Main page: the dashboard shell
+
+    Cards are not rendered here; static/script.js fills the grid from its
+    IndexedDB mirror or ``/api/applications`` and renders only the rows in
+    view, so the page itself reads nothing but the statuses.
+    """
     # Get sort parameter
     sort_by = request.args.get('sort', 'applied_date')
     sort_order = request.args.get('order', 'desc')
     
     # Validate sort parameters
-    valid_sorts = ['company_name', 'job_role', 'applied_date', 'status', 'last_updated']
-    if sort_by not in valid_sorts:
+    if sort_by not in SORT_COLUMNS:
         sort_by = 'applied_date'
     
     if sort_order not in ['asc', 'desc']:
         sort_order = 'desc'
     
-    query = f'''
-        SELECT * FROM job_applications 
-        ORDER BY {sort_by} {sort_order.upper()}
-    '''
-    
-    applications = cursor.execute(query).fetchall()
-    conn.close()
-    
-    return render_template('index.html', applications=applications, 
-                         current_sort=sort_by, current_order=sort_order)
+    return render_template('index.html',
+                         current_sort=sort_by, current_order=sort_order, statuses=repository.statuses(),
+                         followup_after_days=int(os.getenv('FOLLOWUP_AFTER_DAYS', 14)))
 
 @app.route('/add', methods=['GET', 'POST'])
 @login_required
+@admission.limit('write')
 def add_application():
-    """Add a new job application"""
+    """Add a new job application
+
+    The JSON response carries the stored ``application`` (with history),
+    the ``summary_delta`` to apply to /api/summary counts, and any likely
+    ``duplicates``.
+    """
     if request.method == 'POST':
         data = request.get_json()
         
@@ -206,43 +702,40 @@ def add_application():
         if missing_fields:
             return jsonify({'success': False, 'message': f'Missing required fields: {", ".join(missing_fields)}'}), 400
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        try:
+            data['applied_date'] = normalize_date(data['applied_date'])
+        except ValueError:
+            return jsonify({'success': False, 'message': f"Invalid applied_date: {data['applied_date']}"}), 400
         
-        cursor.execute('''
-            INSERT INTO job_applications (company_name, job_role, applied_date, url, status, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            data['company_name'],
-            data['job_role'],
-            data['applied_date'],
-            data.get('url', ''),  # Use empty string if URL not provided
-            data['status'],
-            data.get('notes', '')  # Use empty string if notes not provided
-        ))
-        
-        app_id = cursor.lastrowid
+        try:
+            data['status'] = normalize_status(data['status'])
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
-        # Record initial status in history
-        cursor.execute('''
-            INSERT INTO status_history (application_id, status, changed_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        ''', (app_id, data['status']))
+        # Likely duplicates are reported back but do not block the insert
+        duplicates = repository.find_duplicates(data['company_name'], data['job_role'], data.get('url', ''))
         
-        conn.commit()
-        conn.close()
+        application = repository.add(data)
+        app_id = application['id']
+        publish_change('created', app_id, application)
         
-        return jsonify({'success': True, 'message': 'Job application added successfully'})
+        return jsonify({'success': True, 'message': 'Job application added successfully',
+                        'id': app_id, 'application': application,
+                        'summary_delta': summary_delta(None, data['status']),
+                        'duplicates': duplicates})
     
-    return render_template('add.html')
+    statuses = repository.statuses()
+    return pages.render('add.html', key=tuple(status['label'] for status in statuses), statuses=statuses)
 
 @app.route('/edit/<int:app_id>', methods=['GET', 'POST'])
 @login_required
+@admission.limit('write')
 def edit_application(app_id):
-    """Edit an existing job application"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+    """Edit an existing job application
+
+    The JSON response carries the updated ``application`` (with history)
+    and the ``summary_delta``; an id that does not exist gets 404.
+    """
     if request.method == 'POST':
         data = request.get_json()
         
@@ -253,153 +746,622 @@ def edit_application(app_id):
         if missing_fields:
             return jsonify({'success': False, 'message': f'Missing required fields: {", ".join(missing_fields)}'}), 400
         
-        # Get current status to check if it changed
-        current_app = cursor.execute('SELECT status FROM job_applications WHERE id = ?', (app_id,)).fetchone()
-        old_status = current_app['status'] if current_app else None
+        try:
+            data['applied_date'] = normalize_date(data['applied_date'])
+        except ValueError:
+            return jsonify({'success': False, 'message': f"Invalid applied_date: {data['applied_date']}"}), 400
         
-        cursor.execute('''
-            UPDATE job_applications 
-            SET company_name = ?, job_role = ?, applied_date = ?, 
-                url = ?, status = ?, notes = ?, last_updated = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (
-            data['company_name'],
-            data['job_role'],
-            data['applied_date'],
-            data.get('url', ''),  # Use empty string if URL not provided
-            data['status'],
-            data.get('notes', ''),  # Use empty string if notes not provided
-            app_id
-        ))
-        
-        # Record status change if status changed
-        if old_status and old_status != data['status']:
-            cursor.execute('''
-                INSERT INTO status_history (application_id, status, changed_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (app_id, data['status']))
+        try:
+            data['status'] = normalize_status(data['status'])
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
-        conn.commit()
-        conn.close()
+        # Records a history entry when the status changed
+        old_status, application = repository.update(app_id, data)
+        if application is None:
+            return jsonify({'success': False, 'message': f'Application {app_id} not found'}), 404
+        publish_change('updated', app_id, application)
         
-        return jsonify({'success': True, 'message': 'Job application updated successfully'})
+        return jsonify({'success': True, 'message': 'Job application updated successfully',
+                        'application': application,
+                        'summary_delta': summary_delta(old_status, application['status'])})
     
     # GET request - fetch application data
-    application = cursor.execute('SELECT * FROM job_applications WHERE id = ?', (app_id,)).fetchone()
+    application = repository.get(app_id)
     
     if not application:
-        conn.close()
         return redirect(url_for('index'))
     
-    # Convert to dict and ensure notes key exists for template safety
-    application_dict = dict(application)
-    if 'notes' not in application_dict:
-        application_dict['notes'] = ''
-    conn.close()
-    
-    return render_template('edit.html', application=application_dict)
+    return render_template('edit.html', application=application, statuses=repository.statuses())
 
 @app.route('/delete/<int:app_id>', methods=['POST'])
 @login_required
+@admission.limit('write')
 def delete_application(app_id):
-    """Delete a job application"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    """Delete a job application
+
+    The JSON response carries the ``summary_delta`` caused by the delete; an
+    id that does not exist gets 404. Archived applications are deleted too,
+    with an empty delta since the summary does not count them.
+    """
+    old_status, archived = repository.delete(app_id)
+    if old_status is None:
+        return jsonify({'success': False, 'message': f'Application {app_id} not found'}), 404
+    publish_change('deleted', app_id)
     
-    cursor.execute('DELETE FROM job_applications WHERE id = ?', (app_id,))
-    conn.commit()
-    conn.close()
+    return jsonify({'success': True, 'message': 'Job application deleted successfully',
+                    'id': app_id,
+                    'summary_delta': summary_delta(None if archived else old_status, None)})
+
+def parse_list_arg(name):
+    """Read a comma-separated (or repeated) query parameter as a list"""
+    values = []
+    for raw in request.args.getlist(name):
+        values.extend(part.strip() for part in raw.split(',') if part.strip())
+    return values
+
+def parse_date_arg(name, value):
+    """Validate a YYYY-MM-DD or ISO datetime query value and return it in the stored format"""
+    for fmt in ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S'):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed.strftime('%Y-%m-%d') if fmt == '%Y-%m-%d' else parsed.strftime('%Y-%m-%d %H:%M:%S')
+    raise ValueError(f'Invalid date for {name}: {value}')
+
+def parse_as_of_arg():
+    """The ``as_of`` query parameter as a timestamp, or None; a bare date means the end of that day
+
+    Raises ``ValueError`` for a malformed date.
+    """
+    value = request.args.get('as_of')
+    if not value:
+        return None
+    as_of = parse_date_arg('as_of', value)
+    return f'{as_of} 23:59:59' if len(as_of) == len('YYYY-MM-DD') else as_of
+
+def parse_application_filters(args):
+    """Read filter query parameters into the filters dict taken by the repository
+
+    Supported filters (each backed by an index created in ``init_db``):
+    - ``status``: repeatable, matches any of the given statuses
+    - ``applied_from`` / ``applied_to``: inclusive ``applied_date`` range
+    - ``updated_since``: ``last_updated`` at or after a date/datetime
+    - ``company``: case-insensitive company name prefix
+
+    Raises ``ValueError`` for malformed dates.
+    """
+    filters = {}
+    
+    statuses = [status for status in args.getlist('status') if status]
+    if statuses:
+        filters['status'] = statuses
+    
+    for name in ('applied_from', 'applied_to', 'updated_since'):
+        value = args.get(name)
+        if value:
+            filters[name] = parse_date_arg(name, value)
+    
+    company = args.get('company', '').strip()
+    if company:
+        filters['company'] = company
+    
+    return filters
+
+def build_application_filters(args):
+    """Compile filter query parameters into a parameterized WHERE clause
+
+    Returns ``(where_sql, params)`` as used by the SQLite engine; see
+    ``parse_application_filters`` and ``repository.filter_clause``.
+    """
+    return filter_clause(parse_application_filters(args))
+
+def build_columnar_payload(applications, histories, columns=APPLICATION_COLUMNS):
+    """Encode applications as column arrays with a dictionary-encoded status.
+
+    Each status string is sent once in ``dictionaries.status`` and rows (and
+    history entries) refer to it by index. History is flattened into
+    parallel arrays; the entries for row ``i`` live between
+    ``offsets[i]`` and ``offsets[i + 1]``. Pass ``histories=None`` to leave
+    ``status_history`` out of the payload.
+    """
+    status_dict = []
+    status_codes = {}
+
+    def encode_status(status):
+        code = status_codes.get(status)
+        if code is None:
+            code = status_codes[status] = len(status_dict)
+            status_dict.append(status)
+        return code
+
+    column_values = {column: [] for column in columns}
+    offsets = [0]
+    history_status = []
+    history_changed_at = []
+    
+    for app in applications:
+        row = dict(app)
+        for column in columns:
+            value = row.get(column)
+            if column == 'status':
+                value = encode_status(value)
+            elif column == 'notes' and value is None:
+                value = ''
+            column_values[column].append(value)
+        
+        if histories is not None:
+            for hist_entry in histories.get(row['id'], []):
+                history_status.append(encode_status(hist_entry['status']))
+                history_changed_at.append(hist_entry['changed_at'])
+            offsets.append(len(history_status))
     
-    return jsonify({'success': True, 'message': 'Job application deleted successfully'})
+    payload = {
+        'format': 'columnar',
+        'count': len(applications),
+        'columns': column_values,
+        'dictionaries': {'status': status_dict}
+    }
+    if histories is not None:
+        payload['status_history'] = {
+            'offsets': offsets,
+            'status': history_status,
+            'changed_at': history_changed_at
+        }
+    return payload
+
+def read_etag():
+    """ETag for a JSON read: the storage version plus the request's query string"""
+    query = hashlib.sha1(request.query_string).hexdigest()[:12]
+    return f'{repository.version()}-{query}'
+
+def cacheable(response, etag):
+    """Tag a read response so clients revalidate it instead of refetching"""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified(etag):
+    """304 response when the client's If-None-Match already has ``etag``"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return cacheable(Response(status=304), etag)
 
 @app.route('/api/applications')
 @login_required
+@admission.limit('heavy')
 def api_applications():
-    """API endpoint to get all applications as JSON"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+    """API endpoint to get all applications as JSON
+
+    Query parameters:
+    - ``sort`` / ``order``: sort column and direction
+    - ``fields``: comma-separated columns to return (``id`` is always
+      included); only these columns are read from the database
+    - ``include=history``: attach ``status_history`` to each row. History
+      is included by default only when neither ``fields`` nor ``include``
+      is given, so existing callers keep the full response
+    - ``format=columnar``: compact column-oriented payload (see
+      ``build_columnar_payload``); the default is a list of row objects
+    - ``status``, ``applied_from``, ``applied_to``, ``updated_since``,
+      ``company``: filters, see ``build_application_filters``
+    - ``include_archived=1``: also return archived applications, each row
+      then carries an ``archived`` flag
+    - ``as_of``: the pipeline as it stood at a date (end of day) or
+      datetime, replayed from the status history; ``status`` filters and
+      sorts apply to the status back then. Repeated reads are served from
+      a cache until the next write
+
+    Responses carry an ETag; a request with a matching ``If-None-Match``
+    gets ``304 Not Modified`` without any rows being read.
+    """
     sort_by = request.args.get('sort', 'applied_date')
     sort_order = request.args.get('order', 'desc')
+    response_format = request.args.get('format', 'rows')
     
-    valid_sorts = ['company_name', 'job_role', 'applied_date', 'status', 'last_updated']
-    if sort_by not in valid_sorts:
+    if sort_by not in SORT_COLUMNS:
         sort_by = 'applied_date'
     
     if sort_order not in ['asc', 'desc']:
         sort_order = 'desc'
     
-    query = f'''
-        SELECT * FROM job_applications 
-        ORDER BY {sort_by} {sort_order.upper()}
-    '''
+    requested_fields = parse_list_arg('fields')
+    invalid_fields = [field for field in requested_fields if field not in APPLICATION_COLUMNS]
+    if invalid_fields:
+        return jsonify({'success': False, 'message': f'Unknown fields: {", ".join(invalid_fields)}'}), 400
     
-    applications = cursor.execute(query).fetchall()
-    conn.close()
+    if requested_fields:
+        columns = [column for column in APPLICATION_COLUMNS if column == 'id' or column in requested_fields]
+    else:
+        columns = APPLICATION_COLUMNS
+    
+    if 'fields' in request.args or 'include' in request.args:
+        include_history = 'history' in parse_list_arg('include')
+    else:
+        include_history = True
+    
+    include_archived = parse_bool_arg('include_archived')
+    if include_archived:
+        columns = columns + ['archived']
+    
+    try:
+        filters = parse_application_filters(request.args)
+        as_of = parse_as_of_arg()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    # Read before the rows, so a concurrent write can only make the tag stale
+    etag = read_etag()
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
+    
+    applications, histories = repository.list(filters, sort_by, sort_order, columns,
+                                               include_history, include_archived, as_of)
+    
+    if response_format == 'columnar':
+        return cacheable(jsonify(build_columnar_payload(applications, histories, columns)), etag)
     
-    # Convert to list of dictionaries (sqlite3.Row doesn't support .get)
     apps_list = []
-    for app in applications:
-        row = dict(app)
-        app_id = row.get('id')
-        
-        # Get status history for this application
-        history = get_status_history(app_id)
-        status_history = []
-        for hist_entry in history:
-            status_history.append({
-                'status': hist_entry['status'],
-                'changed_at': hist_entry['changed_at']
-            })
+    for app_dict in applications:
+        if histories is not None:
+            app_dict['status_history'] = histories.get(app_dict['id'], [])
+        apps_list.append(app_dict)
+    
+    return cacheable(jsonify(apps_list), etag)
+
+@app.route('/api/followups')
+@login_required
+@admission.limit('light')
+def api_followups():
+    """Applications waiting on a reply with no status change for ``older_than`` days
+
+    Query parameters: ``older_than`` (days, default ``FOLLOWUP_AFTER_DAYS``,
+    14) and ``status`` (repeatable, default every non-terminal status; an
+    unknown label is a 400). Oldest first, each with ``stage_entered_at`` and
+    whole ``days_in_stage``.
+    """
+    try:
+        older_than = int(request.args.get('older_than', os.getenv('FOLLOWUP_AFTER_DAYS', 14)))
+        if older_than < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({'success': False, 'message': 'older_than must be a whole number of days'}), 400
+    try:
+        statuses = [normalize_status(status) for status in request.args.getlist('status') if status] or \
+            [status['label'] for status in repository.statuses() if not status['is_terminal']]
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    # Stored timestamps are UTC (CURRENT_TIMESTAMP)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cutoff = (now - timedelta(days=older_than)).strftime('%Y-%m-%d %H:%M:%S')
+    applications = repository.followups(statuses, cutoff)
+    for application in applications:
+        entered = datetime.strptime(application['stage_entered_at'], '%Y-%m-%d %H:%M:%S')
+        application['days_in_stage'] = (now - entered).days
+    
+    return jsonify({'older_than': older_than, 'statuses': statuses,
+                    'total': len(applications), 'applications': applications})
+
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+@app.route('/api/autocomplete')
+@login_required
+@admission.limit('light')
+def api_autocomplete():
+    """Suggestions for the company and role inputs, fetched as the user types
+
+    Query parameters: ``field`` (``company_name`` or ``job_role``),
+    ``prefix`` (case-insensitive, may be empty) and ``limit`` (default 10,
+    at most ``AUTOCOMPLETE_MAX_LIMIT``). Values are ranked by how many
+    applications use them.
+    """
+    field = request.args.get('field', '')
+    if field not in AUTOCOMPLETE_FIELDS:
+        return jsonify({'success': False, 'message': f'field must be one of: {", ".join(AUTOCOMPLETE_FIELDS)}'}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+        if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+            raise ValueError
+    except ValueError:
+        return jsonify({'success': False, 'message': f'limit must be between 1 and {AUTOCOMPLETE_MAX_LIMIT}'}), 400
+    prefix = request.args.get('prefix', '').strip()
+    
+    return jsonify({'field': field, 'prefix': prefix,
+                    'suggestions': repository.autocomplete(field, prefix, limit)})
+
+@app.route('/api/applications/duplicates')
+@login_required
+@admission.limit('heavy')
+def api_duplicates():
+    """API endpoint reporting clusters of likely duplicate applications
+
+    Clusters are applications sharing a normalized company/role key or a
+    canonical job URL. Each key is grouped in one pass over its index
+    rather than comparing applications pairwise.
+    """
+    unsupported = sqlite_only()
+    if unsupported:
+        return unsupported
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    clusters = []
+    for match, key_column in (('company_role', 'dedupe_key'), ('url', 'url_key')):
+        # key_column is one of the two literals above, never user input
+        rows = cursor.execute(f'''
+            SELECT {key_column} AS match_key, id, company_name, job_role, applied_date, 
+                   {STATUS_LABEL} AS status, url 
+            FROM job_applications 
+            WHERE {key_column} IN (
+                SELECT {key_column} FROM job_applications 
+                WHERE {key_column} IS NOT NULL AND {key_column} != ''
+                GROUP BY {key_column} HAVING COUNT(*) > 1
+            )
+            ORDER BY {key_column}, id
+        ''').fetchall()
         
-        apps_list.append({
-            'id': app_id,
-            'company_name': row.get('company_name'),
-            'job_role': row.get('job_role'),
-            'applied_date': row.get('applied_date'),
-            'url': row.get('url'),
-            'status': row.get('status'),
-            'notes': row.get('notes', ''),
-            'last_updated': row.get('last_updated'),
-            'status_history': status_history
-        })
-    
-    return jsonify(apps_list)
+        current = None
+        for row in rows:
+            if current is None or current['key'] != row['match_key']:
+                current = {'match': match, 'key': row['match_key'], 'applications': []}
+                clusters.append(current)
+            entry = dict(row)
+            del entry['match_key']
+            current['applications'].append(entry)
+    
+    conn.close()
+    
+    return jsonify({'total_clusters': len(clusters), 'clusters': clusters})
+
+@app.route('/api/archive', methods=['POST'])
+@login_required
+@admission.limit('heavy')
+def api_archive():
+    """Archive applications by id, or by the terminal-status age policy
+
+    JSON body: ``{"ids": [...]}`` to archive specific applications, or
+    ``{"older_than_days": N}`` to archive every application in a terminal
+    status not updated for N days (default ``ARCHIVE_AFTER_DAYS``, 90).
+    """
+    unsupported = sqlite_only()
+    if unsupported:
+        return unsupported
+    
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        if 'ids' in data:
+            ids = data['ids']
+            # A string would be archived digit by digit, and JSON true is an int to Python
+            if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+                raise ValueError('ids must be a list of integers')
+            archived = archive_applications(app_ids=ids)
+        else:
+            older_than_days = int(data.get('older_than_days', os.getenv('ARCHIVE_AFTER_DAYS', 90)))
+            archived = archive_applications(older_than_days=older_than_days)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'ids must be a list of integers and older_than_days an integer'}), 400
+    
+    if archived:
+        events.publish('archived', {'count': archived, 'summary': repository.summary()})
+    
+    return jsonify({'success': True, 'message': f'Archived {archived} application(s)', 'archived': archived})
+
+EXPORT_MIMETYPES = {'parquet': 'application/vnd.apache.parquet', 'arrow': 'application/vnd.apache.arrow.file'}
+
+@app.route('/api/export')
+@login_required
+@admission.limit('heavy')
+def api_export():
+    """Download one table as a Parquet or Arrow IPC file
+
+    Query parameters: ``table`` (``job_applications``, the default, or
+    ``status_history``), ``format`` (``parquet``, the default, or ``arrow``)
+    and ``since``: the ``X-Export-Watermark`` header of a previous download,
+    to get only rows changed after it. See export.py.
+    """
+    unsupported = sqlite_only()
+    if unsupported:
+        return unsupported
+    
+    table = request.args.get('table', 'job_applications')
+    fmt = request.args.get('format', 'parquet')
+    since = request.args.get('since') or None
+    if table not in EXPORT_TABLES:
+        return jsonify({'success': False, 'message': f'Unknown table: {table}'}), 400
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': f'Unknown format: {fmt}'}), 400
+    try:
+        if since is not None:
+            since = int(since) if EXPORT_TABLES[table]['watermark'] == 'id' else parse_date_arg('since', since)
+        import_pyarrow()
+    except ValueError:
+        return jsonify({'success': False, 'message': f'Invalid since: {since}'}), 400
+    except ImportError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    # Spooled to disk rather than memory; send_file closes it after the response
+    sink = tempfile.TemporaryFile()
+    conn = get_db_connection()
+    try:
+        rows, watermark = export_table(conn, table, sink, fmt, since=since)
+    finally:
+        conn.close()
+    sink.seek(0)
+    
+    response = send_file(sink, mimetype=EXPORT_MIMETYPES[fmt], as_attachment=True,
+                         download_name=f'{table}{EXPORT_FORMATS[fmt]}')
+    response.headers['X-Export-Rows'] = str(rows)
+    response.headers['X-Export-Watermark'] = '' if watermark is None else str(watermark)
+    return response
+
+@app.route('/admin/maintenance', methods=['GET', 'POST'])
+@login_required
+def admin_maintenance():
+    """Report maintenance task history; POST runs tasks immediately
+
+    POST body (optional): ``{"task": "<name>"}`` to run a single task.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        task = data.get('task')
+        if task and task not in maintenance.tasks:
+            return jsonify({'success': False, 'message': f'Unknown task: {task}'}), 400
+        results = maintenance.run_pending(force=True, only=task)
+        return jsonify({'success': True, 'results': results})
+    
+    status = maintenance.status()
+    conn = get_db_connection()
+    try:
+        status['unparsed_dates'] = unparsed_dates(conn)
+    finally:
+        conn.close()
+    return jsonify(status)
+
+def backup_settings():
+    """(database path, snapshot directory, snapshots kept) from BACKUP_DIR and BACKUP_KEEP"""
+    db_path = app.config.get('DATABASE', DATABASE)
+    return db_path, os.getenv('BACKUP_DIR') or default_backup_dir(db_path), int(os.getenv('BACKUP_KEEP', 7))
+
+@app.route('/admin/backup', methods=['GET', 'POST'])
+@login_required
+def admin_backup():
+    """List database snapshots; POST takes a new one with the online backup API
+
+    The snapshot is verified with ``integrity_check`` before it is kept, and
+    only the newest ``BACKUP_KEEP`` snapshots are retained.
+    """
+    unsupported = sqlite_only()
+    if unsupported:
+        return unsupported
+    
+    db_path, backup_dir, keep = backup_settings()
+    if request.method == 'POST':
+        try:
+            result = backup_database(db_path, backup_dir, keep=keep)
+        except BackupError as e:
+            return jsonify({'success': False, 'message': str(e)}), 500
+        return jsonify({'success': True, **result})
+    
+    snapshots = [{'name': snapshot['name'], 'bytes': snapshot['bytes']}
+                 for snapshot in list_snapshots(backup_dir, db_path)]
+    return jsonify({'directory': backup_dir, 'keep': keep, 'snapshots': snapshots})
+
+@app.route('/admin/admission')
+@login_required
+def admin_admission():
+    """Report admission limits, current load and shed counts per class and endpoint"""
+    return jsonify(admission.status())
+
+@app.route('/admin/profiles')
+@login_required
+def admin_profiles():
+    """List recent request profiles, newest first, with self time by category and top functions"""
+    enabled, directory, keep = profiling_settings()
+    return jsonify({'enabled': enabled, 'directory': directory, 'keep': keep,
+                    'profiles': list_profiles(directory)})
+
+@app.route('/admin/profiles/<name>')
+@login_required
+def admin_profile_download(name):
+    """The raw ``.prof`` file of a listed profile, for ``python -m pstats`` or snakeviz"""
+    _, directory, _ = profiling_settings()
+    if name not in {profile['name'] for profile in list_profiles(directory)}:
+        abort(404)
+    return send_file(os.path.join(directory, f'{name}.prof'), mimetype='application/octet-stream',
+                     as_attachment=True, download_name=f'{name}.prof')
 
 @app.route('/api/summary')
 @login_required
+@admission.limit('light')
 def api_summary():
-    """API endpoint to get job application summary statistics"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    """API endpoint to get job application summary statistics
+
+    Pass ``include_archived=1`` to count archived applications as well, and
+    ``as_of`` for the counts at a past date, as in ``/api/applications``.
+    Supports ``If-None-Match`` revalidation like ``/api/applications``.
+    """
+    try:
+        as_of = parse_as_of_arg()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     
-    # Get total count
-    total_count = cursor.execute('SELECT COUNT(*) FROM job_applications').fetchone()[0]
+    etag = read_etag()
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
     
-    # Get counts by status
-    status_counts = cursor.execute('''
-        SELECT status, COUNT(*) as count 
-        FROM job_applications 
-        GROUP BY status
-    ''').fetchall()
+    return cacheable(jsonify(repository.summary(parse_bool_arg('include_archived'), as_of)), etag)
+
+@app.route('/service-worker.js')
+def service_worker():
+    """Serve the service worker from the site root so its scope covers every page"""
+    response = app.send_static_file('service-worker.js')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/events')
+@login_required
+def api_events():
+    """Server-Sent Events stream of application changes
+
+    Emits ``created``/``updated`` (row with history plus summary),
+    ``deleted`` (id plus summary), ``archived`` (count plus summary) and
+    ``resync`` when the client must reload. Missed events are replayed after
+    ``Last-Event-ID`` (header or ``last_event_id`` parameter). Heartbeat and
+    connection lifetime come from ``SSE_HEARTBEAT_SECONDS`` (15) and
+    ``SSE_TIMEOUT_SECONDS`` (60). An open stream holds a worker thread for
+    its whole lifetime, so the timeout bounds what each open tab costs.
+    """
+    # EventSource sends the header on reconnect; a freshly loaded page that
+    # restored a saved snapshot passes the id it last saw as a query parameter
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
     
-    conn.close()
+    subscription = events.subscribe(last_event_id)
+    stream = stream_events(
+        events,
+        subscription,
+        heartbeat=float(os.getenv('SSE_HEARTBEAT_SECONDS', 15)),
+        timeout=float(os.getenv('SSE_TIMEOUT_SECONDS', 60))
+    )
+    return Response(stream, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def start_maintenance():
+    """Start background maintenance unless MAINTENANCE_ENABLED=0
+
+    When ARCHIVE_AFTER_DAYS is set, the archive policy also runs daily, and
+    when BACKUP_INTERVAL is set (seconds), a snapshot is taken that often.
+    """
+    if os.getenv('MAINTENANCE_ENABLED', '1') == '0' or not isinstance(repository, SQLiteRepository):
+        return False
     
-    # Convert to dictionary
-    summary = {
-        'total': total_count,
-        'by_status': {}
-    }
+    archive_after_days = os.getenv('ARCHIVE_AFTER_DAYS')
+    if archive_after_days:
+        maintenance.add_task(
+            'archive',
+            lambda conn, scheduler: f'archived {archive_applications(older_than_days=int(archive_after_days))}',
+            24 * 60 * 60,
+            heavy=True
+        )
     
-    for status, count in status_counts:
-        summary['by_status'][status] = count
+    backup_interval = os.getenv('BACKUP_INTERVAL')
+    if backup_interval:
+        def run_backup(conn, scheduler):
+            result = backup_database(*backup_settings())
+            return f"{result['snapshot']}, {result['bytes']} bytes, {result['restarts']} restart(s)"
+        maintenance.add_task('backup', run_backup, int(backup_interval), heavy=True)
     
-    return jsonify(summary)
+    return maintenance.start()
 
 # Initialize database when the module is imported
 init_db()
 
 if __name__ == '__main__':
+    start_maintenance()
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV') != 'production'
     app.run(debug=debug, host='0.0.0.0', port=port)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Online backup and restore for the Job Application Tracker database.
+
+Snapshots are taken with SQLite's online backup API, a few pages at a time
+with a short sleep between steps, so the database is only read-locked for the
+length of one step and writers get in between. In the default rollback
+journal mode a write from another connection makes SQLite restart the copy;
+after ``max_restarts`` restarts the rest is copied in one step, which holds
+the read lock until it finishes. A database in WAL mode is copied inside one
+read transaction instead: the snapshot is consistent, never restarts and
+never blocks writers.
+
+Each snapshot is written next to its final name, checked with ``PRAGMA
+integrity_check`` and only then renamed into place, so a snapshot file is
+always complete. The newest ``keep`` snapshots are kept and older ones
+removed. Restore verifies the snapshot, stages a copy beside the database and
+swaps it in with an atomic rename while holding an exclusive lock; the
+copy's ``data_version`` is first moved past the live one, so ETags and
+cached reads from before the restore cannot match it. Run it with the app
+stopped: open connections keep the file they already have.
+
+Usage:
+    python backup.py backup [--dir backups] [--keep 7]
+    python backup.py list [--dir backups]
+    python backup.py verify backups/job_tracker-20240301T120000000000Z.db
+    python backup.py restore backups/job_tracker-20240301T120000000000Z.db
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DATABASE = 'job_tracker.db'
+DEFAULT_KEEP = 7
+# Pages copied per step (4 MiB with the default page size) and the pause between steps
+DEFAULT_STEP_PAGES = 1024
+DEFAULT_STEP_SLEEP = 0.005
+DEFAULT_MAX_RESTARTS = 3
+
+class BackupError(Exception):
+    """A snapshot failed verification or could not be restored"""
+
+class _Restarted(Exception):
+    pass
+
+def default_backup_dir(db_path):
+    """``backups/`` next to the database file"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+
+def snapshot_name(db_path, when=None):
+    """``<database stem>-<UTC timestamp>.db``; names sort oldest to newest"""
+    when = when or datetime.now(timezone.utc)
+    return f"{Path(db_path).stem}-{when.strftime('%Y%m%dT%H%M%S%fZ')}.db"
+
+def list_snapshots(backup_dir, db_path):
+    """Snapshots of ``db_path`` in ``backup_dir``, newest first"""
+    prefix = f'{Path(db_path).stem}-'
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+    snapshots = []
+    for name in sorted(names, reverse=True):
+        if name.startswith(prefix) and name.endswith('.db'):
+            path = os.path.join(backup_dir, name)
+            snapshots.append({'name': name, 'path': path, 'bytes': os.path.getsize(path)})
+    return snapshots
+
+def integrity_check(path):
+    """Problems reported by ``PRAGMA integrity_check``; empty when the file is sound"""
+    conn = sqlite3.connect(f'{Path(path).resolve().as_uri()}?mode=ro', uri=True)
+    try:
+        rows = [row[0] for row in conn.execute('PRAGMA integrity_check')]
+    except sqlite3.DatabaseError as e:
+        return [str(e)]
+    finally:
+        conn.close()
+    return [] if rows == ['ok'] else rows
+
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_dir(path):
+    """Persist a rename; directories cannot be opened for fsync on Windows"""
+    if os.name != 'nt':
+        _fsync(path)
+
+def copy_online(source, target_path, step_pages=DEFAULT_STEP_PAGES, sleep=DEFAULT_STEP_SLEEP,
+                max_restarts=DEFAULT_MAX_RESTARTS):
+    """Copy the database open on ``source`` into a new file; returns (pages, restarts)"""
+    restarts = 0
+    if source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+        # Pin one snapshot for every step; WAL writers carry on meanwhile
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+    while True:
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        target = sqlite3.connect(target_path)
+        last = {'remaining': None, 'total': 0}
+
+        def progress(status, remaining, total):
+            nonlocal restarts
+            # SQLite starts over when another connection writes mid-copy
+            if last['remaining'] is not None and remaining > last['remaining']:
+                restarts += 1
+                if restarts > max_restarts:
+                    raise _Restarted()
+            last['remaining'], last['total'] = remaining, total
+            if remaining:
+                # Between steps the source is unlocked; let writers in
+                time.sleep(sleep)
+
+        try:
+            pages = step_pages if restarts <= max_restarts else -1
+            source.backup(target, pages=pages, progress=progress)
+            if source.in_transaction:
+                source.rollback()
+            # Keep the copy a single self-contained file, even when the source uses WAL
+            target.execute('PRAGMA journal_mode = DELETE').fetchall()
+            return last['total'], restarts
+        except _Restarted:
+            continue
+        finally:
+            target.close()
+
+def rotate(backup_dir, db_path, keep):
+    """Remove all but the newest ``keep`` snapshots; returns the removed names"""
+    removed = []
+    for snapshot in list_snapshots(backup_dir, db_path)[keep:]:
+        os.remove(snapshot['path'])
+        removed.append(snapshot['name'])
+    return removed
+
+def backup_database(db_path, backup_dir=None, keep=DEFAULT_KEEP, step_pages=DEFAULT_STEP_PAGES,
+                    sleep=DEFAULT_STEP_SLEEP, max_restarts=DEFAULT_MAX_RESTARTS):
+    """Take a verified snapshot of ``db_path`` and rotate old ones
+
+    Returns ``{'snapshot', 'bytes', 'pages', 'restarts', 'seconds',
+    'removed'}``; raises ``BackupError`` if the copy fails verification.
+    """
+    if not os.path.exists(db_path):
+        raise BackupError(f'{db_path} does not exist')
+    backup_dir = backup_dir or default_backup_dir(db_path)
+    os.makedirs(backup_dir, exist_ok=True)
+    final = os.path.join(backup_dir, snapshot_name(db_path))
+    partial = f'{final}.partial'
+    started = time.monotonic()
+
+    source = sqlite3.connect(db_path, timeout=30)
+    try:
+        pages, restarts = copy_online(source, partial, step_pages, sleep, max_restarts)
+    finally:
+        source.close()
+
+    problems = integrity_check(partial)
+    if problems:
+        os.remove(partial)
+        raise BackupError(f'snapshot failed integrity_check: {"; ".join(problems[:5])}')
+    _fsync(partial)
+    os.replace(partial, final)
+    _fsync_dir(backup_dir)
+
+    return {
+        'snapshot': os.path.basename(final),
+        'bytes': os.path.getsize(final),
+        'pages': pages,
+        'restarts': restarts,
+        'seconds': round(time.monotonic() - started, 3),
+        'removed': rotate(backup_dir, db_path, keep),
+    }
+
+def _data_version(conn):
+    """The app's ``data_version`` counter, or None for a database without one"""
+    try:
+        row = conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+def _advance_data_version(live, staged):
+    """Move the staged copy's ``data_version`` past the live one
+
+    The snapshot carries the counter from when it was taken; restored as it
+    is, values already handed out as ETags and cache keys for later data
+    would come round again and match stale results.
+    """
+    current = _data_version(live)
+    if current is None:
+        return
+    conn = sqlite3.connect(staged)
+    try:
+        restored = _data_version(conn)
+        if restored is not None:
+            conn.execute('UPDATE data_version SET version = ? WHERE id = 1', (max(current, restored) + 1,))
+            conn.commit()
+    finally:
+        conn.close()
+
+def restore_database(snapshot, db_path):
+    """Replace ``db_path`` with a verified copy of ``snapshot`` in one rename"""
+    problems = integrity_check(snapshot)
+    if problems:
+        raise BackupError(f'{snapshot} failed integrity_check: {"; ".join(problems[:5])}')
+
+    staged = f'{db_path}.restoring'
+    source = sqlite3.connect(f'{Path(snapshot).resolve().as_uri()}?mode=ro', uri=True)
+    try:
+        copy_online(source, staged, step_pages=-1)
+    finally:
+        source.close()
+
+    live = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        # Fold any WAL into the old file so it cannot be replayed onto the new
+        # one, then wait out writers; taking the lock also rolls back a hot journal
+        journal_mode = live.execute('PRAGMA journal_mode').fetchone()[0]
+        live.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        live.execute('BEGIN EXCLUSIVE')
+        _advance_data_version(live, staged)
+        _fsync(staged)
+        os.replace(staged, db_path)
+        _fsync_dir(os.path.dirname(os.path.abspath(db_path)))
+        live.execute('ROLLBACK')
+    except BaseException:
+        if os.path.exists(staged):
+            os.remove(staged)
+        raise
+    finally:
+        live.close()
+
+    if journal_mode == 'wal':
+        # Snapshots are stored in rollback mode; put WAL back as the database had it
+        conn = sqlite3.connect(db_path)
+        conn.execute('PRAGMA journal_mode = WAL').fetchall()
+        conn.close()
+
+def command_backup(args, out):
+    result = backup_database(args.db, args.dir, keep=args.keep, step_pages=args.step_pages, sleep=args.sleep)
+    out.write(f"{result['snapshot']}: {result['bytes']} bytes, {result['pages']} pages in {result['seconds']}s, "
+              f"{result['restarts']} restart(s), integrity ok\n")
+    for name in result['removed']:
+        out.write(f'removed {name}\n')
+
+def command_list(args, out):
+    for snapshot in list_snapshots(args.dir or default_backup_dir(args.db), args.db):
+        out.write(f"{snapshot['name']:<48} {snapshot['bytes']:>14}\n")
+
+def command_verify(args, out):
+    problems = integrity_check(args.snapshot)
+    if problems:
+        raise BackupError('; '.join(problems[:20]))
+    out.write(f'{args.snapshot}: ok\n')
+
+def command_restore(args, out):
+    restore_database(args.snapshot, args.db)
+    out.write(f'restored {args.db} from {args.snapshot}\n')
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=os.environ.get('DATABASE', DATABASE),
+                        help='database file (default: $DATABASE or job_tracker.db)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backup = subparsers.add_parser('backup', help='take a verified snapshot and rotate old ones')
+    backup.add_argument('--dir', default=os.environ.get('BACKUP_DIR'), help='snapshot directory (default: backups/ next to the database)')
+    backup.add_argument('--keep', type=int, default=int(os.environ.get('BACKUP_KEEP', DEFAULT_KEEP)))
+    backup.add_argument('--step-pages', type=int, default=DEFAULT_STEP_PAGES, help='pages copied per step')
+    backup.add_argument('--sleep', type=float, default=DEFAULT_STEP_SLEEP, help='seconds between steps')
+    backup.set_defaults(handler=command_backup)
+
+    listing = subparsers.add_parser('list', help='list snapshots, newest first')
+    listing.add_argument('--dir', default=os.environ.get('BACKUP_DIR'))
+    listing.set_defaults(handler=command_list)
+
+    verify = subparsers.add_parser('verify', help='run integrity_check on a snapshot')
+    verify.add_argument('snapshot')
+    verify.set_defaults(handler=command_verify)
+
+    restore = subparsers.add_parser('restore', help='replace the database with a snapshot (stop the app first)')
+    restore.add_argument('snapshot')
+    restore.set_defaults(handler=command_restore)
+    return parser
+
+def main(argv=None, out=None):
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    if getattr(args, 'keep', 1) < 1:
+        print('error: --keep must be at least 1', file=sys.stderr)
+        return 2
+    try:
+        args.handler(args, out)
+    except (sqlite3.Error, OSError, BackupError) as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark hot-path query latency before and after archiving closed applications.
+
+Seeds a temporary database where most applications are in a terminal status,
+times the list and summary endpoints, archives with the age policy, then
+times them again.
+
+Usage:
+    python benchmarks/bench_archive.py [--rows 50000] [--open-ratio 0.15] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, init_db, archive_applications, TERMINAL_STATUSES
+
+OPEN_STATUSES = ['Applied', 'Interview 1', 'Interview 2', 'Interview 3']
+
+HOT_PATHS = [
+    '/api/applications?fields=status',
+    '/api/applications?format=columnar&include=history',
+    '/api/applications?sort=status&format=columnar&include=history',
+    '/api/summary',
+]
+
+def seed(db_path, rows, open_ratio):
+    """Insert synthetic applications, closed ones last updated a year ago."""
+    conn = sqlite3.connect(db_path)
+    for i in range(rows):
+        is_open = random.random() < open_ratio
+        status = random.choice(OPEN_STATUSES if is_open else TERMINAL_STATUSES)
+        last_updated = '2099-01-01 00:00:00' if is_open else '2020-01-01 00:00:00'
+        cursor = conn.execute('''
+            INSERT INTO job_applications (company_name, job_role, applied_date, url, status_id, notes, last_updated)
+            VALUES (?, ?, ?, ?, (SELECT id FROM statuses WHERE label = ?), '', ?)
+        ''', (f'Company {i % 2000}', f'Role {i % 50}', f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+              f'https://example.com/jobs/{i}', status, last_updated))
+        conn.execute('''
+            INSERT INTO status_history (application_id, status_id)
+            VALUES (?, (SELECT id FROM statuses WHERE label = ?))
+        ''', (cursor.lastrowid, status))
+    conn.commit()
+    conn.close()
+
+def time_paths(client, repeat):
+    """Return the median latency in milliseconds for each hot path."""
+    results = {}
+    for path in HOT_PATHS:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, path
+        results[path] = sorted(samples)[len(samples) // 2]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--open-ratio', type=float, default=0.15)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    app.config['DATABASE'] = db_path
+    os.environ.setdefault('FLASK_USERNAME', 'bench')
+    os.environ.setdefault('FLASK_PASSWORD', 'bench')
+
+    try:
+        init_db()
+        seed(db_path, args.rows, args.open_ratio)
+
+        client = app.test_client()
+        client.post('/login', data={'username': os.environ['FLASK_USERNAME'],
+                                    'password': os.environ['FLASK_PASSWORD']})
+
+        before = time_paths(client, args.repeat)
+
+        start = time.perf_counter()
+        archived = archive_applications(older_than_days=30)
+        archive_seconds = time.perf_counter() - start
+
+        after = time_paths(client, args.repeat)
+
+        print(f"Seeded {args.rows} applications, archived {archived} in {archive_seconds:.2f}s")
+        print(f"{'path':<60} {'before ms':>10} {'after ms':>10}")
+        for path in HOT_PATHS:
+            print(f"{path:<60} {before[path]:>10.1f} {after[path]:>10.1f}")
+    finally:
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
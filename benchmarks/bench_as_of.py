@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark point-in-time reads (``as_of``) over a large status history.
+
+Seeds a temporary database through init_db with --apps applications and
+--changes status changes each, spread over 2024, then times
+``repository.summary(as_of=...)`` and a filtered ``repository.list`` at a
+few cut-offs: cold (cache emptied before every run) and cached. For
+comparison the same summary is computed with a LEAD window over the whole
+history, the other way to find the status in force at a time.
+
+Usage:
+    python benchmarks/bench_as_of.py [--apps 50000] [--changes 6] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, init_db, repository
+from repository import STATUSES, VersionedCache, epoch_seconds
+
+CUTOFFS = ['2024-02-01 00:00:00', '2024-07-01 00:00:00', '2024-12-31 23:59:59']
+
+WINDOW_SUMMARY = '''
+    SELECT s.label, COUNT(*) FROM (
+        SELECT application_id, status_id, changed_at_epoch,
+               LEAD(changed_at_epoch) OVER (PARTITION BY application_id ORDER BY changed_at_epoch, id) AS until
+        FROM status_history WHERE changed_at_epoch <= ?
+    ) AS h JOIN statuses AS s ON s.id = h.status_id
+    WHERE h.until IS NULL
+    GROUP BY s.label
+'''
+
+def seed(db_path, apps, changes):
+    """Applications created through 2024, each moving through ``changes`` statuses"""
+    rng = random.Random(1)
+    start = epoch_seconds('2024-01-01 00:00:00')
+    year = 366 * 86400
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO job_applications (id, company_name, job_role, applied_date, status_id)
+        VALUES (?, ?, ?, '2024-01-01', ?)
+    ''', [(i, f'Company {i % 3000}', f'Role {i % 40}', 1) for i in range(1, apps + 1)])
+    history = []
+    for app_id in range(1, apps + 1):
+        times = sorted(rng.randrange(year) for _ in range(changes))
+        for when in times:
+            history.append((app_id, rng.choice(STATUSES)[0],
+                            time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(start + when))))
+    conn.executemany('INSERT INTO status_history (application_id, status_id, changed_at) VALUES (?, ?, ?)', history)
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+    return len(history)
+
+def median_ms(fn, repeat, cold=False):
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            repository.as_of_cache = VersionedCache()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apps', type=int, default=50000)
+    parser.add_argument('--changes', type=int, default=6)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    app.config['DATABASE'] = db_path
+
+    try:
+        init_db()
+        history_rows = seed(db_path, args.apps, args.changes)
+        print(f"{args.apps} applications, {history_rows} history rows; median of {args.repeat} runs\n")
+
+        conn = sqlite3.connect(db_path)
+        filters = {'status': ['Interview 1', 'Interview 2']}
+        print(f"{'as_of':<22} {'read':<26} {'cold ms':>9} {'cached ms':>10} {'window ms':>10}")
+        for as_of in CUTOFFS:
+            summary = lambda: repository.summary(as_of=as_of)
+            listing = lambda: repository.list(filters, include_history=False, as_of=as_of)
+            window = lambda: conn.execute(WINDOW_SUMMARY, (epoch_seconds(as_of),)).fetchall()
+
+            window_ms = median_ms(window, args.repeat)
+            print(f"{as_of:<22} {'summary':<26} {median_ms(summary, args.repeat, cold=True):>9.1f} "
+                  f"{median_ms(summary, args.repeat):>10.3f} {window_ms:>10.1f}")
+            print(f"{'':<22} {'list status=Interview 1,2':<26} {median_ms(listing, args.repeat, cold=True):>9.1f} "
+                  f"{median_ms(listing, args.repeat):>10.3f}")
+        conn.close()
+    finally:
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/autocomplete lookups, one per keystroke, on both storage engines.
+
+Seeds a temporary database (and a memory store) with applications spread
+over a few thousand companies and roles, then times ``autocomplete`` for
+every prefix of a set of typed words, from one character to the full word.
+The SQLite numbers include opening a connection, as each request does.
+
+Usage:
+    python benchmarks/bench_autocomplete.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, init_db
+from repository import SQLiteRepository, MemoryRepository
+
+SYLLABLES = ['ac', 'me', 'go', 'og', 'le', 'in', 'tel', 'net', 'soft', 'data', 'cloud', 'la', 'bs', 'ra', 'tech']
+ROLES = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'Data Engineer', 'Product Manager',
+         'Site Reliability Engineer', 'Security Engineer', 'Designer', 'Engineering Manager', 'Analyst']
+
+def company_names(count):
+    names = set()
+    while len(names) < count:
+        names.add(''.join(random.choice(SYLLABLES) for _ in range(random.randrange(2, 4))).title())
+    return sorted(names)
+
+def seed(db_path, store, rows):
+    """The same applications in both engines; a few companies get most of them"""
+    companies = company_names(3000)
+    weights = [1 / (rank + 1) for rank in range(len(companies))]
+    roles = [f'{level} {role}'.strip() for role in ROLES for level in ('', 'Junior', 'Staff', 'Lead')]
+    applications = [(random.choices(companies, weights)[0], random.choice(roles)) for _ in range(rows)]
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+        VALUES (?, ?, '2024-01-01', 1)
+    ''', applications)
+    conn.commit()
+    conn.close()
+    for company, role in applications:
+        store.add({'company_name': company, 'job_role': role, 'applied_date': '2024-01-01', 'status': 'Applied'})
+    return companies
+
+def time_keystrokes(repository, field, words, repeat):
+    """Per-lookup latencies in ms for every prefix of every word"""
+    samples = []
+    for _ in range(repeat):
+        for word in words:
+            for end in range(1, len(word) + 1):
+                start = time.perf_counter()
+                repository.autocomplete(field, word[:end])
+                samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    app.config['DATABASE'] = db_path
+
+    try:
+        init_db()
+        store = MemoryRepository()
+        companies = seed(db_path, store, args.rows)
+        engines = [('sqlite', SQLiteRepository(lambda: db_path)), ('memory', store)]
+        typed = {'company_name': random.sample(companies, 20), 'job_role': ['software', 'data sci', 'staff pro']}
+
+        print(f"Seeded {args.rows} applications over {len(companies)} companies\n")
+        print(f"{'engine':<8} {'field':<14} {'lookups':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, repository in engines:
+            for field, words in typed.items():
+                samples = time_keystrokes(repository, field, words, args.repeat)
+                print(f"{name:<8} {field:<14} {len(samples):>8} "
+                      f"{percentile(samples, 0.5):>8.3f} {percentile(samples, 0.99):>8.3f}")
+    finally:
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
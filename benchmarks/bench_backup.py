@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark online backup on a large database and its impact on request latency.
+
+Builds a temporary database of --size-mb (1 GB by default) through init_db,
+padding applications with long notes. Reader and writer threads stand in for
+request traffic: readers fetch one application and the status summary,
+writers update one application. Their latency is measured for --window
+seconds without a backup, then while backup_database runs. Backup duration,
+restarts caused by concurrent writes and integrity_check time are reported.
+
+Usage:
+    python benchmarks/bench_backup.py [--size-mb 1024] [--writes-per-second 5] [--step-pages 1024] [--wal]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, init_db
+from backup import DEFAULT_MAX_RESTARTS, DEFAULT_STEP_SLEEP, backup_database, integrity_check
+
+NOTES_BYTES = 4000
+
+def seed(db_path, size_mb):
+    """Insert applications with ~4 KB of notes until the file reaches size_mb; returns the row count"""
+    conn = sqlite3.connect(db_path)
+    target = size_mb * 1024 * 1024
+    rows = 0
+    batch = 5000
+    while os.path.getsize(db_path) < target:
+        conn.executemany('''
+            INSERT INTO job_applications (company_name, job_role, applied_date, status_id, notes)
+            VALUES (?, ?, '2024-03-01', 1, ?)
+        ''', [(f'Company {i % 5000}', f'Role {i % 40}', os.urandom(NOTES_BYTES // 2).hex())
+              for i in range(rows, rows + batch)])
+        conn.commit()
+        rows += batch
+    conn.close()
+    return rows
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def traffic(db_path, rows, stop, writes_per_second, samples):
+    """Run one reader and one writer until stop is set, appending latencies (ms) to samples"""
+    def reader():
+        rng = random.Random(1)
+        conn = sqlite3.connect(db_path, timeout=5)
+        while not stop.is_set():
+            start = time.perf_counter()
+            conn.execute('SELECT * FROM job_applications WHERE id = ?', (rng.randrange(1, rows),)).fetchall()
+            conn.execute('SELECT status_id, COUNT(*) FROM job_applications GROUP BY status_id').fetchall()
+            samples['read'].append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+        conn.close()
+
+    def writer():
+        rng = random.Random(2)
+        conn = sqlite3.connect(db_path, timeout=5)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                conn.execute("UPDATE job_applications SET job_role = ? WHERE id = ?",
+                             (f'Role {rng.randrange(40)}', rng.randrange(1, rows)))
+                conn.commit()
+                samples['write'].append((time.perf_counter() - start) * 1000)
+            except sqlite3.OperationalError:
+                samples['write_errors'] += 1
+            time.sleep(1 / writes_per_second)
+        conn.close()
+
+    threads = [threading.Thread(target=reader), threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def measure(db_path, rows, writes_per_second, action):
+    """Latency samples while action() runs; returns (samples, action result)"""
+    samples = {'read': [], 'write': [], 'write_errors': 0}
+    stop = threading.Event()
+    threads = traffic(db_path, rows, stop, writes_per_second, samples)
+    try:
+        result = action()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return samples, result
+
+def report(label, samples):
+    for kind in ('read', 'write'):
+        values = sorted(samples[kind])
+        print(f"  {label:<16} {kind:<6} {len(values):>6} ops   p50 {percentile(values, 0.5):>8.2f} ms   "
+              f"p99 {percentile(values, 0.99):>8.2f} ms   max {values[-1] if values else 0:>8.2f} ms")
+    if samples['write_errors']:
+        print(f"  {label:<16} {samples['write_errors']} write(s) failed with database is locked")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--writes-per-second', type=float, default=5)
+    parser.add_argument('--step-pages', type=int, default=1024)
+    parser.add_argument('--sleep', type=float, default=DEFAULT_STEP_SLEEP)
+    parser.add_argument('--max-restarts', type=int, default=DEFAULT_MAX_RESTARTS)
+    parser.add_argument('--window', type=float, default=10, help='seconds of baseline traffic')
+    parser.add_argument('--wal', action='store_true', help='switch the database to WAL mode first')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'job_tracker.db')
+    app.config['DATABASE'] = db_path
+
+    try:
+        init_db()
+        start = time.perf_counter()
+        rows = seed(db_path, args.size_mb)
+        if args.wal:
+            conn = sqlite3.connect(db_path)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.close()
+        print(f"Seeded {rows} applications, {os.path.getsize(db_path) / 2**20:.0f} MiB "
+              f"in {time.perf_counter() - start:.0f}s\n")
+
+        baseline, _ = measure(db_path, rows, args.writes_per_second, lambda: time.sleep(args.window))
+
+        def run_backup():
+            return backup_database(db_path, os.path.join(workdir, 'backups'), step_pages=args.step_pages,
+                                   sleep=args.sleep, max_restarts=args.max_restarts)
+        during, result = measure(db_path, rows, args.writes_per_second, run_backup)
+
+        snapshot = os.path.join(workdir, 'backups', result['snapshot'])
+        start = time.perf_counter()
+        integrity_check(snapshot)
+        check_seconds = time.perf_counter() - start
+
+        print(f"Backup: {result['bytes'] / 2**20:.0f} MiB, {result['pages']} pages in {result['seconds']:.1f}s "
+              f"({args.step_pages} pages per step, {args.sleep * 1000:g} ms sleep), "
+              f"{result['restarts']} restart(s); integrity_check alone {check_seconds:.1f}s\n")
+        print(f"Request latency ({args.writes_per_second:g} writes/s)")
+        report('no backup', baseline)
+        report('during backup', during)
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
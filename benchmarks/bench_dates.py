@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark date range scans and sorts on the integer date columns against the old text columns.
+
+Seeds a temporary database, then times the same queries two ways: through
+the integer columns and their indexes (applied_day, last_updated_epoch,
+changed_at_epoch), and through indexes on the ISO text columns, as the schema
+had before. Query plans are printed so index seeks and sorts can be checked.
+
+Usage:
+    python benchmarks/bench_dates.py [--rows 100000] [--repeat 7]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, init_db
+from repository import APPLICATION_COLUMNS, julian_day, epoch_seconds, select_list
+
+# What /api/applications reads, so neither variant is answered from the index alone
+COLUMNS = select_list(APPLICATION_COLUMNS)
+
+STATUSES = ['Applied', 'Interview 1', 'Interview 2', 'Offer', 'Denied without interview (non-visa related)']
+
+def seed(db_path, rows):
+    """Insert applications spread over two years, each with one to three history entries."""
+    conn = sqlite3.connect(db_path)
+    start = date(2023, 1, 1)
+    applications = []
+    history = []
+    for i in range(1, rows + 1):
+        applied = start + timedelta(days=random.randrange(730))
+        updated = f'{applied + timedelta(days=random.randrange(60))} {random.randrange(24):02d}:{random.randrange(60):02d}:00'
+        applications.append((i, f'Company {i % 3000}', f'Role {i % 40}', applied.isoformat(),
+                             random.choice(STATUSES), updated))
+        for step in range(random.randrange(1, 4)):
+            history.append((i, STATUSES[step], f'{applied + timedelta(days=step * 7)} 09:00:00'))
+    conn.executemany('''
+        INSERT INTO job_applications (id, company_name, job_role, applied_date, status_id, last_updated)
+        VALUES (?, ?, ?, ?, (SELECT id FROM statuses WHERE label = ?), ?)
+    ''', applications)
+    conn.executemany('''
+        INSERT INTO status_history (application_id, status_id, changed_at)
+        VALUES (?, (SELECT id FROM statuses WHERE label = ?), ?)
+    ''', history)
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+
+def queries():
+    """(label, integer-column SQL, text-column SQL, params for each)"""
+    since = '2024-11-01'
+    updated_since = '2024-12-01 00:00:00'
+    return [
+        ('applied in the last 60 days, newest first',
+         f'SELECT {COLUMNS} FROM job_applications WHERE applied_day >= ? ORDER BY applied_day DESC',
+         f'SELECT {COLUMNS} FROM job_applications WHERE applied_date >= ? ORDER BY applied_date DESC',
+         (julian_day(since),), (since,)),
+        ('applied in one month',
+         'SELECT COUNT(*) FROM job_applications WHERE applied_day BETWEEN ? AND ?',
+         'SELECT COUNT(*) FROM job_applications WHERE applied_date BETWEEN ? AND ?',
+         (julian_day('2024-03-01'), julian_day('2024-03-31')), ('2024-03-01', '2024-03-31')),
+        ('updated in the last 30 days',
+         f'SELECT {COLUMNS} FROM job_applications WHERE last_updated_epoch >= ? ORDER BY last_updated_epoch DESC',
+         f'SELECT {COLUMNS} FROM job_applications WHERE last_updated >= ? ORDER BY last_updated DESC',
+         (epoch_seconds(updated_since),), (updated_since,)),
+        ('all applications sorted by date',
+         f'SELECT {COLUMNS} FROM job_applications ORDER BY applied_day DESC',
+         f'SELECT {COLUMNS} FROM job_applications ORDER BY applied_date DESC',
+         (), ()),
+        ('all history, per application oldest first',
+         'SELECT application_id, status_id, changed_at FROM status_history ORDER BY application_id, changed_at_epoch, id',
+         'SELECT application_id, status_id, changed_at FROM status_history ORDER BY application_id, changed_at, id',
+         (), ()),
+    ]
+
+def median_ms(conn, sql, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+def plan(conn, sql, params):
+    return '; '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    app.config['DATABASE'] = db_path
+
+    try:
+        init_db()
+        seed(db_path, args.rows)
+        conn = sqlite3.connect(db_path)
+        # The text-column indexes the schema used before the integer columns
+        conn.execute('CREATE INDEX bench_applied_date ON job_applications(applied_date)')
+        conn.execute('CREATE INDEX bench_last_updated ON job_applications(last_updated)')
+        conn.execute('CREATE INDEX bench_history_app_id ON status_history(application_id)')
+        conn.execute('ANALYZE')
+
+        print(f"Seeded {args.rows} applications, median of {args.repeat} runs\n")
+        print(f"{'query':<44} {'integer ms':>11} {'text ms':>9}")
+        plans = []
+        for label, int_sql, text_sql, int_params, text_params in queries():
+            int_ms = median_ms(conn, int_sql, int_params, args.repeat)
+            text_ms = median_ms(conn, text_sql, text_params, args.repeat)
+            print(f"{label:<44} {int_ms:>11.1f} {text_ms:>9.1f}")
+            plans.append((label, plan(conn, int_sql, int_params), plan(conn, text_sql, text_params)))
+
+        print('\nQuery plans')
+        for label, int_plan, text_plan in plans:
+            print(f'  {label}\n    integer: {int_plan}\n    text:    {text_plan}')
+        conn.close()
+    finally:
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env node
+/*
+ * Benchmark dashboard rendering in static/script.js without a browser.
+ *
+ * Loads script.js into a Node vm context with a minimal DOM stand-in, seeds
+ * synthetic applications and times the first render, search keystrokes, a
+ * live single-row update, scrolling from the top of the list to the bottom
+ * and, for comparison, rebuilding every card's HTML as the dashboard did
+ * before keyed rendering. The stand-in does not parse HTML or lay out pages:
+ * scrolling moves the grid by whole estimated rows, and the numbers cover
+ * script-side work (filtering, escaping, building card markup, DOM
+ * insert/move/remove calls) only.
+ *
+ * Usage:
+ *     node benchmarks/bench_render.js [--rows 10000] [--repeat 5]
+ */
+
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+
+function parseArgs(argv) {
+    const args = { rows: 10000, repeat: 5 };
+    for (let i = 0; i < argv.length; i += 2) {
+        const name = argv[i].replace(/^--/, '');
+        if (!(name in args)) {
+            throw new Error(`Unknown option ${argv[i]}`);
+        }
+        args[name] = Number(argv[i + 1]);
+    }
+    return args;
+}
+
+const stats = { created: 0, inserted: 0, removed: 0 };
+
+class FakeElement {
+    constructor(tagName) {
+        this.tagName = tagName.toUpperCase();
+        this.children = [];
+        this.parentNode = null;
+        this.style = {};
+        this.className = '';
+        this.textContent = '';
+        this.value = '';
+        this.html = '';
+    }
+
+    get firstChild() {
+        return this.children[0] || null;
+    }
+
+    get nextSibling() {
+        if (!this.parentNode) {
+            return null;
+        }
+        const siblings = this.parentNode.children;
+        return siblings[siblings.indexOf(this) + 1] || null;
+    }
+
+    set innerHTML(html) {
+        this.html = html;
+        this.children.forEach(child => { child.parentNode = null; });
+        this.children = [];
+        if (this.tagName === 'TEMPLATE') {
+            const element = new FakeElement('div');
+            element.html = html;
+            stats.created++;
+            this.content = { firstElementChild: element };
+        }
+    }
+
+    get innerHTML() {
+        return this.html;
+    }
+
+    insertBefore(node, reference) {
+        if (node.parentNode) {
+            node.parentNode.removeChild(node);
+            stats.removed--;
+        }
+        const index = reference ? this.children.indexOf(reference) : this.children.length;
+        this.children.splice(index, 0, node);
+        node.parentNode = this;
+        stats.inserted++;
+        return node;
+    }
+
+    appendChild(node) {
+        return this.insertBefore(node, null);
+    }
+
+    removeChild(node) {
+        this.children.splice(this.children.indexOf(node), 1);
+        node.parentNode = null;
+        stats.removed++;
+        return node;
+    }
+
+    after() {}
+
+    addEventListener() {}
+}
+
+function createContext() {
+    const elements = {
+        'search-input': new FakeElement('input'),
+        'sort-select': Object.assign(new FakeElement('select'), { value: 'applied_date' }),
+        'order-select': Object.assign(new FakeElement('select'), { value: 'desc' }),
+    };
+    const grid = new FakeElement('div');
+    // Scrolled by setting grid.scrollOffset; the page has no other content
+    grid.scrollOffset = 0;
+    grid.getBoundingClientRect = () => ({ top: -grid.scrollOffset });
+    const document = {
+        head: new FakeElement('head'),
+        body: new FakeElement('body'),
+        documentElement: new FakeElement('html'),
+        createElement: tag => new FakeElement(tag),
+        getElementById: id => elements[id] || new FakeElement('div'),
+        querySelector: selector => (selector === '.applications-grid' ? grid : null),
+        querySelectorAll: () => [],
+        addEventListener() {},
+    };
+    const context = {
+        document,
+        window: { location: { pathname: '/bench' }, addEventListener() {}, innerHeight: 900 },
+        console,
+        setTimeout,
+        clearTimeout,
+        WeakMap,
+        Map,
+    };
+    vm.createContext(context);
+    const source = fs.readFileSync(path.join(__dirname, '..', 'static', 'script.js'), 'utf8');
+    vm.runInContext(source, context);
+    return { context, grid, search: elements['search-input'] };
+}
+
+const COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Cyberdyne'];
+const ROLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'SRE', 'Designer'];
+const STATUSES = ['Applied', 'Interview 1', 'Interview 2', 'Interview 3', 'Offer',
+                  'Denied without interview (visa related)', 'Denied without interview (non-visa related)'];
+
+function seed(rows) {
+    const applications = [];
+    for (let i = 0; i < rows; i++) {
+        const historyLength = 1 + (i % 4);
+        const day = String(1 + (i % 28)).padStart(2, '0');
+        applications.push({
+            id: rows - i,
+            company_name: `${COMPANIES[i % COMPANIES.length]} ${i}`,
+            job_role: ROLES[i % ROLES.length],
+            applied_date: `2024-01-${day}`,
+            url: i % 3 ? `https://jobs.example.com/${i}?ref=<board>&a=1` : '',
+            status: STATUSES[historyLength - 1],
+            notes: i % 2 ? `Referral from <Sam> & team, round ${i % 5}` : null,
+            last_updated: `2024-02-${day} 12:00:00`,
+            status_history: STATUSES.slice(0, historyLength).map(status => ({ status, changed_at: `2024-01-${day} 09:00:00` })),
+        });
+    }
+    // Same order as the dashboard's default sort (applied_date desc)
+    return applications.sort((a, b) => (a.applied_date < b.applied_date ? 1 : a.applied_date > b.applied_date ? -1 : 0));
+}
+
+function time(repeat, setup, run) {
+    const samples = [];
+    for (let i = 0; i < repeat; i++) {
+        setup();
+        const started = performance.now();
+        run();
+        samples.push(performance.now() - started);
+    }
+    samples.sort((a, b) => a - b);
+    return samples[Math.floor(samples.length / 2)];
+}
+
+function report(label, ms, extra = '') {
+    console.log(`${label.padEnd(44)} ${ms.toFixed(2).padStart(9)} ms ${extra}`);
+}
+
+function main() {
+    const args = parseArgs(process.argv.slice(2));
+    const rows = seed(args.rows);
+    const resetStats = () => Object.assign(stats, { created: 0, inserted: 0, removed: 0 });
+    const fresh = () => {
+        const env = createContext();
+        env.context.allApplications = rows.map(row => ({ ...row }));
+        vm.runInContext('allApplications = this.allApplications;', env.context);
+        return env;
+    };
+
+    console.log(`${args.rows} applications, median of ${args.repeat} runs\n`);
+
+    let env;
+    const first = time(args.repeat, () => { env = fresh(); resetStats(); },
+        () => vm.runInContext('applyFilters()', env.context));
+    report('First render', first, `(${env.grid.children.length - 2} cards in DOM, ${stats.created} built)`);
+
+    // Typing "globex 1" one character at a time, with debouncing disabled
+    const keystrokes = 'globex 1';
+    const typing = time(args.repeat, () => {
+        env = fresh();
+        vm.runInContext('applyFilters()', env.context);
+        resetStats();
+    }, () => {
+        for (let i = 1; i <= keystrokes.length; i++) {
+            env.search.value = keystrokes.slice(0, i);
+            vm.runInContext('applyFilters()', env.context);
+        }
+    });
+    report(`Search, ${keystrokes.length} keystrokes`, typing,
+        `(${(typing / keystrokes.length).toFixed(2)} ms/keystroke, ${stats.created} cards built)`);
+
+    const update = time(args.repeat, () => {
+        env = fresh();
+        env.search.value = '';
+        vm.runInContext('applyFilters()', env.context);
+        resetStats();
+    }, () => {
+        env.context.changed = { ...rows[10], status: 'Offer', last_updated: '2024-03-01 00:00:00' };
+        vm.runInContext('upsertApplication(this.changed); refreshApplications();', env.context);
+    });
+    report('Live update of one row', update, `(${stats.created} cards built)`);
+
+    // One viewport per step, as the scroll handler would see it
+    let largestWindow = 0;
+    const scroll = time(args.repeat, () => {
+        env = fresh();
+        vm.runInContext('applyFilters()', env.context);
+        resetStats();
+        largestWindow = 0;
+    }, () => {
+        const height = vm.runInContext('Math.ceil(filteredApplications.length / gridColumns) * rowHeight', env.context);
+        for (let offset = 0; offset <= height; offset += env.context.window.innerHeight) {
+            env.grid.scrollOffset = offset;
+            vm.runInContext('shiftWindow()', env.context);
+            largestWindow = Math.max(largestWindow, env.grid.children.length - 2);
+        }
+    });
+    report('Scroll top to bottom', scroll,
+        `(at most ${largestWindow} cards in DOM, ${env.grid.children.length - 2} at the end, ${stats.created} built)`);
+
+    // The previous renderer rebuilt all cards' markup on every keystroke
+    const rebuild = time(args.repeat, () => { env = fresh(); },
+        () => vm.runInContext('document.querySelector(".applications-grid").innerHTML = allApplications.map(renderCard).join("")', env.context));
+    report('Full innerHTML rebuild (previous renderer)', rebuild, '(per keystroke)');
+}
+
+if (require.main === module) {
+    main();
+}
+
+module.exports = { seed };
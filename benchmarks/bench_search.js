@@ -0,0 +1,82 @@
+#!/usr/bin/env node
+/*
+ * Benchmark the dashboard search index in static/search-worker.js.
+ *
+ * Builds the trigram index over synthetic applications and times queries for
+ * each prefix of a search as it is typed, alone and combined with a status
+ * filter, against the linear scan that lowercases every row per keystroke.
+ * Runs the index in this process; in the browser the same work happens in a
+ * Web Worker, off the main thread.
+ *
+ * Usage:
+ *     node benchmarks/bench_search.js [--rows 50000] [--term "globex 12"]
+ */
+
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+const { seed } = require('./bench_render');
+
+function parseArgs(argv) {
+    const args = { rows: 50000, term: 'globex 12' };
+    for (let i = 0; i < argv.length; i += 2) {
+        const name = argv[i].replace(/^--/, '');
+        if (!(name in args)) {
+            throw new Error(`Unknown option ${argv[i]}`);
+        }
+        args[name] = name === 'rows' ? Number(argv[i + 1]) : argv[i + 1];
+    }
+    return args;
+}
+
+function loadIndexClass() {
+    const context = { console };
+    vm.createContext(context);
+    const source = fs.readFileSync(path.join(__dirname, '..', 'static', 'search-worker.js'), 'utf8');
+    vm.runInContext(source, context);
+    return vm.runInContext('SearchIndex', context);
+}
+
+// What applyFilters did before the index: lowercase four fields per row per keystroke
+function linearScan(rows, term, status) {
+    return rows.filter(app =>
+        (status === 'all' || app.status === status) &&
+        (app.company_name.toLowerCase().includes(term) ||
+         app.job_role.toLowerCase().includes(term) ||
+         app.status.toLowerCase().includes(term) ||
+         (app.notes ? app.notes.toLowerCase().includes(term) : false)));
+}
+
+function timed(run) {
+    const started = performance.now();
+    const result = run();
+    return [performance.now() - started, result];
+}
+
+function main() {
+    const args = parseArgs(process.argv.slice(2));
+    const rows = seed(args.rows);
+    const SearchIndex = loadIndexClass();
+
+    const [buildMs, index] = timed(() => new SearchIndex(rows));
+    console.log(`${args.rows} applications, index built in ${buildMs.toFixed(1)} ms\n`);
+    console.log(`${'query'.padEnd(28)} ${'status'.padEnd(12)} ${'matches'.padStart(8)} ${'index ms'.padStart(9)} ${'scan ms'.padStart(9)}`);
+
+    for (const status of ['all', 'Interview 1']) {
+        for (let i = 1; i <= args.term.length; i++) {
+            const term = args.term.slice(0, i);
+            const [indexMs, ids] = timed(() => index.query(term, status));
+            const [scanMs, scanned] = timed(() => linearScan(rows, term, status));
+            const matches = ids === null ? rows.length : ids.length;
+            if (matches !== scanned.length) {
+                throw new Error(`Index and scan disagree for "${term}" (${matches} vs ${scanned.length})`);
+            }
+            console.log(`${JSON.stringify(term).padEnd(28)} ${status.padEnd(12)} ${String(matches).padStart(8)} ${indexMs.toFixed(2).padStart(9)} ${scanMs.toFixed(2).padStart(9)}`);
+        }
+    }
+
+    const [upsertMs] = timed(() => index.upsert({ ...rows[0], company_name: 'Globex 12 Renamed' }));
+    console.log(`\nSingle-row upsert: ${upsertMs.toFixed(3)} ms`);
+}
+
+main();
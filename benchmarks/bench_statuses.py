@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark status labels stored as text against status ids into the statuses table.
+
+Seeds a temporary database in the old layout (a ``status`` text column in
+job_applications and status_history, indexed), times status summaries and
+filters, converts it with ``migrate_status_ids`` and times the same reads
+again after a VACUUM. Table and index sizes come from the ``dbstat`` virtual
+table.
+
+Usage:
+    python benchmarks/bench_statuses.py [--rows 100000] [--repeat 7] [--batch-size 500]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import migrate_status_ids
+from repository import STATUSES
+
+LABELS = [label for _, label, _ in STATUSES]
+
+def seed(db_path, rows):
+    """Old layout: statuses table present (init_db creates it first), text status columns"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE statuses (id INTEGER PRIMARY KEY, label TEXT NOT NULL UNIQUE,
+                               ordinal INTEGER NOT NULL, is_terminal INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE job_applications (id INTEGER PRIMARY KEY AUTOINCREMENT, company_name TEXT NOT NULL,
+                                       job_role TEXT NOT NULL, applied_date DATE NOT NULL, url TEXT,
+                                       status TEXT NOT NULL DEFAULT 'Applied', notes TEXT, last_updated TIMESTAMP);
+        CREATE TABLE status_history (id INTEGER PRIMARY KEY AUTOINCREMENT, application_id INTEGER NOT NULL,
+                                     status TEXT NOT NULL, changed_at TIMESTAMP);
+    ''')
+    conn.executemany('INSERT INTO statuses VALUES (?, ?, ?, ?)',
+                     [(status_id, label, ordinal, int(terminal))
+                      for ordinal, (status_id, label, terminal) in enumerate(STATUSES)])
+    conn.executemany('''
+        INSERT INTO job_applications (company_name, job_role, applied_date, status, last_updated)
+        VALUES (?, ?, '2024-01-01', ?, '2024-01-01 00:00:00')
+    ''', [(f'Company {i % 3000}', f'Role {i % 40}', random.choice(LABELS)) for i in range(rows)])
+    conn.executemany('''
+        INSERT INTO status_history (application_id, status, changed_at) VALUES (?, ?, '2024-01-01 00:00:00')
+    ''', [(i % rows + 1, random.choice(LABELS)) for i in range(rows * 2)])
+    conn.execute('CREATE INDEX idx_job_applications_status ON job_applications(status)')
+    conn.commit()
+    return conn
+
+def size_kib(conn, name):
+    return conn.execute('SELECT SUM(pgsize) FROM dbstat WHERE name = ?', (name,)).fetchone()[0] / 1024
+
+def median_ms(conn, sql, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+def measure(conn, layout, index, repeat):
+    if layout == 'text':
+        summary = 'SELECT status, COUNT(*) FROM job_applications GROUP BY status'
+        history = 'SELECT status, COUNT(*) FROM status_history GROUP BY status'
+        filtered = 'SELECT COUNT(*) FROM job_applications WHERE status IN (?, ?)'
+    else:
+        summary = '''
+            SELECT statuses.label, counts.count
+            FROM (SELECT status_id, COUNT(*) AS count FROM job_applications GROUP BY status_id) AS counts
+            JOIN statuses ON statuses.id = counts.status_id
+        '''
+        history = '''
+            SELECT statuses.label, counts.count
+            FROM (SELECT status_id, COUNT(*) AS count FROM status_history GROUP BY status_id) AS counts
+            JOIN statuses ON statuses.id = counts.status_id
+        '''
+        filtered = '''
+            SELECT COUNT(*) FROM job_applications
+            WHERE status_id IN (SELECT id FROM statuses WHERE label IN (?, ?))
+        '''
+    return {
+        'job_applications KiB': size_kib(conn, 'job_applications'),
+        'status_history KiB': size_kib(conn, 'status_history'),
+        'status index KiB': size_kib(conn, index),
+        'summary GROUP BY ms': median_ms(conn, summary, (), repeat),
+        'history GROUP BY ms': median_ms(conn, history, (), repeat),
+        'status filter ms': median_ms(conn, filtered, ('Applied', 'Offer'), repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    try:
+        conn = seed(db_path, args.rows)
+        before = measure(conn, 'text', 'idx_job_applications_status', args.repeat)
+
+        start = time.perf_counter()
+        converted = migrate_status_ids(conn, args.batch_size)
+        migrate_s = time.perf_counter() - start
+        conn.execute('CREATE INDEX idx_job_applications_status_id ON job_applications(status_id)')
+        conn.execute('VACUUM')
+        after = measure(conn, 'id', 'idx_job_applications_status_id', args.repeat)
+        conn.close()
+
+        print(f"{args.rows} applications, {args.rows * 2} history rows; migrated {converted} rows "
+              f"in {migrate_s:.2f}s (batches of {args.batch_size})\n")
+        print(f"{'':<24} {'text':>10} {'status_id':>10}")
+        for key in before:
+            print(f"{key:<24} {before[key]:>10.1f} {after[key]:>10.1f}")
+    finally:
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold template loading from source against the precompiled build, and cached page renders.
+
+A cold load is what a fresh process pays on its first request: every template is
+parsed and compiled from source, or imported from the modules written by
+``python templating.py``. Each run uses a new environment (and a new
+ModuleLoader), so nothing is reused between runs. Then /login and /add are
+rendered per request with render_template and through the page cache.
+
+Usage:
+    python benchmarks/bench_templates.py [--repeat 50]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import render_template
+from jinja2 import ModuleLoader
+
+from app import app, init_db, repository
+from templating import PageCache, compile_templates
+
+TEMPLATES = ['index.html', 'add.html', 'edit.html', 'login.html', '_flashes.html']
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+def cold_load(make_loader):
+    def load():
+        env = app.jinja_env.overlay(loader=make_loader(), cache_size=0)
+        for name in TEMPLATES:
+            env.get_template(name)
+    return load
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    target = tempfile.mkdtemp()
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    app.config['DATABASE'] = db_path
+
+    try:
+        init_db()
+        compile_templates(app, target)
+
+        print(f"Median of {args.repeat} runs\n")
+        source_ms = median_ms(cold_load(app.create_global_jinja_loader), args.repeat)
+        compiled_ms = median_ms(cold_load(lambda: ModuleLoader(target)), args.repeat)
+        print(f"{'cold load of ' + str(len(TEMPLATES)) + ' templates':<36} {'source ms':>10} {'precompiled ms':>15}")
+        print(f"{'':<36} {source_ms:>10.2f} {compiled_ms:>15.2f}\n")
+
+        pages = PageCache(app)
+        print(f"{'page':<36} {'render ms':>10} {'cached ms':>15}")
+        with app.test_request_context('/add'):
+            statuses = repository.statuses()
+            key = tuple(status['label'] for status in statuses)
+            for name, context, page_key in [('login.html', {}, ()), ('add.html', {'statuses': statuses}, key)]:
+                render_ms = median_ms(lambda: render_template(name, flashes='', **context), args.repeat)
+                cached_ms = median_ms(lambda: pages.render(name, key=page_key, **context), args.repeat)
+                print(f"{name:<36} {render_ms:>10.3f} {cached_ms:>15.3f}")
+    finally:
+        shutil.rmtree(target)
+        os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
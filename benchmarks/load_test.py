@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Load test one Job Application Tracker instance with a mix of page, API and write traffic.
+
+Each simulated user logs in through /login, then sends requests back to back
+(no think time) for --duration seconds. The request type is picked at random
+from --mix: dashboard page, list, summary, add, edit, delete. The test ramps
+through each concurrency level in --users and reports throughput, latency
+percentiles and errors per level. It then names the level where throughput
+stops growing (the saturation point).
+
+By default a server is spawned on a temporary database: the wsgi.py app on
+Werkzeug's threaded server. Its log is scanned for "database is locked", so
+SQLite lock errors are reported separately from other 5xx responses, as are
+503s from admission control (requests shed under overload). Pass
+--url to test a server you started yourself, e.g. gunicorn -w 4 wsgi:app.
+
+Only the standard library is used.
+
+Usage:
+    python benchmarks/load_test.py [--users 1,2,4,8,16,32] [--duration 10] [--seed-rows 1000]
+    python benchmarks/load_test.py --mix list=50,summary=30,edit=20 --users 8 --duration 30
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --username me --password secret
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+DEFAULT_MIX = 'index=10,list=30,summary=25,add=10,edit=20,delete=5'
+OPERATIONS = ['index', 'list', 'summary', 'add', 'edit', 'delete']
+
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Cyberdyne']
+ROLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'SRE', 'Designer']
+STATUSES = ['Applied', 'Interview 1', 'Interview 2', 'Interview 3', 'Offer',
+            'Denied without interview (visa related)', 'Denied without interview (non-visa related)']
+
+# A level saturates when it adds less than this much throughput over the previous one
+SATURATION_GAIN = 1.10
+
+def parse_mix(text):
+    """Parse "op=weight,..." into {op: weight}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f'unknown operation {name!r} (choose from {", ".join(OPERATIONS)})')
+        mix[name] = float(weight or 1)
+    return mix
+
+def parse_levels(text):
+    return sorted({int(part) for part in text.split(',') if part.strip()})
+
+def generate_application(rng):
+    """One synthetic application"""
+    return {
+        'company_name': f'{rng.choice(COMPANIES)} {rng.randrange(5000)}',
+        'job_role': rng.choice(ROLES),
+        'applied_date': f'2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}',
+        'url': f'https://jobs.example.com/{rng.randrange(10 ** 6)}' if rng.random() < 0.7 else '',
+        'status': rng.choice(STATUSES),
+        'notes': 'Referral' if rng.random() < 0.3 else '',
+    }
+
+class Session:
+    """One logged-in user on a keep-alive connection (reopened when the server closes it)"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.cookies = {}
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def request(self, method, path, json_body=None, form=None):
+        """Send a request; returns (status, body)"""
+        headers = {}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body)
+            headers['Content-Type'] = 'application/json'
+        elif form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            # Drop the broken connection so the next request opens a new one
+            self.conn.close()
+            raise
+        for header in response.headers.get_all('Set-Cookie') or []:
+            name, _, rest = header.partition('=')
+            self.cookies[name.strip()] = rest.split(';', 1)[0]
+        return response.status, data
+
+    def login(self, username, password):
+        status, _ = self.request('POST', '/login', form={'username': username, 'password': password})
+        if status != 302:
+            raise RuntimeError(f'login failed with HTTP {status}; check --username/--password')
+
+    def close(self):
+        self.conn.close()
+
+class IdPool:
+    """Application ids known to exist, shared by every user"""
+
+    def __init__(self, ids=()):
+        self.lock = threading.Lock()
+        self.ids = list(ids)
+
+    def add(self, app_id):
+        with self.lock:
+            self.ids.append(app_id)
+
+    def choose(self, rng):
+        with self.lock:
+            return rng.choice(self.ids) if self.ids else None
+
+    def take(self, rng):
+        """Remove and return a random id (swap-remove, O(1))"""
+        with self.lock:
+            if not self.ids:
+                return None
+            i = rng.randrange(len(self.ids))
+            self.ids[i], self.ids[-1] = self.ids[-1], self.ids[i]
+            return self.ids.pop()
+
+def run_operation(session, op, rng, pool):
+    """Send one request of the given type; returns (op actually run, status, body)"""
+    if op in ('edit', 'delete'):
+        app_id = pool.take(rng) if op == 'delete' else pool.choose(rng)
+        if app_id is None:
+            op = 'add'
+    if op == 'index':
+        status, body = session.request('GET', '/')
+    elif op == 'list':
+        status, body = session.request('GET', '/api/applications')
+    elif op == 'summary':
+        status, body = session.request('GET', '/api/summary')
+    elif op == 'add':
+        status, body = session.request('POST', '/add', json_body=generate_application(rng))
+        if status == 200:
+            pool.add(json.loads(body)['id'])
+    elif op == 'edit':
+        status, body = session.request('POST', f'/edit/{app_id}', json_body=generate_application(rng))
+    else:
+        status, body = session.request('POST', f'/delete/{app_id}')
+    return op, status, body
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def run_level(base_url, users, duration, mix, pool, credentials, seed):
+    """Run one concurrency level; returns latencies (ms) per operation, errors and elapsed seconds"""
+    latencies = defaultdict(list)
+    errors = Counter()
+    lock = threading.Lock()
+    names, weights = zip(*mix.items())
+    ready = threading.Barrier(users + 1)
+    go = threading.Event()
+    deadline = [0.0]
+
+    def user(index):
+        rng = random.Random(seed * 1000 + index)
+        session = Session(base_url)
+        local_latencies = defaultdict(list)
+        local_errors = Counter()
+        try:
+            session.login(*credentials)
+        finally:
+            ready.wait()
+        go.wait()
+        while time.perf_counter() < deadline[0]:
+            op = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                op, status, body = run_operation(session, op, rng, pool)
+            except (http.client.HTTPException, OSError) as e:
+                local_errors[f'{op}: {type(e).__name__}'] += 1
+                continue
+            local_latencies[op].append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                if b'database is locked' in body:
+                    kind = 'database locked'
+                elif status == 503:
+                    kind = 'shed'
+                else:
+                    kind = f'HTTP {status}'
+                local_errors[f'{op}: {kind}'] += 1
+        session.close()
+        with lock:
+            for op, values in local_latencies.items():
+                latencies[op].extend(values)
+            errors.update(local_errors)
+
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        futures = [executor.submit(user, i) for i in range(users)]
+        # Start the clock once every user has logged in
+        ready.wait()
+        started = time.perf_counter()
+        deadline[0] = started + duration
+        go.set()
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+def summarize(users, latencies, errors, elapsed, server_locks=0):
+    everything = sorted(value for values in latencies.values() for value in values)
+    total = len(everything) + sum(count for kind, count in errors.items()
+                                 if ': HTTP' not in kind and 'locked' not in kind and not kind.endswith(': shed'))
+    failed = sum(errors.values())
+    return {
+        'users': users,
+        'requests': total,
+        'throughput': total / elapsed if elapsed else 0.0,
+        'p50': percentile(everything, 0.50),
+        'p90': percentile(everything, 0.90),
+        'p99': percentile(everything, 0.99),
+        'max': everything[-1] if everything else 0.0,
+        'error_rate': failed / total if total else 0.0,
+        'lock_errors': max(server_locks, sum(count for kind, count in errors.items() if 'locked' in kind)),
+        'shed': sum(count for kind, count in errors.items() if kind.endswith(': shed')),
+        'errors': dict(errors),
+        'operations': {
+            op: {'count': len(values), 'p50': percentile(sorted(values), 0.50), 'p99': percentile(sorted(values), 0.99)}
+            for op, values in sorted(latencies.items())
+        },
+    }
+
+def find_saturation(levels):
+    """The level after which adding users stops adding throughput, or None if it never flattens"""
+    for previous, current in zip(levels, levels[1:]):
+        if current['throughput'] < previous['throughput'] * SATURATION_GAIN:
+            return previous
+    return None
+
+def seed_data(base_url, credentials, rows, rng):
+    """Insert rows through /add with a few parallel sessions; returns their ids"""
+    def insert(count, seed):
+        local_rng = random.Random(seed)
+        session = Session(base_url)
+        session.login(*credentials)
+        ids = []
+        for _ in range(count):
+            status, body = session.request('POST', '/add', json_body=generate_application(local_rng))
+            if status == 200:
+                ids.append(json.loads(body)['id'])
+        session.close()
+        return ids
+
+    workers = 4
+    counts = [rows // workers + (1 if i < rows % workers else 0) for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(insert, counts, [rng.randrange(10 ** 9) for _ in counts])
+    return [app_id for chunk in chunks for app_id in chunk]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def spawn_server(workdir, port, username, password):
+    """Start wsgi.py's app on Werkzeug's threaded server with a fresh database in workdir"""
+    env = dict(os.environ, FLASK_USERNAME=username, FLASK_PASSWORD=password,
+               SECRET_KEY='load-test', PYTHONPATH=os.path.abspath(REPO_ROOT))
+    code = ('import logging, wsgi; '
+            'logging.getLogger("werkzeug").setLevel(logging.ERROR); '
+            f'wsgi.app.run(host="127.0.0.1", port={port}, threaded=True)')
+    log = open(os.path.join(workdir, 'server.log'), 'w+b')
+    # The app keeps job_tracker.db in the working directory
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=workdir, env=env,
+                               stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f'server exited:\n{log.read().decode(errors="replace")}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return process, log
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError('server did not start within 30s')
+
+def count_lock_errors(log, offset):
+    """Count "database is locked" in the server log since offset; returns (count, new offset)"""
+    if log is None:
+        return 0, offset
+    log.flush()
+    log.seek(offset)
+    data = log.read()
+    return data.count(b'database is locked'), offset + len(data)
+
+def print_report(levels, saturation):
+    print(f"{'users':>6} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} {'locked':>7} {'shed':>7}")
+    for level in levels:
+        print(f"{level['users']:>6} {level['requests']:>9} {level['throughput']:>9.1f} "
+              f"{level['p50']:>8.1f} {level['p90']:>8.1f} {level['p99']:>8.1f} {level['max']:>8.1f} "
+              f"{level['error_rate']:>6.1%} {level['lock_errors']:>7} {level['shed']:>7}")
+
+    peak = max(levels, key=lambda level: level['throughput'])
+    print(f"\nPer operation at {peak['users']} users (peak throughput)")
+    for op, stats in peak['operations'].items():
+        print(f"  {op:<10} {stats['count']:>8} requests   p50 {stats['p50']:>8.1f} ms   p99 {stats['p99']:>8.1f} ms")
+    for level in levels:
+        if level['errors']:
+            print(f"\nErrors at {level['users']} users: " +
+                  ', '.join(f'{kind} x{count}' for kind, count in sorted(level['errors'].items())))
+
+    if saturation:
+        print(f"\nThroughput saturates at {saturation['users']} concurrent user(s): {saturation['throughput']:.1f} req/s, "
+              f"p99 {saturation['p99']:.1f} ms. More users add less than "
+              f"{SATURATION_GAIN - 1:.0%} throughput and only raise latency.")
+    else:
+        print(f"\nThroughput was still growing at {levels[-1]['users']} users; try higher --users levels.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='test this running server instead of spawning one')
+    parser.add_argument('--username', default=os.environ.get('FLASK_USERNAME', 'loadtest'))
+    parser.add_argument('--password', default=os.environ.get('FLASK_PASSWORD', 'loadtest'))
+    parser.add_argument('--users', type=parse_levels, default=parse_levels('1,2,4,8,16,32'),
+                        help='comma-separated concurrency levels (default 1,2,4,8,16,32)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per level')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'operation weights (default {DEFAULT_MIX})')
+    parser.add_argument('--seed-rows', type=int, default=1000, help='applications inserted before the first level')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    credentials = (args.username, args.password)
+    rng = random.Random(args.seed)
+    workdir = process = log = None
+    base_url = args.url
+    if base_url is None:
+        workdir = tempfile.mkdtemp(prefix='job-tracker-load-')
+        port = free_port()
+        process, log = spawn_server(workdir, port, *credentials)
+        base_url = f'http://127.0.0.1:{port}'
+
+    try:
+        ids = seed_data(base_url, credentials, args.seed_rows, rng)
+        pool = IdPool(ids)
+        offset = count_lock_errors(log, 0)[1]
+
+        levels = []
+        for users in args.users:
+            latencies, errors, elapsed = run_level(base_url, users, args.duration, args.mix, pool,
+                                                   credentials, rng.randrange(10 ** 6))
+            locks, offset = count_lock_errors(log, offset)
+            levels.append(summarize(users, latencies, errors, elapsed, locks))
+            if not args.json:
+                print(f"{users} users: {levels[-1]['throughput']:.1f} req/s, p99 {levels[-1]['p99']:.1f} ms",
+                      file=sys.stderr)
+        saturation = find_saturation(levels)
+
+        if args.json:
+            print(json.dumps({'levels': levels, 'saturation_users': saturation['users'] if saturation else None},
+                             indent=2))
+        else:
+            print(f"\n{base_url}, {len(ids)} seeded applications, {args.duration:g}s per level, mix "
+                  + ', '.join(f'{op}={weight:g}' for op, weight in args.mix.items()) + '\n')
+            print_report(levels, saturation)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+            log.close()
+
+if __name__ == '__main__':
+    main()
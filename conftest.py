@@ -1,48 +1,50 @@
 import pytest
-import os
-import tempfile
 import sqlite3
 from app import app, init_db, get_db_connection
 
+@pytest.fixture(scope='session')
+def template_db(tmp_path_factory):
+    """A database created and migrated by init_db once per test process."""
+    db_path = str(tmp_path_factory.mktemp('template') / 'job_tracker.db')
+    init_db(db_path)
+    return db_path
+
+def clone_database(template, db_path):
+    """Copy the template into a new file with the SQLite backup API."""
+    source = sqlite3.connect(template)
+    target = sqlite3.connect(db_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
 @pytest.fixture(scope='function')
-def client():
-    """Create a test client for the Flask application."""
-    # Create a temporary database file
-    db_fd, db_path = tempfile.mkstemp()
-    
-    # Store original database path
-    original_db = app.config.get('DATABASE', 'job_tracker.db')
+def client(template_db, tmp_path, monkeypatch):
+    """Create a test client for the Flask application.
+
+    Each test gets its own copy of the template database under its tmp_path,
+    so tests in parallel worker processes (``pytest -n auto``) never share a
+    file. Config and environment changes go through monkeypatch and are
+    undone after the test.
+    """
+    db_path = str(tmp_path / 'job_tracker.db')
+    clone_database(template_db, db_path)
     
-    # Temporarily set test database
-    app.config['DATABASE'] = db_path
-    app.config['TESTING'] = True
+    monkeypatch.setitem(app.config, 'DATABASE', db_path)
+    monkeypatch.setitem(app.config, 'TESTING', True)
     
     # Set test credentials for authentication
-    os.environ['FLASK_USERNAME'] = 'test_user'
-    os.environ['FLASK_PASSWORD'] = 'test_password'
-    os.environ['SECRET_KEY'] = 'test_secret_key'
+    monkeypatch.setenv('FLASK_USERNAME', 'test_user')
+    monkeypatch.setenv('FLASK_PASSWORD', 'test_password')
     
-    try:
-        with app.test_client() as client:
-            with app.app_context():
-                init_db()
-            # Login via POST request to /login route
-            client.post('/login', data={
-                'username': 'test_user',
-                'password': 'test_password'
-            }, follow_redirects=True)
-            yield client
-    finally:
-        # Always restore original database path
-        app.config['DATABASE'] = original_db
-        # Clean up temporary database
-        os.close(db_fd)
-        os.unlink(db_path)
-        # Clean up environment variables
-        if 'FLASK_USERNAME' in os.environ and os.environ['FLASK_USERNAME'] == 'test_user':
-            del os.environ['FLASK_USERNAME']
-            del os.environ['FLASK_PASSWORD']
-            del os.environ['SECRET_KEY']
+    with app.test_client() as client:
+        # Login via POST request to /login route
+        client.post('/login', data={
+            'username': 'test_user',
+            'password': 'test_password'
+        }, follow_redirects=True)
+        yield client
 
 @pytest.fixture
 def sample_data():
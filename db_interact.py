@@ -1,59 +1,237 @@
-
-import sqlite3
-import pandas as pd
-
-# Connect to the SQLite database
-conn = sqlite3.connect('job_tracker.db')
-
-# Create a cursor object to interact with the database
-cursor = conn.cursor()
-
-
-# Execute the query to fetch all rows from the "job_applications" table
-cursor.execute("SELECT * FROM status_history;")
-# cursor.execute("SELECT applied_date,* FROM job_applications;")
-
-# cursor.execute("PRAGMA table_info(job_applications);")
-rows = cursor.fetchall()  # Fetch all rows from the query
-
-# Get column names (the cursor.description will now work because we executed the query)
-columns = [desc[0] for desc in cursor.description]  # Column names
-
-# Create a DataFrame from the query result
-data_df = pd.DataFrame(rows, columns=columns)
-
-# Display the results as a table
-print("\nData from job_applications table:")
-print(data_df)
-
-
-# Close the connection
-conn.close()
-
-
-'''
-import sqlite3
-
-# Connect to the SQLite database
-conn = sqlite3.connect('job_tracker.db')
-cursor = conn.cursor()
-
-# Define the SQL update query
-update_query = """
-UPDATE status_history
-SET changed_at = '2025-10-28 00:00:00'
-WHERE id = 2;
+#!/usr/bin/env python3
+"""
+Read-only command line access to the Job Application Tracker database.
+
+The database is opened with a ``mode=ro`` URI, so the CLI never takes a write
+lock and cannot modify data, even while the web app is running. Results are
+fetched ``--chunk-size`` rows at a time and written out as they arrive, so
+memory use stays bounded however large the table is. pandas is only imported
+for ``--format dataframe``.
+
+Usage:
+    python db_interact.py dump job_applications [--format csv|jsonl|dataframe]
+    python db_interact.py query "SELECT label, COUNT(*) FROM job_applications JOIN statuses ON statuses.id = status_id GROUP BY label"
+    python db_interact.py query "SELECT * FROM job_applications WHERE company_name = ?" -p Acme
+    python db_interact.py stats
+    python db_interact.py history-of 42
 """
 
-# Execute the update query
-cursor.execute(update_query)
-
-# Commit the changes to save them permanently
-conn.commit()
-
-# Optionally check how many rows were updated
-print(f"{cursor.rowcount} row(s) updated.")
-
-# Close the connection
-conn.close()
-'''
\ No newline at end of file
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+DATABASE = 'job_tracker.db'
+DEFAULT_CHUNK_SIZE = 1000
+FORMATS = ['csv', 'jsonl', 'dataframe']
+
+# Rows store a status_id; this reads its label from the statuses lookup table
+STATUS_LABEL = '(SELECT label FROM statuses WHERE statuses.id = status_id)'
+
+def connect_readonly(db_path):
+    """Open the database read-only; fails if the file does not exist"""
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    # Belt and braces: also refuse writes at the statement level
+    conn.execute('PRAGMA query_only = ON')
+    return conn
+
+def iter_chunks(conn, sql, params=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Run a query and yield (columns, rows) one chunk of at most chunk_size rows at a time"""
+    cursor = conn.execute(sql, params)
+    if cursor.description is None:
+        return
+    columns = [desc[0] for desc in cursor.description]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield columns, rows
+
+def table_names(conn):
+    """User tables in the database"""
+    return [row[0] for row in conn.execute('''
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+        ORDER BY name
+    ''')]
+
+def write_chunks(chunks, out, fmt):
+    """Write query chunks to out as they arrive; returns the number of rows written"""
+    count = 0
+    first = True
+    if fmt == 'dataframe':
+        import pandas as pd
+    writer = csv.writer(out, lineterminator='\n') if fmt == 'csv' else None
+    for columns, rows in chunks:
+        if fmt == 'csv':
+            if first:
+                writer.writerow(columns)
+            writer.writerows(rows)
+        elif fmt == 'jsonl':
+            for row in rows:
+                out.write(json.dumps(dict(zip(columns, row))) + '\n')
+        else:
+            frame = pd.DataFrame.from_records(rows, columns=columns, index=range(count, count + len(rows)))
+            out.write(frame.to_string(header=first) + '\n')
+        count += len(rows)
+        first = False
+    return count
+
+def command_dump(conn, args, out):
+    """Write every row of a table"""
+    if args.table not in table_names(conn):
+        raise ValueError(f"Unknown table '{args.table}'")
+    quoted = '"' + args.table.replace('"', '""') + '"'
+    return write_chunks(iter_chunks(conn, f'SELECT * FROM {quoted}', chunk_size=args.chunk_size), out, args.format)
+
+def command_query(conn, args, out):
+    """Run one read-only SQL statement"""
+    return write_chunks(iter_chunks(conn, args.sql, args.param, args.chunk_size), out, args.format)
+
+def command_stats(conn, args, out):
+    """Summarize the database using aggregate queries only"""
+    tables = table_names(conn)
+    out.write('Tables\n')
+    for name in tables:
+        quoted = '"' + name.replace('"', '""') + '"'
+        count = conn.execute(f'SELECT COUNT(*) FROM {quoted}').fetchone()[0]
+        out.write(f'  {name:<32} {count:>10}\n')
+
+    if 'job_applications' in tables:
+        out.write('\nApplications by status\n')
+        for status, count in conn.execute('''
+            SELECT statuses.label, counts.count
+            FROM (SELECT status_id, COUNT(*) AS count FROM job_applications GROUP BY status_id) AS counts
+            JOIN statuses ON statuses.id = counts.status_id
+            ORDER BY counts.count DESC, statuses.label
+        '''):
+            out.write(f'  {status:<48} {count:>10}\n')
+
+        out.write('\nApplications by month applied\n')
+        for month, count in conn.execute('''
+            SELECT substr(applied_date, 1, 7) AS month, COUNT(*) FROM job_applications
+            GROUP BY month ORDER BY month
+        '''):
+            out.write(f'  {month:<48} {count:>10}\n')
+
+    if 'status_history' in tables:
+        entries, applications = conn.execute('''
+            SELECT COUNT(*), COUNT(DISTINCT application_id) FROM status_history
+        ''').fetchone()
+        average = entries / applications if applications else 0
+        out.write(f'\nStatus changes: {entries} across {applications} applications ({average:.1f} each)\n')
+
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+    free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    out.write(f'\nFile: {page_count * page_size} bytes, {page_count} pages of {page_size}, {free_pages} free\n')
+    return None
+
+def command_history_of(conn, args, out):
+    """Show one application (live or archived) and its status timeline"""
+    tables = table_names(conn)
+    sources = [('job_applications', 'status_history', '')]
+    if 'archived_applications' in tables:
+        sources.append(('archived_applications', 'archived_status_history', ' (archived)'))
+
+    for applications, history, label in sources:
+        cursor = conn.execute(f'SELECT * FROM {applications} WHERE id = ?', (args.id,))
+        row = cursor.fetchone()
+        if row is None:
+            continue
+        columns = [desc[0] for desc in cursor.description]
+        out.write(f'Application {args.id}{label}\n')
+        for column, value in zip(columns, row):
+            out.write(f'  {column:<16} {value}\n')
+        out.write('\nStatus history\n')
+        for status, changed_at in conn.execute(f'''
+            SELECT {STATUS_LABEL}, changed_at FROM {history}
+            WHERE application_id = ?
+            ORDER BY changed_at, id
+        ''', (args.id,)):
+            out.write(f'  {changed_at}  {status}\n')
+        return None
+    raise ValueError(f'No application with id {args.id}')
+
+def command_export(conn, args, out):
+    """Write a Parquet/Arrow snapshot of the applications and their history"""
+    from export import write_snapshot
+    manifest = write_snapshot(conn, args.directory, args.format, incremental=args.incremental,
+                              batch_size=args.chunk_size)
+    for table, state in manifest['tables'].items():
+        out.write(f"{table:<32} {state['last_run_rows']:>10} row(s) written, "
+                  f"{len(state['parts'])} part(s), watermark {state['watermark']}\n")
+    return None
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=os.environ.get('DATABASE', DATABASE),
+                        help='database file (default: $DATABASE or job_tracker.db)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_output_options(subparser):
+        subparser.add_argument('--format', choices=FORMATS, default='csv')
+        subparser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                               help='rows fetched per round trip')
+
+    dump = subparsers.add_parser('dump', help='write every row of a table')
+    dump.add_argument('table')
+    add_output_options(dump)
+    dump.set_defaults(handler=command_dump)
+
+    query = subparsers.add_parser('query', help='run a read-only SQL statement')
+    query.add_argument('sql')
+    query.add_argument('-p', '--param', action='append', default=[],
+                       help='value bound to the next ? placeholder (repeatable)')
+    add_output_options(query)
+    query.set_defaults(handler=command_query)
+
+    stats = subparsers.add_parser('stats', help='row counts, status breakdown and file size')
+    stats.set_defaults(handler=command_stats)
+
+    export = subparsers.add_parser('export', help='write a Parquet or Arrow IPC snapshot (needs pyarrow)')
+    export.add_argument('directory')
+    export.add_argument('--format', choices=['parquet', 'arrow'], default='parquet')
+    export.add_argument('--incremental', action='store_true',
+                        help='append only rows changed since the last export into directory')
+    export.add_argument('--chunk-size', type=int, default=5000, help='rows per record batch')
+    export.set_defaults(handler=command_export)
+
+    history = subparsers.add_parser('history-of', help='show one application and its status timeline')
+    history.add_argument('id', type=int)
+    history.set_defaults(handler=command_history_of)
+    return parser
+
+def main(argv=None, out=None):
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    if getattr(args, 'chunk_size', 1) < 1:
+        print('error: --chunk-size must be at least 1', file=sys.stderr)
+        return 2
+    try:
+        conn = connect_readonly(args.db)
+    except sqlite3.Error as e:
+        print(f'error: cannot open {args.db}: {e}', file=sys.stderr)
+        return 1
+    try:
+        args.handler(conn, args, out)
+    except (sqlite3.Error, ValueError) as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+    except ImportError as e:
+        message = '--format dataframe needs pandas (pip install pandas)' if getattr(args, 'format', None) == 'dataframe' else e
+        print(f'error: {message}', file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output piped into head and the like
+        pass
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
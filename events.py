@@ -0,0 +1,149 @@
+"""
+In-process change feed for Job Application Tracker.
+
+Write routes publish compact change events to an ``EventBroker``; every open
+``/api/events`` connection holds a ``Subscription`` with a bounded queue and
+streams the events as Server-Sent Events.
+
+A subscriber that falls too far behind is not allowed to hold memory: when
+its queue is full it is sent a ``resync`` event and disconnected, and the
+client reloads its data. Recent events are kept in a short replay buffer
+for clients reconnecting with ``Last-Event-ID``; if the gap is no longer
+covered they are told to resync as well. Event ids are prefixed with a
+per-broker token, so an id issued by another process or before a restart
+also leads to a resync rather than silently missed changes.
+
+Events only reach clients connected to the same process.
+"""
+
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+class Subscription:
+    """One connected client's bounded event queue"""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+        # Sequence number of the newest event when the subscriber joined
+        self.position = 0
+
+class EventBroker:
+    """Fan-out of change events to subscribers
+
+    ``queue_size`` bounds each subscriber's backlog and ``replay_size`` the
+    number of recent events kept for ``Last-Event-ID`` reconnects.
+    """
+
+    def __init__(self, queue_size=100, replay_size=256):
+        self.queue_size = queue_size
+        self.token = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=replay_size)
+        self._next_id = 1
+
+    def event_id(self, sequence):
+        """Public id for an event sequence number"""
+        return f'{self.token}:{sequence}'
+
+    def subscribe(self, last_event_id=None):
+        """Register a subscriber, replaying events after ``last_event_id``
+
+        ``last_event_id`` is an id previously sent by this broker (see
+        ``event_id``); anything else marks the subscriber for resync.
+        """
+        subscription = Subscription(self.queue_size)
+        if last_event_id:
+            token, _, sequence = last_event_id.rpartition(':')
+            if token == self.token and sequence.isdigit():
+                last_event_id = int(sequence)
+            else:
+                subscription.overflowed = True
+                last_event_id = None
+        else:
+            last_event_id = None
+
+        with self._lock:
+            if last_event_id is not None:
+                missed = [event for event in self._recent if event[0] > last_event_id]
+                covered = (self._recent and self._recent[0][0] <= last_event_id + 1) or \
+                    last_event_id >= self._next_id - 1
+                if not covered or len(missed) > self.queue_size:
+                    subscription.overflowed = True
+                else:
+                    for event in missed:
+                        subscription.queue.put_nowait(event)
+            subscription.position = self._next_id - 1
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event_type, data):
+        """Queue an event for every subscriber; returns its id"""
+        with self._lock:
+            event = (self._next_id, event_type, data)
+            self._next_id += 1
+            self._recent.append(event)
+            for subscription in self._subscribers:
+                if subscription.overflowed:
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except queue.Full:
+                    subscription.overflowed = True
+        return event[0]
+
+def format_sse(event_type, data, event_id=None):
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+def stream_events(broker, subscription, heartbeat=15, timeout=60):
+    """Yield SSE messages for a subscription until ``timeout`` seconds pass
+
+    A comment line is sent every ``heartbeat`` seconds of silence so proxies
+    keep the connection open and dead clients are noticed. After
+    ``timeout`` the stream ends and ``EventSource`` reconnects with its
+    ``Last-Event-ID``.
+
+    A fresh subscription first gets a ``ready`` event carrying the current
+    position, so clients have an id to resume from even before any change.
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        yield 'retry: 3000\n\n'
+        if not subscription.overflowed and subscription.queue.empty():
+            yield format_sse('ready', {}, broker.event_id(subscription.position))
+        while True:
+            if subscription.overflowed:
+                yield format_sse('resync', {'reason': 'client fell behind'})
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            try:
+                event_id, event_type, data = subscription.queue.get(timeout=min(heartbeat, remaining))
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            yield format_sse(event_type, data, broker.event_id(event_id))
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,236 @@
+"""
+Columnar snapshot export for Job Application Tracker.
+
+Writes ``job_applications`` and ``status_history`` to Parquet or Arrow IPC
+files for analysis in notebooks. Rows are read from the cursor in batches and
+converted to Arrow record batches one at a time, so memory is bounded by the
+batch size. ``status`` is dictionary encoded (the ``statuses`` table is the
+dictionary and ``status_id`` maps into it), ``applied_date`` is a date and
+timestamps are UTC timestamps (SQLite's ``CURRENT_TIMESTAMP`` is UTC).
+
+Snapshots written by ``write_snapshot`` are a directory of part files plus
+``manifest.json``. An incremental run appends one part per table holding only
+rows changed since the previous run:
+
+- ``job_applications``: rows with ``last_updated`` at or after the previous
+  maximum. Rows touched within that same second are exported again, so a
+  reader should keep the last version of each ``id`` across parts.
+- ``status_history``: rows with an ``id`` above the previous maximum
+  (history is append-only).
+
+Deleted and archived applications are not recorded in increments; run a
+full export to drop them.
+
+pyarrow is an optional dependency, imported on first use.
+"""
+
+import json
+import os
+from datetime import date, datetime, timezone
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Output format -> file extension
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Column types are resolved against pyarrow in table_schema
+EXPORT_TABLES = {
+    'job_applications': {
+        'columns': [('id', 'int'), ('company_name', 'string'), ('job_role', 'string'),
+                    ('applied_date', 'date'), ('url', 'string'), ('status', 'category'),
+                    ('notes', 'string'), ('last_updated', 'timestamp')],
+        'watermark': 'last_updated',
+        'since_op': '>=',
+    },
+    'status_history': {
+        'columns': [('id', 'int'), ('application_id', 'int'), ('status', 'category'),
+                    ('changed_at', 'timestamp')],
+        'watermark': 'id',
+        'since_op': '>',
+    },
+}
+
+# Dictionary-encoded columns: exported name -> (stored column, query for (key, value) pairs)
+CATEGORY_SOURCES = {'status': ('status_id', 'SELECT id, label FROM statuses ORDER BY ordinal, id')}
+
+MANIFEST = 'manifest.json'
+
+def import_pyarrow():
+    """Import pyarrow, raising ImportError with an install hint"""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Columnar export needs pyarrow (pip install pyarrow)') from None
+    return pyarrow
+
+def table_schema(pa, table):
+    """Arrow schema for an exported table"""
+    types = {
+        'int': pa.int64(),
+        'string': pa.string(),
+        'date': pa.date32(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'timestamp': pa.timestamp('s', tz='UTC'),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_TABLES[table]['columns']])
+
+def _to_date(value):
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except (TypeError, ValueError):
+        return None
+
+def _to_timestamp(value):
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc) if value else None
+    except (TypeError, ValueError):
+        return None
+
+def _record_batch(pa, schema, kinds, rows, dictionaries):
+    """Convert one chunk of cursor rows to a record batch"""
+    arrays = []
+    for i, (field, kind) in enumerate(zip(schema, kinds)):
+        values = [row[i] for row in rows]
+        if kind == 'category':
+            # Every batch shares one dictionary: the IPC file format does not
+            # allow a dictionary to change between batches
+            lookup, dictionary = dictionaries[field.name]
+            indices = pa.array([lookup.get(value) for value in values], pa.int32())
+            arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+        elif kind == 'date':
+            arrays.append(pa.array([_to_date(value) for value in values], field.type))
+        elif kind == 'timestamp':
+            arrays.append(pa.array([_to_timestamp(value) for value in values], field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def open_writer(pa, sink, schema, fmt):
+    """Parquet or Arrow IPC file writer for sink (a path or binary file object)"""
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(sink, schema, compression='zstd', use_dictionary=['status'])
+    if fmt == 'arrow':
+        return pa.ipc.new_file(sink, schema)
+    raise ValueError(f'Unknown export format: {fmt}')
+
+def export_table(conn, table, sink, fmt='parquet', since=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Write one table (optionally only rows past ``since``) to sink
+
+    Returns ``(rows_written, watermark)``, where ``watermark`` is the value
+    to pass as ``since`` next time (unchanged when no rows were written).
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f'Unknown export table: {table}')
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown export format: {fmt}')
+    pa = import_pyarrow()
+    spec = EXPORT_TABLES[table]
+    schema = table_schema(pa, table)
+    names = [name for name, _ in spec['columns']]
+    kinds = [kind for _, kind in spec['columns']]
+    watermark_index = names.index(spec['watermark'])
+
+    # Table, column and operator names come from EXPORT_TABLES, never user input
+    where, params = '', ()
+    if since is not None:
+        where, params = f"WHERE {spec['watermark']} {spec['since_op']} ?", (since,)
+
+    dictionaries = {}
+    stored = []
+    for name, kind in spec['columns']:
+        if kind == 'category':
+            column, query = CATEGORY_SOURCES[name]
+            pairs = conn.execute(query).fetchall()
+            dictionaries[name] = ({key: i for i, (key, _) in enumerate(pairs)},
+                                  pa.array([value for _, value in pairs], pa.string()))
+            stored.append(column)
+        else:
+            stored.append(name)
+
+    cursor = conn.execute(f"SELECT {', '.join(stored)} FROM {table} {where} ORDER BY id", params)
+    rows_written = 0
+    watermark = since
+    writer = open_writer(pa, sink, schema, fmt)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            writer.write_batch(_record_batch(pa, schema, kinds, rows, dictionaries))
+            rows_written += len(rows)
+            values = [row[watermark_index] for row in rows if row[watermark_index] is not None]
+            if values:
+                watermark = max(values) if watermark is None else max(watermark, *values)
+    finally:
+        writer.close()
+    return rows_written, watermark
+
+def read_manifest(directory):
+    """Manifest of a snapshot directory, or None if there is none yet"""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def write_snapshot(conn, directory, fmt='parquet', incremental=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Export every table into ``directory`` and update its manifest
+
+    A full export replaces the parts listed in the previous manifest. An
+    incremental export adds one part per table with rows changed since the
+    previous run; it falls back to a full export when there is no manifest or
+    it was written in another format. Returns the new manifest.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown export format: {fmt}')
+    import_pyarrow()
+    os.makedirs(directory, exist_ok=True)
+    previous = read_manifest(directory)
+    if previous is None or previous.get('format') != fmt:
+        incremental = False
+
+    manifest = {'format': fmt, 'exported_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'), 'tables': {}}
+    stale = []
+    # One read transaction, so both tables come from the same point in time
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute('BEGIN')
+    try:
+        for table in EXPORT_TABLES:
+            state = (previous or {}).get('tables', {}).get(table, {'parts': [], 'watermark': None})
+            if incremental:
+                parts, since = list(state['parts']), state['watermark']
+            else:
+                parts, since = [], None
+                stale.extend(part['file'] for part in state['parts'])
+
+            os.makedirs(os.path.join(directory, table), exist_ok=True)
+            relative = os.path.join(table, f'part-{len(parts):05d}{FORMATS[fmt]}')
+            path = os.path.join(directory, relative)
+            tmp_path = f'{path}.tmp'
+            rows, watermark = export_table(conn, table, tmp_path, fmt, since=since, batch_size=batch_size)
+            if rows or not incremental:
+                os.replace(tmp_path, path)
+                parts.append({'file': relative, 'rows': rows, 'since': since})
+                if relative in stale:
+                    stale.remove(relative)
+            else:
+                os.remove(tmp_path)
+            manifest['tables'][table] = {'parts': parts, 'watermark': watermark, 'last_run_rows': rows}
+    finally:
+        if owns_transaction:
+            conn.execute('COMMIT')
+
+    tmp_manifest = os.path.join(directory, f'{MANIFEST}.tmp')
+    with open(tmp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest, os.path.join(directory, MANIFEST))
+
+    # Only remove old parts once the new manifest no longer lists them
+    for relative in stale:
+        try:
+            os.remove(os.path.join(directory, relative))
+        except FileNotFoundError:
+            pass
+    return manifest
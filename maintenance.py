@@ -0,0 +1,289 @@
+"""
+Background database maintenance for Job Application Tracker.
+
+A daemon thread periodically runs housekeeping on the SQLite database:
+refreshing planner statistics (ANALYZE, PRAGMA optimize), checkpointing the
+WAL and returning free pages to the filesystem (incremental VACUUM).
+
+Only one scheduler runs tasks at a time, even across worker processes: each
+tick first takes a lease row in ``maintenance_lock``. Task history lives in
+``maintenance_runs`` so every worker reports the same last-run times.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+# name -> (default interval in seconds, heavy)
+# Heavy tasks are deferred while request traffic is above the busy threshold.
+DEFAULT_TASKS = {
+    'wal_checkpoint': (5 * 60, False),
+    'optimize': (60 * 60, False),
+    'analyze': (24 * 60 * 60, False),
+    'vacuum': (60 * 60, True),
+}
+
+def _timestamp(epoch):
+    """Format an epoch time for JSON output"""
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S')
+
+class TaskSkipped(Exception):
+    """Raised by a runner that has nothing to do; the run is recorded as ``skipped``"""
+
+def run_wal_checkpoint(conn, scheduler):
+    """Fold the WAL back into the database file; skipped outside WAL mode"""
+    journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+    if journal_mode != 'wal':
+        raise TaskSkipped(f'journal_mode is {journal_mode}, not wal')
+    busy, log_pages, checkpointed = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+    return f'log pages {log_pages}, checkpointed {checkpointed}, busy {busy}'
+
+def run_optimize(conn, scheduler):
+    """Let SQLite refresh statistics it considers stale"""
+    conn.execute('PRAGMA optimize').fetchall()
+    return 'ok'
+
+def run_analyze(conn, scheduler):
+    """Rebuild planner statistics for every table and index"""
+    conn.execute('ANALYZE')
+    return 'ok'
+
+def run_vacuum(conn, scheduler):
+    """Return free pages to the filesystem
+
+    Databases in incremental auto-vacuum mode release up to
+    ``scheduler.vacuum_pages`` pages per run. Older databases get one full
+    VACUUM, once enough of the file is free, which also switches them to
+    incremental mode.
+    """
+    mode = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+    free_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+    if mode == 2:
+        conn.execute(f'PRAGMA incremental_vacuum({int(scheduler.vacuum_pages)})').fetchall()
+    else:
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        if not page_count or free_before / page_count < scheduler.full_vacuum_ratio:
+            return f'skipped full vacuum, {free_before} of {page_count} pages free'
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+
+    free_after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    return f'freed {free_before - free_after} pages, {free_after} still free'
+
+TASK_RUNNERS = {
+    'wal_checkpoint': run_wal_checkpoint,
+    'optimize': run_optimize,
+    'analyze': run_analyze,
+    'vacuum': run_vacuum,
+}
+
+class MaintenanceScheduler:
+    """Runs database maintenance tasks on a background thread
+
+    ``get_db_path`` is called on every tick so tests and deployments can
+    repoint the database. Intervals can be overridden per task with
+    ``MAINTENANCE_<TASK>_INTERVAL`` environment variables (seconds).
+    """
+
+    def __init__(self, get_db_path, tick=30, busy_requests_per_minute=120,
+                 vacuum_pages=500, full_vacuum_ratio=0.25, lease_seconds=None):
+        self.get_db_path = get_db_path
+        self.tick = tick
+        self.busy_requests_per_minute = busy_requests_per_minute
+        self.vacuum_pages = vacuum_pages
+        self.full_vacuum_ratio = full_vacuum_ratio
+        self.lease_seconds = lease_seconds or tick * 3
+        self.holder = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+        self.tasks = {}
+        for name, (interval, heavy) in DEFAULT_TASKS.items():
+            interval = int(os.getenv(f'MAINTENANCE_{name.upper()}_INTERVAL', interval))
+            self.add_task(name, TASK_RUNNERS[name], interval, heavy)
+
+        self._run_lock = threading.Lock()
+        self._requests_lock = threading.Lock()
+        self._requests = deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_tick = None
+
+    def add_task(self, name, runner, interval, heavy=False):
+        """Register a task; ``runner(conn, scheduler)`` returns a short detail string
+
+        A runner with nothing to do raises ``TaskSkipped``. The run still
+        counts towards the interval.
+        """
+        self.tasks[name] = {'runner': runner, 'interval': interval, 'heavy': heavy}
+
+    def record_request(self):
+        """Count one incoming request towards the traffic estimate"""
+        now = time.monotonic()
+        with self._requests_lock:
+            self._requests.append(now)
+            while self._requests and self._requests[0] < now - 60:
+                self._requests.popleft()
+
+    def requests_per_minute(self):
+        """Requests seen in the last 60 seconds"""
+        cutoff = time.monotonic() - 60
+        with self._requests_lock:
+            while self._requests and self._requests[0] < cutoff:
+                self._requests.popleft()
+            return len(self._requests)
+
+    def is_busy(self):
+        return self.requests_per_minute() > self.busy_requests_per_minute
+
+    def _connect(self):
+        # Autocommit mode: VACUUM cannot run inside a transaction
+        conn = sqlite3.connect(self.get_db_path(), timeout=5, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _acquire_lease(self, conn, now):
+        """Take or renew the cross-process lease; False if another worker holds it"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT holder, expires_at FROM maintenance_lock WHERE id = 1').fetchone()
+            if row and row['holder'] != self.holder and row['expires_at'] > now:
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute('''
+                INSERT INTO maintenance_lock (id, holder, expires_at) VALUES (1, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            ''', (self.holder, now + self.lease_seconds))
+            conn.execute('COMMIT')
+            return True
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _last_runs(self, conn):
+        rows = conn.execute('SELECT * FROM maintenance_runs').fetchall()
+        return {row['task']: dict(row) for row in rows}
+
+    def _record_run(self, conn, name, started, duration_ms, status, detail):
+        finished = started + duration_ms / 1000 if status != 'deferred' else None
+        conn.execute('''
+            INSERT INTO maintenance_runs (task, last_started, last_finished, last_duration_ms, last_status, last_detail)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(task) DO UPDATE SET
+                last_started = excluded.last_started,
+                last_finished = COALESCE(excluded.last_finished, maintenance_runs.last_finished),
+                last_duration_ms = excluded.last_duration_ms,
+                last_status = excluded.last_status,
+                last_detail = excluded.last_detail
+        ''', (name, started, finished, duration_ms, status, detail))
+
+    def run_pending(self, force=False, only=None):
+        """Run every task that is due (or all of them with ``force``)
+
+        Returns a list of ``{'task', 'status', 'duration_ms', 'detail'}``
+        dicts; empty when another worker holds the lease or a run is
+        already in progress in this process.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return []
+        try:
+            conn = self._connect()
+            try:
+                now = time.time()
+                self.last_tick = now
+                if not self._acquire_lease(conn, now):
+                    return []
+
+                last_runs = self._last_runs(conn)
+                results = []
+                for name, task in self.tasks.items():
+                    if only and name != only:
+                        continue
+                    last_finished = (last_runs.get(name) or {}).get('last_finished')
+                    due = force or last_finished is None or now - last_finished >= task['interval']
+                    if not due:
+                        continue
+
+                    started = time.time()
+                    if task['heavy'] and not force and self.is_busy():
+                        status, detail = 'deferred', f'{self.requests_per_minute()} requests/min'
+                    else:
+                        try:
+                            detail = task['runner'](conn, self)
+                            status = 'ok'
+                        except TaskSkipped as e:
+                            status, detail = 'skipped', str(e)
+                        except Exception as e:
+                            status, detail = 'error', str(e)
+                    duration_ms = (time.time() - started) * 1000
+
+                    self._record_run(conn, name, started, duration_ms, status, detail)
+                    results.append({'task': name, 'status': status,
+                                    'duration_ms': round(duration_ms, 3), 'detail': detail})
+                return results
+            finally:
+                conn.close()
+        finally:
+            self._run_lock.release()
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            try:
+                self.run_pending()
+            except sqlite3.Error:
+                # Locked or missing database; try again next tick
+                pass
+
+    def start(self):
+        """Start the background thread; returns False if it is already running"""
+        if self._thread and self._thread.is_alive():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='db-maintenance', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.tick + 5)
+
+    def status(self):
+        """Scheduler state and per-task last-run times for the admin endpoint"""
+        conn = self._connect()
+        try:
+            last_runs = self._last_runs(conn)
+            lock = conn.execute('SELECT holder, expires_at FROM maintenance_lock WHERE id = 1').fetchone()
+        finally:
+            conn.close()
+
+        tasks = {}
+        for name, task in self.tasks.items():
+            run = last_runs.get(name) or {}
+            last_finished = run.get('last_finished')
+            tasks[name] = {
+                'interval_seconds': task['interval'],
+                'heavy': task['heavy'],
+                'last_started': _timestamp(run.get('last_started')),
+                'last_finished': _timestamp(last_finished),
+                'last_duration_ms': run.get('last_duration_ms'),
+                'last_status': run.get('last_status'),
+                'last_detail': run.get('last_detail'),
+                'next_due': _timestamp(last_finished + task['interval']) if last_finished else None,
+            }
+
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'holder': self.holder,
+            'lease_holder': lock['holder'] if lock else None,
+            'lease_expires': _timestamp(lock['expires_at']) if lock else None,
+            'last_tick': _timestamp(self.last_tick),
+            'requests_per_minute': self.requests_per_minute(),
+            'busy': self.is_busy(),
+            'tasks': tasks,
+        }
@@ -0,0 +1,176 @@
+"""
+On-demand request profiling for the Job Application Tracker.
+
+With ``PROFILING_ENABLED=1``, a logged-in user can ask for one request to be
+profiled by sending an ``X-Profile: 1`` header or a ``_profile=1`` query
+parameter. The request runs under ``cProfile`` and the result is written to
+a ring of the newest ``keep`` profiles on disk: a ``.prof`` file for
+``python -m pstats`` or snakeviz, and a ``.json`` summary with wall and CPU
+time, self time split between Flask, Jinja, sqlite3, our code and the rest,
+and the functions that took the most self time.
+
+Only one request per process is profiled at a time; cProfile follows the
+thread that started it, so other requests are not part of the profile, and
+an overlapping opt-in is served unprofiled.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from datetime import datetime, timezone
+
+DEFAULT_KEEP = 20
+DEFAULT_TOP = 15
+
+# Buckets for a function's self time, see ``categorize``
+CATEGORIES = ['flask', 'jinja', 'sqlite3', 'app', 'other']
+FLASK_PACKAGES = ('flask', 'flask_login', 'werkzeug', 'itsdangerous', 'click', 'blinker')
+JINJA_PACKAGES = ('jinja2', 'markupsafe')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_active = threading.Lock()
+
+def default_profile_dir(db_path):
+    """``profiles/`` next to the database file"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'profiles')
+
+def _in_package(filename, packages):
+    return any(f'{os.sep}{package}{os.sep}' in filename for package in packages)
+
+def categorize(filename, funcname, root=ROOT):
+    """Category of a pstats ``(filename, lineno, funcname)`` entry"""
+    if 'sqlite3' in funcname or _in_package(filename, ('sqlite3',)):
+        return 'sqlite3'
+    if _in_package(filename, FLASK_PACKAGES):
+        return 'flask'
+    # Templates compile to code whose filename is the template, or a precompiled module
+    if (_in_package(filename, JINJA_PACKAGES) or filename.endswith('.html')
+            or _in_package(filename, ('templates_compiled',))):
+        return 'jinja'
+    if filename.startswith(root + os.sep) and not _in_package(filename, ('site-packages',)):
+        return 'app'
+    return 'other'
+
+def describe(filename, lineno, funcname, root=ROOT):
+    """Short ``file:line(function)`` label; builtins keep their own name"""
+    if filename == '~':
+        return funcname
+    if filename.startswith(root + os.sep):
+        filename = os.path.relpath(filename, root)
+    elif 'site-packages' in filename:
+        filename = filename.split(f'site-packages{os.sep}', 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f'{filename}:{lineno}({funcname})'
+
+class RequestProfile:
+    """A running profile; ``start`` returns None while another one is active"""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.started = datetime.now(timezone.utc)
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self.wall_ms = self.cpu_ms = None
+
+    @classmethod
+    def start(cls):
+        if not _active.acquire(blocking=False):
+            return None
+        profile = cls()
+        profile.profiler.enable()
+        return profile
+
+    def stop(self):
+        """Stop profiling (again is a no-op) and release the slot"""
+        if self.wall_ms is not None:
+            return self
+        self.profiler.disable()
+        self.wall_ms = round((time.perf_counter() - self._wall) * 1000, 3)
+        self.cpu_ms = round((time.thread_time() - self._cpu) * 1000, 3)
+        _active.release()
+        return self
+
+def summarize(stats, top=DEFAULT_TOP, root=ROOT):
+    """Self time per category and the ``top`` functions by self time, in milliseconds"""
+    categories = dict.fromkeys(CATEGORIES, 0.0)
+    functions = []
+    for (filename, lineno, funcname), (_, calls, self_time, cumulative, _) in stats.stats.items():
+        category = categorize(filename, funcname, root)
+        categories[category] += self_time * 1000
+        functions.append({
+            'function': describe(filename, lineno, funcname, root),
+            'category': category,
+            'calls': calls,
+            'self_ms': round(self_time * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3),
+        })
+    functions.sort(key=lambda function: function['self_ms'], reverse=True)
+    return {
+        'calls': stats.total_calls,
+        'categories': {name: round(ms, 3) for name, ms in categories.items()},
+        'top': functions[:top],
+    }
+
+def profile_name(profile, method, path):
+    """``<UTC timestamp>-<method>-<path without query>``; names sort oldest to newest"""
+    slug = ''.join(c if c.isalnum() else '_' for c in path.split('?')[0].strip('/')) or 'index'
+    return f"{profile.started.strftime('%Y%m%dT%H%M%S%fZ')}-{method}-{slug[:40]}"
+
+def list_profiles(directory):
+    """Summaries of the saved profiles, newest first"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    summaries = []
+    for name in sorted(names, reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                summaries.append(json.load(f))
+        except (OSError, ValueError):
+            # Removed by a concurrent rotation, or still being written
+            continue
+    return summaries
+
+def rotate(directory, keep):
+    """Remove all but the newest ``keep`` profiles; returns the removed names"""
+    names = sorted({os.path.splitext(name)[0] for name in os.listdir(directory)
+                    if name.endswith(('.json', '.prof'))}, reverse=True)
+    for name in names[keep:]:
+        for extension in ('.json', '.prof'):
+            try:
+                os.remove(os.path.join(directory, name + extension))
+            except FileNotFoundError:
+                pass
+    return names[keep:]
+
+def save_profile(profile, directory, keep=DEFAULT_KEEP, method='GET', path='/', status=None):
+    """Write a stopped profile and its summary to ``directory``; returns its name"""
+    os.makedirs(directory, exist_ok=True)
+    name = profile_name(profile, method, path)
+    stats = pstats.Stats(profile.profiler)
+    stats.dump_stats(os.path.join(directory, f'{name}.prof'))
+    summary = {
+        'name': name,
+        'method': method,
+        'path': path,
+        'status': status,
+        'started': profile.started.strftime('%Y-%m-%d %H:%M:%S'),
+        'wall_ms': profile.wall_ms,
+        'cpu_ms': profile.cpu_ms,
+        **summarize(stats),
+    }
+    # The summary goes last and in one rename, so a listed profile always has its .prof
+    partial = os.path.join(directory, f'{name}.json.partial')
+    with open(partial, 'w') as f:
+        json.dump(summary, f)
+    os.replace(partial, os.path.join(directory, f'{name}.json'))
+    rotate(directory, keep)
+    return name
@@ -0,0 +1,1029 @@
+"""
+Storage engines for Job Application Tracker.
+
+Routes read and write applications through an ``ApplicationRepository``
+instead of issuing SQL themselves. Two engines implement it:
+
+- ``SQLiteRepository``: ``job_tracker.db``, the default. Archiving,
+  duplicate clustering and background maintenance build on its schema.
+  Rows store a ``status_id`` into the ``statuses`` lookup table; reads
+  return the label.
+- ``MemoryRepository``: plain dicts with a sorted index per sort column.
+  Writes are appended to a log before they are applied, and the whole store
+  is periodically written out as a snapshot, so it survives restarts. Meant
+  for small single-process deployments; every process has its own copy.
+
+Both are held to the same behaviour by ``tests/test_repository.py``.
+"""
+
+import bisect
+import calendar
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+APPLICATION_COLUMNS = ['id', 'company_name', 'job_role', 'applied_date', 'url', 'status', 'notes', 'last_updated']
+
+SORT_COLUMNS = ['company_name', 'job_role', 'applied_date', 'status', 'last_updated']
+
+# Seed rows of the statuses lookup table, in display order: (id, label, is_terminal).
+# Terminal statuses close an application (see app.archive_applications).
+STATUSES = [
+    (1, 'Applied', False),
+    (2, 'Denied without interview (visa related)', True),
+    (3, 'Denied without interview (non-visa related)', True),
+    (4, 'Interview 1', False),
+    (5, 'Interview 2', False),
+    (6, 'Interview 3', False),
+    (7, 'Offer', True),
+]
+
+# Labels used by older versions, mapped to their current label on write and
+# when a database is migrated
+STATUS_ALIASES = {
+    'Waiting for hearback': 'Applied',
+    'Denied': 'Denied without interview (visa related)',
+    'Interview': 'Interview 1',
+}
+
+# The label of a row's status_id, for single-row reads; bulk reads join
+# statuses instead (see select_list), which is cheaper per row
+STATUS_LABEL = '(SELECT label FROM statuses WHERE statuses.id = status_id)'
+
+# Columns /api/autocomplete suggests values for
+AUTOCOMPLETE_FIELDS = ['company_name', 'job_role']
+
+# Columns of the rows returned by ``followups``
+FOLLOWUP_COLUMNS = ['id', 'company_name', 'job_role', 'applied_date', 'url', 'status', 'stage_entered_at']
+
+# Integer shadows of the ISO text date columns, generated by SQLite (see
+# app.migrate_date_columns); range filters and sorts go through these
+DATE_SHADOW_COLUMNS = {'applied_date': 'applied_day', 'last_updated': 'last_updated_epoch'}
+
+# Julian day number of 0001-01-01, whose proleptic Gregorian ordinal is 1
+JULIAN_DAY_OFFSET = 1721425
+
+# Accepted for applied_date besides ISO dates and datetimes
+DATE_FORMATS = ['%Y/%m/%d', '%m/%d/%Y', '%b %d, %Y', '%B %d, %Y', '%d %b %Y', '%d %B %Y']
+
+# Query parameters that identify where a link was shared from, not which job it is
+TRACKING_QUERY_PARAMS = {'gclid', 'fbclid', 'ref', 'referrer', 'source', 'src', 'trk', 'trackingid'}
+
+def normalize_key_text(value):
+    """Case-fold text and drop whitespace and punctuation"""
+    return ''.join(ch for ch in (value or '').casefold() if ch.isalnum())
+
+def make_dedupe_key(company_name, job_role):
+    """Build the duplicate lookup key for a company and role"""
+    return f'{normalize_key_text(company_name)}|{normalize_key_text(job_role)}'
+
+def canonicalize_url(url):
+    """Reduce a job posting URL to a form that is equal for equivalent links
+
+    Scheme, ``www.``, default ports, fragments, tracking parameters and a
+    trailing slash are dropped; host is lowercased and the remaining query
+    parameters are sorted. Returns an empty string for a blank URL.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'http://' + url
+
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS
+    )
+    path = parts.path.rstrip('/')
+
+    return f'{host}{path}?{urlencode(query)}' if query else f'{host}{path}'
+
+def normalize_date(value):
+    """Return a date given as ISO date/datetime or in ``DATE_FORMATS`` as YYYY-MM-DD
+
+    Raises ``ValueError`` for anything else.
+    """
+    text = str(value or '').strip()
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f'Invalid date: {value!r}')
+
+def normalize_timestamp(value):
+    """Return an ISO date or datetime as UTC ``YYYY-MM-DD HH:MM:SS``
+
+    Values without an offset are taken to be UTC already, like SQLite's
+    ``CURRENT_TIMESTAMP``. Raises ``ValueError`` for anything else.
+    """
+    text = str(value or '').strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid timestamp: {value!r}') from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def julian_day(value):
+    """Julian day number of a YYYY-MM-DD date, as stored in ``applied_day``"""
+    return date.fromisoformat(value[:10]).toordinal() + JULIAN_DAY_OFFSET
+
+def epoch_seconds(value):
+    """Unix time of a UTC YYYY-MM-DD[ HH:MM:SS] value, as stored in the ``*_epoch`` columns"""
+    return calendar.timegm(datetime.fromisoformat(value).timetuple())
+
+def select_list(columns, joined=False):
+    """SELECT list for stored columns, reading ``status`` through the statuses table
+
+    With ``joined`` the query has ``LEFT JOIN statuses`` and the row source
+    is aliased ``a``.
+    """
+    if not joined:
+        return ', '.join(f'{STATUS_LABEL} AS status' if column == 'status' else column for column in columns)
+    return ', '.join('statuses.label AS status' if column == 'status' else f'a.{column}' for column in columns)
+
+def status_in(statuses):
+    """``status_id IN`` clause and params for a list of status labels"""
+    return (f'status_id IN (SELECT id FROM statuses WHERE label IN ({", ".join("?" for _ in statuses)}))',
+            list(statuses))
+
+def order_expression(sort):
+    """ORDER BY expression for a ``SORT_COLUMNS`` entry, in a query joining statuses"""
+    if sort == 'status':
+        return 'statuses.label'
+    return DATE_SHADOW_COLUMNS.get(sort, sort)
+
+def filter_clause(filters):
+    """Compile a filters dict into a parameterized WHERE clause
+
+    ``filters`` may hold ``status`` (a list), ``applied_from``,
+    ``applied_to``, ``updated_since`` (stored-format dates) and ``company``
+    (a case-insensitive prefix). Date ranges compare the integer shadow
+    columns. Returns ``(where_sql, params)``; ``where_sql`` is empty when no
+    filter is set.
+    """
+    filters = filters or {}
+    clauses = []
+    params = []
+
+    statuses = filters.get('status')
+    if statuses:
+        clause, status_params = status_in(statuses)
+        clauses.append(clause)
+        params.extend(status_params)
+
+    if filters.get('applied_from'):
+        clauses.append('applied_day >= ?')
+        params.append(julian_day(filters['applied_from']))
+
+    if filters.get('applied_to'):
+        clauses.append('applied_day <= ?')
+        params.append(julian_day(filters['applied_to']))
+
+    if filters.get('updated_since'):
+        clauses.append('last_updated_epoch >= ?')
+        params.append(epoch_seconds(filters['updated_since']))
+
+    company = filters.get('company')
+    if company:
+        # A range over the NOCASE index instead of LIKE, which cannot use it.
+        # U+10FFFF sorts after any character that can follow the prefix.
+        clauses.append('company_name >= ? COLLATE NOCASE AND company_name < ? COLLATE NOCASE')
+        params.extend([company, company + '\U0010ffff'])
+
+    where_sql = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+    return where_sql, params
+
+def application_source(include_archived):
+    """FROM target for application reads, optionally spanning the archive"""
+    if not include_archived:
+        return 'job_applications'
+    stored = ['status_id' if column == 'status' else column for column in APPLICATION_COLUMNS]
+    columns = ', '.join([*stored, *DATE_SHADOW_COLUMNS.values()])
+    return (f'(SELECT {columns}, 0 AS archived FROM job_applications '
+            f'UNION ALL SELECT {columns}, 1 AS archived FROM archived_applications)')
+
+def history_source(include_archived):
+    """FROM target for status history reads, optionally spanning the archive"""
+    if not include_archived:
+        return 'status_history'
+    return ('(SELECT id, application_id, status_id, changed_at, changed_at_epoch FROM status_history '
+            'UNION ALL SELECT id, application_id, status_id, changed_at, changed_at_epoch FROM archived_status_history)')
+
+def status_at(history_table):
+    """``status_id`` of the ``src`` row's latest ``history_table`` entry at or before ``cutoff.epoch``
+
+    One descending seek per application on the ``(application_id,
+    changed_at_epoch)`` index; ties on the second go to the later entry.
+    """
+    return f'''(SELECT h.status_id FROM {history_table} AS h
+        WHERE h.application_id = src.id AND h.changed_at_epoch <= cutoff.epoch
+        ORDER BY h.changed_at_epoch DESC, h.id DESC LIMIT 1)'''
+
+def as_of_source(include_archived):
+    """FROM target for applications as they stood at a point in time
+
+    Like ``application_source``, but ``status_id`` comes from the history
+    as of the one ``?`` parameter (epoch seconds), and applications with no
+    history by then are left out.
+    """
+    columns = [column for column in APPLICATION_COLUMNS if column != 'status'] + list(DATE_SHADOW_COLUMNS.values())
+    status_id = status_at('status_history')
+    if include_archived:
+        columns.append('archived')
+        status_id = f"CASE WHEN src.archived THEN {status_at('archived_status_history')} ELSE {status_id} END"
+    return (f'(SELECT * FROM (SELECT {", ".join(f"src.{column}" for column in columns)}, {status_id} AS status_id '
+            f'FROM {application_source(include_archived)} AS src, (SELECT ? AS epoch) AS cutoff) '
+            f'WHERE status_id IS NOT NULL)')
+
+class VersionedCache:
+    """Small LRU of read results, each valid only for the storage version it was read at"""
+
+    def __init__(self, size=32):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, read):
+        """The cached result for ``key`` at ``version``, or ``read()`` stored under it
+
+        Take ``version`` before reading, so a concurrent write leaves a stale
+        entry behind rather than a wrong one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = read()
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+
+class ApplicationRepository(ABC):
+    """Interface the routes use for applications, history and summary counts
+
+    Applications are dicts with the ``APPLICATION_COLUMNS`` keys plus a
+    ``status_history`` list of ``{'status', 'changed_at'}`` dicts, oldest
+    first. ``fields`` for writes holds ``company_name``, ``job_role``,
+    ``applied_date``, ``status`` and optionally ``url`` and ``notes``.
+    """
+
+    name = None
+
+    @abstractmethod
+    def add(self, fields):
+        """Insert an application and its first history entry; returns it"""
+
+    @abstractmethod
+    def update(self, app_id, fields):
+        """Replace an application's fields; returns ``(old_status, application)``
+
+        A status change is recorded in the history. Both are None when the
+        id does not exist.
+        """
+
+    @abstractmethod
+    def delete(self, app_id):
+        """Delete an application, archived or not; returns ``(old_status, archived)``
+
+        ``archived`` tells whether it was deleted from the archive. Both are
+        None when the id does not exist.
+        """
+
+    @abstractmethod
+    def get(self, app_id):
+        """One application with its history, or None"""
+
+    @abstractmethod
+    def list(self, filters=None, sort='applied_date', order='desc', columns=APPLICATION_COLUMNS,
+             include_history=True, include_archived=False, as_of=None):
+        """Applications matching ``filters`` (see ``filter_clause``), sorted
+
+        Returns ``(rows, histories)``: rows are dicts with only ``columns``
+        (``'archived'`` may be among them) and ``histories`` maps id to the
+        history list, or is None without ``include_history``.
+
+        With ``as_of`` (a UTC ``YYYY-MM-DD HH:MM:SS`` timestamp) the list is
+        replayed from the history: only applications created by then, each
+        with the status of its latest history entry at or before ``as_of``
+        and only the history up to it. Other fields are current. Filters and
+        the status sort apply to that past status.
+        """
+
+    @abstractmethod
+    def summary(self, include_archived=False, as_of=None):
+        """``{'total': n, 'by_status': {status: n}}``, at ``as_of`` when given (see ``list``)"""
+
+    @abstractmethod
+    def find_duplicates(self, company_name, job_role, url, exclude_id=None):
+        """Applications with the same normalized company/role or job URL"""
+
+    @abstractmethod
+    def followups(self, statuses, entered_before):
+        """Applications in one of ``statuses`` since at or before ``entered_before``, oldest first
+
+        ``entered_before`` is a UTC ``YYYY-MM-DD HH:MM:SS`` timestamp. Rows
+        are dicts with the ``FOLLOWUP_COLUMNS`` keys; ``stage_entered_at`` is
+        when the current status was entered (its latest history entry).
+        """
+
+    @abstractmethod
+    def autocomplete(self, field, prefix, limit=10):
+        """Most used distinct values of ``field`` starting with ``prefix``
+
+        ``field`` is one of ``AUTOCOMPLETE_FIELDS``. Values are compared
+        case-insensitively; each is returned as first written, with the
+        number of applications (archived ones included) using it. Returns
+        ``[{'value', 'uses'}]``, most used first, ties alphabetical.
+        """
+
+    @abstractmethod
+    def statuses(self):
+        """Known statuses in display order: ``[{'id', 'label', 'ordinal', 'is_terminal'}]``"""
+
+    @abstractmethod
+    def version(self):
+        """Opaque string that changes whenever any application changes"""
+
+    def _as_of_read(self, key, read):
+        """``read()`` memoized until the next write; point-in-time results only change with writes"""
+        return self.as_of_cache.get(key, self.version(), read)
+
+class SQLiteRepository(ApplicationRepository):
+    """Applications stored in the SQLite schema created by ``app.init_db``
+
+    ``get_db_path`` is called for every connection so tests can repoint the
+    database.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, get_db_path):
+        self.get_db_path = get_db_path
+        self.as_of_cache = VersionedCache()
+
+    def connect(self):
+        conn = sqlite3.connect(self.get_db_path())
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _as_of_read(self, key, read):
+        # Copies of one database share data_version values, so a repointed
+        # get_db_path must not be served the previous file's results
+        return super()._as_of_read((self.get_db_path(), *key), read)
+
+    def _application(self, conn, row, history=None):
+        """Shape a job_applications row, loading its history unless given"""
+        if history is None:
+            history = conn.execute(f'''
+                SELECT {STATUS_LABEL} AS status, changed_at FROM status_history
+                WHERE application_id = ?
+                ORDER BY changed_at_epoch ASC, id ASC
+            ''', (row['id'],)).fetchall()
+
+        application = {column: row[column] for column in APPLICATION_COLUMNS}
+        application['status_history'] = [
+            {'status': hist_entry['status'], 'changed_at': hist_entry['changed_at']}
+            for hist_entry in history
+        ]
+        return application
+
+    def add(self, fields):
+        conn = self.connect()
+        try:
+            with conn:
+                row = conn.execute(f'''
+                    INSERT INTO job_applications (company_name, job_role, applied_date, url, status_id, notes,
+                                                  dedupe_key, url_key, stage_entered_at)
+                    VALUES (?, ?, ?, ?, (SELECT id FROM statuses WHERE label = ?), ?, ?, ?, CURRENT_TIMESTAMP)
+                    RETURNING *, {STATUS_LABEL} AS status
+                ''', (
+                    fields['company_name'],
+                    fields['job_role'],
+                    fields['applied_date'],
+                    fields.get('url', ''),
+                    fields['status'],
+                    fields.get('notes', ''),
+                    make_dedupe_key(fields['company_name'], fields['job_role']),
+                    canonicalize_url(fields.get('url', ''))
+                )).fetchone()
+
+                # Record initial status in history, stamped like stage_entered_at
+                history = conn.execute(f'''
+                    INSERT INTO status_history (application_id, status_id, changed_at)
+                    VALUES (?, ?, ?)
+                    RETURNING {STATUS_LABEL} AS status, changed_at
+                ''', (row['id'], row['status_id'], row['stage_entered_at'])).fetchall()
+            return self._application(conn, row, history)
+        finally:
+            conn.close()
+
+    def update(self, app_id, fields):
+        conn = self.connect()
+        try:
+            with conn:
+                current = conn.execute(f'SELECT {STATUS_LABEL} AS status FROM job_applications WHERE id = ?',
+                                       (app_id,)).fetchone()
+                if current is None:
+                    return None, None
+
+                # The CASE sees the row's old status_id
+                row = conn.execute(f'''
+                    UPDATE job_applications
+                    SET company_name = ?, job_role = ?, applied_date = ?,
+                        url = ?, status_id = (SELECT id FROM statuses WHERE label = ?), notes = ?,
+                        last_updated = CURRENT_TIMESTAMP, dedupe_key = ?, url_key = ?,
+                        stage_entered_at = CASE WHEN {STATUS_LABEL} = ? THEN stage_entered_at ELSE CURRENT_TIMESTAMP END
+                    WHERE id = ?
+                    RETURNING *, {STATUS_LABEL} AS status
+                ''', (
+                    fields['company_name'],
+                    fields['job_role'],
+                    fields['applied_date'],
+                    fields.get('url', ''),
+                    fields['status'],
+                    fields.get('notes', ''),
+                    make_dedupe_key(fields['company_name'], fields['job_role']),
+                    canonicalize_url(fields.get('url', '')),
+                    fields['status'],
+                    app_id
+                )).fetchone()
+
+                if current['status'] != fields['status']:
+                    conn.execute('''
+                        INSERT INTO status_history (application_id, status_id, changed_at)
+                        VALUES (?, ?, ?)
+                    ''', (app_id, row['status_id'], row['stage_entered_at']))
+            return current['status'], self._application(conn, row)
+        finally:
+            conn.close()
+
+    def delete(self, app_id):
+        conn = self.connect()
+        try:
+            with conn:
+                deleted = conn.execute(f'DELETE FROM job_applications WHERE id = ? RETURNING {STATUS_LABEL} AS status',
+                                       (app_id,)).fetchone()
+                conn.execute('DELETE FROM status_history WHERE application_id = ?', (app_id,))
+                conn.execute('DELETE FROM archived_status_history WHERE application_id = ?', (app_id,))
+                archived = conn.execute(f'DELETE FROM archived_applications WHERE id = ? '
+                                        f'RETURNING {STATUS_LABEL} AS status', (app_id,)).fetchone()
+            if deleted:
+                return deleted['status'], False
+            if archived:
+                return archived['status'], True
+            return None, None
+        finally:
+            conn.close()
+
+    def get(self, app_id):
+        conn = self.connect()
+        try:
+            row = conn.execute(f'SELECT *, {STATUS_LABEL} AS status FROM job_applications WHERE id = ?',
+                               (app_id,)).fetchone()
+            return self._application(conn, row) if row else None
+        finally:
+            conn.close()
+
+    def list(self, filters=None, sort='applied_date', order='desc', columns=APPLICATION_COLUMNS,
+             include_history=True, include_archived=False, as_of=None):
+        if as_of:
+            key = ('list', json.dumps(filters or {}, sort_keys=True), sort, order, tuple(columns),
+                   include_history, include_archived, as_of)
+            rows, histories = self._as_of_read(key, lambda: self._list(
+                filters, sort, order, columns, include_history, include_archived, as_of))
+            # Callers add keys to the rows; keep the cached ones untouched
+            return [dict(row) for row in rows], histories
+        return self._list(filters, sort, order, columns, include_history, include_archived, None)
+
+    def _list(self, filters, sort, order, columns, include_history, include_archived, as_of):
+        where, params = filter_clause(filters)
+        if as_of:
+            source = as_of_source(include_archived)
+            params = [epoch_seconds(as_of), *params]
+        else:
+            source = application_source(include_archived)
+        conn = self.connect()
+        try:
+            # Column names come from the APPLICATION_COLUMNS whitelist, never from user input
+            rows = conn.execute(f'''
+                SELECT {select_list(columns, joined=True)} FROM {source} AS a
+                LEFT JOIN statuses ON statuses.id = a.status_id
+                {where}
+                ORDER BY {order_expression(sort)} {order.upper()}
+            ''', params).fetchall()
+            rows = [dict(row) for row in rows]
+
+            histories = None
+            if include_history:
+                # Every history entry in one query instead of one query per row
+                conditions = []
+                history_params = []
+                if where or as_of:
+                    conditions.append(f'application_id IN (SELECT id FROM {source} {where})')
+                    history_params.extend(params)
+                if as_of:
+                    conditions.append('h.changed_at_epoch <= ?')
+                    history_params.append(epoch_seconds(as_of))
+                app_filter = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+                histories = {}
+                for hist_entry in conn.execute(f'''
+                    SELECT h.application_id, statuses.label AS status, h.changed_at
+                    FROM {history_source(include_archived)} AS h
+                    LEFT JOIN statuses ON statuses.id = h.status_id
+                    {app_filter}
+                    ORDER BY h.application_id, h.changed_at_epoch ASC, h.id ASC
+                ''', history_params):
+                    histories.setdefault(hist_entry['application_id'], []).append(
+                        {'status': hist_entry['status'], 'changed_at': hist_entry['changed_at']})
+            return rows, histories
+        finally:
+            conn.close()
+
+    def summary(self, include_archived=False, as_of=None):
+        if as_of:
+            return self._as_of_read(('summary', include_archived, as_of),
+                                    lambda: self._summary(include_archived, as_of))
+        return self._summary(include_archived, None)
+
+    def _summary(self, include_archived, as_of):
+        if as_of:
+            source, params = as_of_source(include_archived), [epoch_seconds(as_of)]
+        else:
+            source, params = application_source(include_archived), []
+        conn = self.connect()
+        try:
+            total_count = conn.execute(f'SELECT COUNT(*) FROM {source}', params).fetchone()[0]
+            # Counted per status_id on its index, labelled afterwards
+            status_counts = conn.execute(f'''
+                SELECT statuses.label, counts.count
+                FROM (SELECT status_id, COUNT(*) AS count FROM {source} GROUP BY status_id) AS counts
+                JOIN statuses ON statuses.id = counts.status_id
+            ''', params).fetchall()
+        finally:
+            conn.close()
+
+        return {'total': total_count, 'by_status': {status: count for status, count in status_counts}}
+
+    def find_duplicates(self, company_name, job_role, url, exclude_id=None):
+        """Both lookups are equality seeks on the ``dedupe_key`` and ``url_key`` indexes"""
+        conn = self.connect()
+        try:
+            rows = conn.execute(f'''
+                SELECT id, company_name, job_role, applied_date, {STATUS_LABEL} AS status, url
+                FROM job_applications
+                WHERE dedupe_key = ? OR (url_key = ? AND url_key != '')
+                ORDER BY id
+            ''', (make_dedupe_key(company_name, job_role), canonicalize_url(url))).fetchall()
+        finally:
+            conn.close()
+
+        return [dict(row) for row in rows if row['id'] != exclude_id]
+
+    def followups(self, statuses, entered_before):
+        """One range seek per status on the ``(status_id, stage_entered_epoch)`` index"""
+        if not statuses:
+            return []
+        status_clause, params = status_in(statuses)
+        conn = self.connect()
+        try:
+            rows = conn.execute(f'''
+                SELECT {select_list(FOLLOWUP_COLUMNS)}
+                FROM job_applications
+                WHERE {status_clause} AND stage_entered_epoch <= ?
+                ORDER BY stage_entered_epoch, id
+            ''', (*params, epoch_seconds(entered_before))).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def autocomplete(self, field, prefix, limit=10):
+        """A range scan over the ``field_values`` primary key, kept current by triggers"""
+        conn = self.connect()
+        try:
+            rows = conn.execute('''
+                SELECT value, uses FROM field_values
+                WHERE field = ? AND value >= ? AND value < ?
+                ORDER BY uses DESC, value
+                LIMIT ?
+            ''', (field, prefix, prefix + '\U0010ffff', limit)).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def statuses(self):
+        conn = self.connect()
+        try:
+            rows = conn.execute('SELECT id, label, ordinal, is_terminal FROM statuses ORDER BY ordinal, id').fetchall()
+        finally:
+            conn.close()
+        return [dict(row, is_terminal=bool(row['is_terminal'])) for row in rows]
+
+    def version(self):
+        """The ``data_version`` counter, bumped by triggers on every write"""
+        conn = self.connect()
+        try:
+            return str(conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()[0])
+        finally:
+            conn.close()
+
+def _timestamp():
+    """Current UTC time in SQLite's CURRENT_TIMESTAMP format"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+class MemoryRepository(ApplicationRepository):
+    """Applications held in memory, optionally persisted under ``path``
+
+    Every write is appended as one JSON line to ``<path>.log`` before it is
+    applied. After ``snapshot_every`` writes the whole store is written to
+    ``path`` (via a temporary file and rename) and the log is truncated. On
+    start the snapshot is loaded and log entries newer than it are replayed;
+    a torn last line from a crash is ignored. With ``fsync`` each log append
+    is flushed to disk before the write returns. Without ``path`` nothing is
+    persisted.
+    """
+
+    name = 'memory'
+
+    def __init__(self, path=None, snapshot_every=1000, fsync=False):
+        self.path = path
+        self.log_path = f'{path}.log' if path else None
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self.as_of_cache = VersionedCache()
+        self._reset()
+
+        self._log = None
+        if path:
+            self._load()
+            if os.path.exists(path):
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            else:
+                # First start: an initial snapshot records the token
+                self.snapshot()
+
+    def _reset(self):
+        self.rows = {}
+        self.history = {}
+        self.next_id = 1
+        self.sequence = 0
+        # A fresh token per store, so versions never repeat across restarts of
+        # an unpersisted store
+        self.token = uuid.uuid4().hex[:8]
+        # (value, id) pairs in ascending order, one list per sort column
+        self.sort_index = {column: [] for column in SORT_COLUMNS}
+        self.status_index = {}
+        self.dedupe_index = {}
+        self.url_index = {}
+        # Per autocomplete field: lowercased value -> [value as first written, uses],
+        # and the lowercased values in order for prefix range lookups
+        self.value_counts = {field: {} for field in AUTOCOMPLETE_FIELDS}
+        self.value_keys = {field: [] for field in AUTOCOMPLETE_FIELDS}
+        self.writes_since_snapshot = 0
+
+    # -- indexes --
+
+    def _index(self, row):
+        for column, index in self.sort_index.items():
+            bisect.insort(index, (row[column] or '', row['id']))
+        self.status_index.setdefault(row['status'], set()).add(row['id'])
+        self.dedupe_index.setdefault(row['dedupe_key'], set()).add(row['id'])
+        if row['url_key']:
+            self.url_index.setdefault(row['url_key'], set()).add(row['id'])
+        for field in AUTOCOMPLETE_FIELDS:
+            key = row[field].lower()
+            counts = self.value_counts[field]
+            if key in counts:
+                counts[key][1] += 1
+            else:
+                counts[key] = [row[field], 1]
+                bisect.insort(self.value_keys[field], key)
+
+    def _unindex(self, row):
+        for column, index in self.sort_index.items():
+            del index[bisect.bisect_left(index, (row[column] or '', row['id']))]
+        for index, key in ((self.status_index, row['status']),
+                           (self.dedupe_index, row['dedupe_key']),
+                           (self.url_index, row['url_key'])):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(row['id'])
+                if not ids:
+                    del index[key]
+        for field in AUTOCOMPLETE_FIELDS:
+            key = row[field].lower()
+            counts = self.value_counts[field]
+            counts[key][1] -= 1
+            if not counts[key][1]:
+                del counts[key]
+                keys = self.value_keys[field]
+                del keys[bisect.bisect_left(keys, key)]
+
+    # -- log and snapshots --
+
+    def _apply(self, entry):
+        """Apply one logged write; also used to replay the log"""
+        op = entry['op']
+        if op in ('add', 'update'):
+            row = entry['row']
+            old = self.rows.get(row['id'])
+            if 'stage_entered_at' not in row:
+                # Logged before stage_entered_at was tracked
+                same_stage = old is not None and old['status'] == row['status']
+                row['stage_entered_at'] = old.get('stage_entered_at') if same_stage else row['last_updated']
+            # Logged before rows carried archived
+            row.setdefault('archived', 0)
+            if old is not None:
+                self._unindex(old)
+            self.rows[row['id']] = row
+            self._index(row)
+            if op == 'add':
+                self.history[row['id']] = list(entry['history'])
+                self.next_id = max(self.next_id, row['id'] + 1)
+            elif entry.get('history'):
+                self.history.setdefault(row['id'], []).append(entry['history'])
+        elif op == 'delete':
+            old = self.rows.pop(entry['id'], None)
+            if old is not None:
+                self._unindex(old)
+            self.history.pop(entry['id'], None)
+        self.sequence = entry['sequence']
+
+    def _write(self, entry):
+        """Log then apply a write (caller holds the lock)"""
+        entry['sequence'] = self.sequence + 1
+        if self._log:
+            self._log.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+        self._apply(entry)
+
+        self.writes_since_snapshot += 1
+        if self.path and self.writes_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Write the whole store to ``path`` and start a new log"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'sequence': self.sequence,
+                'next_id': self.next_id,
+                'token': self.token,
+                'rows': list(self.rows.values()),
+                'history': {str(app_id): entries for app_id, entries in self.history.items()},
+            }
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            # Entries up to `sequence` are in the snapshot; a crash before the
+            # truncate only leaves entries that replay will skip
+            if self._log:
+                self._log.close()
+            self._log = open(self.log_path, 'w', encoding='utf-8')
+            self.writes_since_snapshot = 0
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            for row in data['rows']:
+                # Snapshots from before rows carried archived
+                row.setdefault('archived', 0)
+                self.rows[row['id']] = row
+                self._index(row)
+            self.history = {int(app_id): entries for app_id, entries in data['history'].items()}
+            for row in self.rows.values():
+                # Snapshots from before stage_entered_at was tracked
+                if 'stage_entered_at' not in row:
+                    entries = self.history.get(row['id'])
+                    row['stage_entered_at'] = entries[-1]['changed_at'] if entries else row['last_updated']
+            self.next_id = data['next_id']
+            self.sequence = data['sequence']
+            self.token = data['token']
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash: nothing after it was acknowledged
+                        break
+                    if entry['sequence'] > self.sequence:
+                        self._apply(entry)
+                        self.writes_since_snapshot += 1
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    # -- repository interface --
+
+    def _application(self, row):
+        application = {column: row[column] for column in APPLICATION_COLUMNS}
+        application['status_history'] = [dict(entry) for entry in self.history.get(row['id'], [])]
+        return application
+
+    def _row(self, app_id, fields, last_updated, stage_entered_at):
+        return {
+            'id': app_id,
+            'company_name': fields['company_name'],
+            'job_role': fields['job_role'],
+            'applied_date': fields['applied_date'],
+            'url': fields.get('url', ''),
+            'status': fields['status'],
+            'notes': fields.get('notes', ''),
+            'last_updated': last_updated,
+            'dedupe_key': make_dedupe_key(fields['company_name'], fields['job_role']),
+            'url_key': canonicalize_url(fields.get('url', '')),
+            'stage_entered_at': stage_entered_at,
+            # Nothing is ever archived here
+            'archived': 0,
+        }
+
+    def add(self, fields):
+        now = _timestamp()
+        with self._lock:
+            row = self._row(self.next_id, fields, now, now)
+            self._write({'op': 'add', 'row': row, 'history': [{'status': row['status'], 'changed_at': now}]})
+            return self._application(row)
+
+    def update(self, app_id, fields):
+        now = _timestamp()
+        with self._lock:
+            current = self.rows.get(app_id)
+            if current is None:
+                return None, None
+            same_stage = fields['status'] == current['status']
+            row = self._row(app_id, fields, now, current['stage_entered_at'] if same_stage else now)
+            history = None if same_stage else {'status': row['status'], 'changed_at': now}
+            self._write({'op': 'update', 'row': row, 'history': history})
+            return current['status'], self._application(row)
+
+    def delete(self, app_id):
+        with self._lock:
+            current = self.rows.get(app_id)
+            if current is None:
+                return None, None
+            self._write({'op': 'delete', 'id': app_id})
+            return current['status'], False
+
+    def get(self, app_id):
+        with self._lock:
+            row = self.rows.get(app_id)
+            return self._application(row) if row else None
+
+    def list(self, filters=None, sort='applied_date', order='desc', columns=APPLICATION_COLUMNS,
+             include_history=True, include_archived=False, as_of=None):
+        if as_of:
+            key = ('list', json.dumps(filters or {}, sort_keys=True), sort, order, tuple(columns),
+                   include_history, as_of)
+            rows, histories = self._as_of_read(key, lambda: self._list_as_of(
+                filters, sort, order, columns, include_history, as_of))
+            return [dict(row) for row in rows], histories
+
+        matches = self._matcher(filters or {})
+        with self._lock:
+            index = self.sort_index[sort]
+            pairs = reversed(index) if order == 'desc' else index
+            rows = []
+            for _, app_id in pairs:
+                row = self.rows[app_id]
+                if matches(row):
+                    rows.append({column: row[column] for column in columns})
+
+            histories = None
+            if include_history:
+                histories = {row['id']: [dict(entry) for entry in self.history.get(row['id'], [])]
+                             for row in rows}
+        return rows, histories
+
+    def _rows_as_of(self, as_of):
+        """Rows as of ``as_of`` with their history up to it: ``[(row, history)]``"""
+        rows = []
+        for app_id, row in self.rows.items():
+            entries = self.history.get(app_id, [])
+            # History is appended in time order, so a bisect finds the cut-off
+            cut = bisect.bisect_right([entry['changed_at'] for entry in entries], as_of)
+            if cut:
+                rows.append((dict(row, status=entries[cut - 1]['status']), entries[:cut]))
+        return rows
+
+    def _list_as_of(self, filters, sort, order, columns, include_history, as_of):
+        matches = self._matcher(filters or {})
+        with self._lock:
+            selected = [(row, entries) for row, entries in self._rows_as_of(as_of) if matches(row)]
+        selected.sort(key=lambda pair: (pair[0][sort] or '', pair[0]['id']), reverse=order == 'desc')
+        rows = [{column: row[column] for column in columns} for row, _ in selected]
+        histories = None
+        if include_history:
+            histories = {row['id']: [dict(entry) for entry in entries] for row, entries in selected}
+        return rows, histories
+
+    def _matcher(self, filters):
+        """Predicate for ``filters``, matching ``filter_clause`` semantics"""
+        statuses = set(filters.get('status') or ())
+        applied_from = filters.get('applied_from')
+        applied_to = filters.get('applied_to')
+        updated_since = filters.get('updated_since')
+        company = (filters.get('company') or '').lower()
+
+        def matches(row):
+            return ((not statuses or row['status'] in statuses) and
+                    (not applied_from or row['applied_date'] >= applied_from) and
+                    (not applied_to or row['applied_date'] <= applied_to) and
+                    (not updated_since or row['last_updated'] >= updated_since) and
+                    (not company or row['company_name'].lower().startswith(company)))
+        return matches
+
+    def summary(self, include_archived=False, as_of=None):
+        if as_of:
+            return self._as_of_read(('summary', as_of), lambda: self._summary_as_of(as_of))
+        with self._lock:
+            return {
+                'total': len(self.rows),
+                'by_status': {status: len(ids) for status, ids in self.status_index.items()},
+            }
+
+    def _summary_as_of(self, as_of):
+        with self._lock:
+            rows = self._rows_as_of(as_of)
+        by_status = {}
+        for row, _ in rows:
+            by_status[row['status']] = by_status.get(row['status'], 0) + 1
+        return {'total': len(rows), 'by_status': by_status}
+
+    def find_duplicates(self, company_name, job_role, url, exclude_id=None):
+        url_key = canonicalize_url(url)
+        with self._lock:
+            ids = set(self.dedupe_index.get(make_dedupe_key(company_name, job_role), ()))
+            if url_key:
+                ids |= self.url_index.get(url_key, set())
+            return [
+                {column: self.rows[app_id][column]
+                 for column in ('id', 'company_name', 'job_role', 'applied_date', 'status', 'url')}
+                for app_id in sorted(ids) if app_id != exclude_id
+            ]
+
+    def followups(self, statuses, entered_before):
+        with self._lock:
+            rows = [self.rows[app_id] for status in set(statuses)
+                    for app_id in self.status_index.get(status, ())]
+            rows = [row for row in rows if row['stage_entered_at'] <= entered_before]
+            rows.sort(key=lambda row: (row['stage_entered_at'], row['id']))
+            return [{column: row[column] for column in FOLLOWUP_COLUMNS} for row in rows]
+
+    def autocomplete(self, field, prefix, limit=10):
+        prefix = prefix.lower()
+        with self._lock:
+            keys = self.value_keys[field]
+            start = bisect.bisect_left(keys, prefix)
+            end = bisect.bisect_left(keys, prefix + '\U0010ffff', start)
+            counts = self.value_counts[field]
+            top = heapq.nsmallest(limit, keys[start:end], key=lambda key: (-counts[key][1], key))
+            return [{'value': counts[key][0], 'uses': counts[key][1]} for key in top]
+
+    def statuses(self):
+        """The seed ``STATUSES``; rows store labels, so there is no table to read"""
+        return [{'id': status_id, 'label': label, 'ordinal': ordinal, 'is_terminal': is_terminal}
+                for ordinal, (status_id, label, is_terminal) in enumerate(STATUSES)]
+
+    def version(self):
+        return f'{self.token}.{self.sequence}'
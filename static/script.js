@@ -4,6 +4,18 @@
 let allApplications = [];
 let filteredApplications = [];
 let activeStatusFilter = 'all';
+// Status the loaded list was fetched with; with 'all' the status filter runs locally
+let loadedStatusFilter = 'all';
+let summaryCounts = { total: 0, by_status: {} };
+let lastEventId = null;
+// Pseudo-status of the "Needs Follow-up" card; the ids come from /api/followups
+const FOLLOWUP_FILTER = 'followup';
+let followupIds = new Set();
+
+// sessionStorage keys for skipping the reload after add/edit redirects back to '/'
+const SNAPSHOT_KEY = 'dashboardSnapshot';
+const PENDING_KEY = 'pendingMutations';
+const SNAPSHOT_MAX_AGE_MS = 10 * 60 * 1000;
 
 // Utility functions
 function showNotification(message, type = 'success') {
@@ -47,67 +59,364 @@ style.textContent = `
 `;
 document.head.appendChild(style);
 
+// Update the summary cards from a {total, by_status} object; the server
+// renders one card per row of the statuses table
+function renderSummary(data) {
+    summaryCounts = data;
+    document.getElementById('total-count').textContent = data.total;
+    document.querySelectorAll('.summary-card[data-status]').forEach(card => {
+        const status = card.getAttribute('data-status');
+        if (status !== 'all' && status !== FOLLOWUP_FILTER) {
+            card.querySelector('.summary-number').textContent = data.by_status[status] || 0;
+        }
+    });
+}
+
 // Load summary statistics
 function loadSummary() {
     fetch('/api/summary')
         .then(response => response.json())
-        .then(data => {
-            document.getElementById('total-count').textContent = data.total;
-            document.getElementById('applied-count').textContent = data.by_status['Applied'] || 0;
-            document.getElementById('denied-visa-count').textContent = data.by_status['Denied without interview (visa related)'] || 0;
-            document.getElementById('denied-nonvisa-count').textContent = data.by_status['Denied without interview (non-visa related)'] || 0;
-            document.getElementById('interview1-count').textContent = data.by_status['Interview 1'] || 0;
-            document.getElementById('interview2-count').textContent = data.by_status['Interview 2'] || 0;
-            document.getElementById('interview3-count').textContent = data.by_status['Interview 3'] || 0;
-            document.getElementById('offer-count').textContent = data.by_status['Offer'] || 0;
-        })
+        .then(renderSummary)
         .catch(error => {
             console.error('Error loading summary:', error);
         });
 }
 
-// Load all applications
-function loadApplications() {
+// Apply the {total, by_status} delta returned by /add, /edit and /delete
+function applySummaryDelta(delta) {
+    const byStatus = { ...summaryCounts.by_status };
+    Object.entries(delta.by_status).forEach(([status, change]) => {
+        byStatus[status] = (byStatus[status] || 0) + change;
+    });
+    renderSummary({ total: summaryCounts.total + delta.total, by_status: byStatus });
+}
+
+// Decode a ?format=columnar payload back into row objects
+function decodeColumnar(payload) {
+    const columns = payload.columns;
+    const statuses = payload.dictionaries.status;
+    const history = payload.status_history;
+    const names = Object.keys(columns);
+    const rows = new Array(payload.count);
+    
+    for (let i = 0; i < payload.count; i++) {
+        const row = {};
+        for (const name of names) {
+            row[name] = columns[name][i];
+        }
+        if ('status' in row) {
+            row.status = statuses[row.status];
+        }
+        
+        // History is only present when requested (include=history)
+        if (history) {
+            const start = history.offsets[i];
+            const end = history.offsets[i + 1];
+            const statusHistory = new Array(end - start);
+            for (let j = start; j < end; j++) {
+                statusHistory[j - start] = {
+                    status: statuses[history.status[j]],
+                    changed_at: history.changed_at[j]
+                };
+            }
+            row.status_history = statusHistory;
+        }
+        rows[i] = row;
+    }
+    
+    return rows;
+}
+
+// Load all applications; with the ETag of data already on screen the
+// request is conditional and a 304 leaves everything as it is
+function loadApplications(etag) {
     const sortBy = document.getElementById('sort-select').value;
     const order = document.getElementById('order-select').value;
     
-    fetch(`/api/applications?sort=${sortBy}&order=${order}`)
+    const params = new URLSearchParams({
+        sort: sortBy,
+        order: order,
+        format: 'columnar',
+        include: 'history'
+    });
+    // A narrowed list is filtered server-side against the status index;
+    // the follow-up queue spans several statuses, so it filters the full list
+    const statusFilter = activeStatusFilter === FOLLOWUP_FILTER ? 'all' : activeStatusFilter;
+    if (statusFilter !== 'all') {
+        params.append('status', statusFilter);
+    }
+    
+    fetch(`/api/applications?${params}`, { headers: etag ? { 'If-None-Match': etag } : {} })
+        .then(response => {
+            if (response.status === 304) {
+                return null;
+            }
+            return response.json().then(data => ({ data, etag: response.headers.get('ETag') }));
+        })
+        .then(result => {
+            if (!result) {
+                return;
+            }
+            allApplications = decodeColumnar(result.data);
+            loadedStatusFilter = statusFilter;
+            indexApplications();
+            applyFilters();
+            if (statusFilter === 'all') {
+                saveMirror(allApplications, result.etag);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading applications:', error);
+        });
+}
+
+// Comparator matching the server's ordering for the current sort
+function applicationComparator() {
+    const sortBy = document.getElementById('sort-select').value;
+    const direction = document.getElementById('order-select').value === 'asc' ? 1 : -1;
+    return (a, b) => {
+        const left = a[sortBy] || '';
+        const right = b[sortBy] || '';
+        return left < right ? -direction : left > right ? direction : 0;
+    };
+}
+
+// Insert, replace or remove one application in the loaded list
+function upsertApplication(application) {
+    allApplications = allApplications.filter(app => app.id !== application.id);
+    if (loadedStatusFilter === 'all' || application.status === loadedStatusFilter) {
+        // The list is already sorted, so binary search for the insert position
+        const compare = applicationComparator();
+        let low = 0;
+        let high = allApplications.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (compare(allApplications[mid], application) <= 0) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        allApplications.splice(low, 0, application);
+        postToSearchWorker({ type: 'upsert', row: searchRow(application) });
+    } else {
+        postToSearchWorker({ type: 'remove', id: application.id });
+    }
+    mirrorWrite(store => store.put(application));
+}
+
+function removeApplication(appId) {
+    allApplications = allApplications.filter(app => app.id !== appId);
+    postToSearchWorker({ type: 'remove', id: appId });
+    mirrorWrite(store => store.delete(appId));
+}
+
+// Apply a change event from /api/events in place
+function applyChangeEvent(type, event) {
+    if (type === 'created' || type === 'updated') {
+        upsertApplication(event.application);
+    } else if (type === 'deleted') {
+        removeApplication(event.id);
+    } else if (type === 'archived') {
+        // The event only carries a count, so reload the visible list
+        loadApplications();
+    }
+    renderSummary(event.summary);
+    loadFollowups();
+    refreshApplications();
+}
+
+// Fetch the follow-up queue and its count; the queue is refreshed on
+// changes rather than tracked locally because it depends on the clock
+function loadFollowups() {
+    fetch('/api/followups')
         .then(response => response.json())
         .then(data => {
-            allApplications = data;
-            filteredApplications = [...allApplications];
-            renderApplications();
+            followupIds = new Set(data.applications.map(app => app.id));
+            const count = document.getElementById('followup-count');
+            if (count) {
+                count.textContent = data.total;
+            }
+            if (activeStatusFilter === FOLLOWUP_FILTER) {
+                refreshApplications();
+            }
         })
         .catch(error => {
-            console.error('Error loading applications:', error);
+            console.error('Error loading follow-ups:', error);
         });
 }
 
-// Filter applications based on search input
-function applyFilters() {
-    const searchTerm = document.getElementById('search-input').value.toLowerCase().trim();
-    
-    // Start from all apps
-    filteredApplications = [...allApplications];
+function inFollowupFilter(app) {
+    return activeStatusFilter !== FOLLOWUP_FILTER || followupIds.has(app.id);
+}
+
+// Subscribe to live changes made in other tabs and devices, optionally
+// replaying everything after a previously seen event id
+function connectEvents(since) {
+    if (!window.EventSource) {
+        return;
+    }
     
-    // Apply status filter (if not 'all')
-    if (activeStatusFilter !== 'all') {
-        filteredApplications = filteredApplications.filter(app => app.status === activeStatusFilter);
-    }
-
-    // Apply search filter
-    if (searchTerm !== '') {
-        filteredApplications = filteredApplications.filter(app => {
-            return app.company_name.toLowerCase().includes(searchTerm) ||
-                   app.job_role.toLowerCase().includes(searchTerm) ||
-                   app.status.toLowerCase().includes(searchTerm) ||
-                   (app.notes ? app.notes.toLowerCase().includes(searchTerm) : false);
+    const url = since ? `/api/events?last_event_id=${encodeURIComponent(since)}` : '/api/events';
+    const source = new EventSource(url);
+    source.addEventListener('ready', e => {
+        lastEventId = e.lastEventId;
+    });
+    ['created', 'updated', 'deleted', 'archived'].forEach(type => {
+        source.addEventListener(type, e => {
+            lastEventId = e.lastEventId;
+            applyChangeEvent(type, JSON.parse(e.data));
         });
+    });
+    // Sent when this client missed events; reload everything once
+    source.addEventListener('resync', () => {
+        loadSummary();
+        loadApplications();
+    });
+}
+
+// Only the grid rows around the viewport are in the DOM; spacers sized from
+// the measured row height stand in for the rows above and below
+const RENDER_OVERSCAN_ROWS = 3;
+const ESTIMATED_ROW_HEIGHT = 320;
+const SEARCH_DEBOUNCE_MS = 150;
+let windowStart = 0;
+let gridColumns = 1;
+let rowHeight = ESTIMATED_ROW_HEIGHT;
+let gridGap = 20;
+let topSpacer = null;
+let bottomSpacer = null;
+let scrollFrame = null;
+let remeasureGrid = false;
+let searchTimer = null;
+
+// Per-row caches keyed by the row object, so a changed row (a new object from
+// the server) is re-escaped and re-rendered while unchanged rows are reused
+const searchTextCache = new WeakMap();
+const cardNodeCache = new WeakMap();
+
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+function currentSearchTerm() {
+    return document.getElementById('search-input').value.toLowerCase().trim();
+}
+
+function matchesSearch(app, searchTerm) {
+    if (searchTerm === '') {
+        return true;
+    }
+    let text = searchTextCache.get(app);
+    if (text === undefined) {
+        text = [app.company_name, app.job_role, app.status, app.notes || ''].join('\n').toLowerCase();
+        searchTextCache.set(app, text);
+    }
+    return text.includes(searchTerm);
+}
+
+// Search runs in a Web Worker holding a trigram index of the loaded rows
+// (static/search-worker.js). Without workers it falls back to a scan here.
+let searchWorker = null;
+let searchSeq = 0;
+let searchResetsWindow = false;
+
+function startSearchWorker() {
+    if (!window.Worker) {
+        return;
+    }
+    try {
+        searchWorker = new Worker('/static/search-worker.js');
+    } catch (e) {
+        return;
+    }
+    searchWorker.onmessage = e => showSearchResult(e.data);
+    searchWorker.onerror = () => {
+        // Fall back to filtering on the main thread
+        searchWorker = null;
+        applyFilters();
+    };
+}
+
+function postToSearchWorker(message) {
+    if (searchWorker) {
+        searchWorker.postMessage(message);
+    }
+}
+
+function searchRow(app) {
+    return { id: app.id, company_name: app.company_name, job_role: app.job_role, status: app.status, notes: app.notes };
+}
+
+// Rebuild the worker's index after a data load
+function indexApplications() {
+    postToSearchWorker({ type: 'build', rows: allApplications.map(searchRow) });
+}
+
+// Run the current search and status filter; resetWindow scrolls the
+// rendered window back to the first page
+function runFilters(resetWindow) {
+    const searchTerm = currentSearchTerm();
+    // A list loaded for one status is already filtered by the server
+    let status = loadedStatusFilter === 'all' ? activeStatusFilter : 'all';
+    // The follow-up queue is matched against followupIds after the search
+    if (status === FOLLOWUP_FILTER) {
+        status = 'all';
+    }
+    
+    if (searchWorker) {
+        searchResetsWindow = searchResetsWindow || resetWindow;
+        searchWorker.postMessage({ type: 'query', seq: ++searchSeq, term: searchTerm, status: status });
+        return;
     }
     
+    filteredApplications = allApplications.filter(app =>
+        (status === 'all' || app.status === status) && inFollowupFilter(app) && matchesSearch(app, searchTerm));
+    if (resetWindow) {
+        windowStart = 0;
+    }
     renderApplications();
 }
 
+function showSearchResult(result) {
+    // Drop answers to queries that have since been superseded
+    if (result.seq !== searchSeq) {
+        return;
+    }
+    if (result.ids === null) {
+        filteredApplications = allApplications.filter(inFollowupFilter);
+    } else {
+        const matches = new Set(result.ids);
+        filteredApplications = allApplications.filter(app => matches.has(app.id) && inFollowupFilter(app));
+    }
+    if (searchResetsWindow) {
+        windowStart = 0;
+        searchResetsWindow = false;
+    }
+    renderApplications();
+}
+
+// Filter applications based on search input
+function applyFilters() {
+    clearTimeout(searchTimer);
+    runFilters(true);
+}
+
+// Search box handler: filter once typing pauses
+function scheduleFilters() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(applyFilters, SEARCH_DEBOUNCE_MS);
+}
+
+// Re-filter after a single row changed, keeping the scroll window
+function refreshApplications() {
+    runFilters(false);
+}
+
 // Clear search
 function clearSearch() {
     document.getElementById('search-input').value = '';
@@ -115,6 +424,12 @@ function clearSearch() {
 }
 
 // Render applications to the DOM
+//
+// Keyed update of the rendered window: the cards of filteredApplications
+// from windowStart on are put in order between the two spacers by moving
+// existing card nodes, creating nodes only for new or changed rows. Cards
+// outside the window are removed and rebuilt from the cache when scrolled
+// back to, so the DOM holds a few screens of cards however long the list.
 function renderApplications() {
     const grid = document.querySelector('.applications-grid');
     
@@ -126,33 +441,179 @@ function renderApplications() {
                 <a href="/add" class="btn btn-primary">Add New Application</a>
             </div>
         `;
+        windowStart = 0;
         return;
     }
     
-    grid.innerHTML = filteredApplications.map(app => {
-        // Create CSS-safe status class name
-        const statusClass = app.status.toLowerCase()
-            .replace(/\s+/g, '-')
-            .replace(/[()]/g, '')
-            .replace(/\//g, '-');
-        
-        return `
-        <div class="application-card fade-in" data-status="${app.status}" data-app-id="${app.id}">
+    const total = filteredApplications.length;
+    const lastRowStart = Math.floor((total - 1) / gridColumns) * gridColumns;
+    windowStart = Math.min(windowStart - windowStart % gridColumns, lastRowStart);
+    const end = Math.min(total, windowStart + windowRows() * gridColumns);
+    
+    const nodes = [renderSpacer('top')];
+    for (let i = windowStart; i < end; i++) {
+        nodes.push(cardNode(filteredApplications[i]));
+    }
+    nodes.push(renderSpacer('bottom'));
+    
+    let cursor = grid.firstChild;
+    for (const node of nodes) {
+        if (node === cursor) {
+            cursor = cursor.nextSibling;
+        } else {
+            grid.insertBefore(node, cursor);
+        }
+    }
+    // Whatever is left was filtered out, outside the window or stale
+    while (cursor) {
+        const next = cursor.nextSibling;
+        grid.removeChild(cursor);
+        cursor = next;
+    }
+    
+    sizeSpacer(topSpacer, windowStart / gridColumns);
+    sizeSpacer(bottomSpacer, Math.ceil((total - end) / gridColumns));
+    
+    if (measureGrid(grid, nodes.slice(1, -1))) {
+        // The column count changed, so the window and spacers are off
+        renderApplications();
+        return;
+    }
+    shiftWindow();
+}
+
+// Full-width grid item standing in for the rows outside the window
+function renderSpacer(position) {
+    if (position === 'top') {
+        topSpacer = topSpacer || createSpacer();
+        return topSpacer;
+    }
+    bottomSpacer = bottomSpacer || createSpacer();
+    return bottomSpacer;
+}
+
+function createSpacer() {
+    const spacer = document.createElement('div');
+    spacer.className = 'render-spacer';
+    return spacer;
+}
+
+// Each row takes rowHeight including the gap after it; the spacer's own gap is part of that
+function sizeSpacer(spacer, rows) {
+    spacer.style.display = rows > 0 ? '' : 'none';
+    spacer.style.height = rows > 0 ? `${rows * rowHeight - gridGap}px` : '0';
+}
+
+// Grid rows to keep in the DOM: the viewport plus the overscan on both
+// sides, and one more since the window only moves every few rows
+function windowRows() {
+    const viewport = window.innerHeight || ESTIMATED_ROW_HEIGHT * 3;
+    return Math.ceil(viewport / rowHeight) + 2 * RENDER_OVERSCAN_ROWS + 1;
+}
+
+// Read the column count and average row height off the rendered cards;
+// returns true when the column count changed
+function measureGrid(grid, cards) {
+    if (cards.length === 0 || typeof cards[0].offsetTop !== 'number') {
+        return false;
+    }
+    const gap = parseFloat(window.getComputedStyle ? window.getComputedStyle(grid).rowGap : '');
+    if (!isNaN(gap)) {
+        gridGap = gap;
+    }
+    const firstTop = cards[0].offsetTop;
+    let columns = 0;
+    while (columns < cards.length && cards[columns].offsetTop === firstTop) {
+        columns++;
+    }
+    const rows = Math.ceil(cards.length / columns);
+    const last = cards[cards.length - 1];
+    const height = (last.offsetTop + last.offsetHeight - firstTop + gridGap) / rows;
+    if (height > 0) {
+        rowHeight = height;
+    }
+    if (columns !== gridColumns && cards.length > columns) {
+        // Keep the first visible card in the window when the column count changes
+        windowStart = Math.floor(windowStart / columns) * columns;
+        gridColumns = columns;
+        return true;
+    }
+    return false;
+}
+
+// Move the window when the viewport has scrolled at least RENDER_OVERSCAN_ROWS
+// rows away from where it was rendered
+function shiftWindow() {
+    const grid = document.querySelector('.applications-grid');
+    if (!grid || filteredApplications.length === 0 || typeof grid.getBoundingClientRect !== 'function') {
+        return;
+    }
+    const firstVisibleRow = Math.max(0, Math.floor(-grid.getBoundingClientRect().top / rowHeight));
+    const lastRow = Math.floor((filteredApplications.length - 1) / gridColumns);
+    const startRow = Math.min(Math.max(0, firstVisibleRow - RENDER_OVERSCAN_ROWS), lastRow);
+    if (Math.abs(startRow - windowStart / gridColumns) >= RENDER_OVERSCAN_ROWS) {
+        windowStart = startRow * gridColumns;
+        renderApplications();
+    }
+}
+
+// Scroll and resize handler, run at most once per frame. Scrolling only
+// checks the window's position; a resize can change the column count and
+// row height, so the window is rendered and measured again
+function scheduleWindowUpdate(event) {
+    remeasureGrid = remeasureGrid || event.type === 'resize';
+    if (scrollFrame !== null) {
+        return;
+    }
+    scrollFrame = window.requestAnimationFrame(() => {
+        scrollFrame = null;
+        if (remeasureGrid && filteredApplications.length) {
+            remeasureGrid = false;
+            renderApplications();
+        } else {
+            shiftWindow();
+        }
+    });
+}
+
+// Card element for a row, built (and escaped) once per row object
+function cardNode(app) {
+    let node = cardNodeCache.get(app);
+    if (!node) {
+        const template = document.createElement('template');
+        template.innerHTML = renderCard(app).trim();
+        node = template.content.firstElementChild;
+        cardNodeCache.set(app, node);
+    }
+    return node;
+}
+
+// HTML for one application card
+function renderCard(app) {
+    // Create CSS-safe status class name
+    const statusClass = app.status.toLowerCase()
+        .replace(/\s+/g, '-')
+        .replace(/[()]/g, '')
+        .replace(/\//g, '-');
+    const status = escapeHtml(app.status);
+    
+    return `
+        <div class="application-card fade-in" data-status="${status}" data-app-id="${app.id}">
             <div class="card-header">
-                <h3>${app.company_name}</h3>
-                <span class="status-badge status-${statusClass}">
-                    ${app.status}
+                <h3>${escapeHtml(app.company_name)}</h3>
+                <span class="status-badge status-${escapeHtml(statusClass)}">
+                    ${status}
                 </span>
             </div>
             
             <div class="card-content">
-                <p><strong>Position:</strong> ${app.job_role}</p>
-                <p><strong>Applied:</strong> ${app.applied_date}</p>
-                ${app.url ? `<p><strong>URL:</strong> <a href="${app.url}" target="_blank" class="url-link">View Job Posting</a></p>` : ''}
+                <p><strong>Position:</strong> ${escapeHtml(app.job_role)}</p>
+                <p><strong>Applied:</strong> ${escapeHtml(app.applied_date)}</p>
+                ${app.url ? `<p><strong>URL:</strong> <a href="${escapeHtml(app.url)}" target="_blank" class="url-link">View Job Posting</a></p>` : ''}
                 ${app.notes && app.notes.trim() !== '' ? `
                 <div class="notes-section">
                     <p><strong>Notes:</strong></p>
-                    <p class="notes-text">${app.notes.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')}</p>
+                    <p class="notes-text">${escapeHtml(app.notes)}</p>
                 </div>` : ''}
                 ${app.status_history && app.status_history.length > 0 ? `
                 <div class="status-history-section">
@@ -160,14 +621,14 @@ function renderApplications() {
                     <div class="status-history">
                         ${app.status_history.map((entry, idx) => `
                             <div class="history-entry">
-                                <span class="history-status">${entry.status.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')}</span>
-                                <span class="history-date">${entry.changed_at}</span>
+                                <span class="history-status">${escapeHtml(entry.status)}</span>
+                                <span class="history-date">${escapeHtml(entry.changed_at)}</span>
                                 ${idx < app.status_history.length - 1 ? '<span class="history-arrow">→</span>' : ''}
                             </div>
                         `).join('')}
                     </div>
                 </div>` : ''}
-                <p><strong>Last Updated:</strong> ${app.last_updated}</p>
+                <p><strong>Last Updated:</strong> ${escapeHtml(app.last_updated)}</p>
             </div>
             
             <div class="card-actions">
@@ -176,7 +637,6 @@ function renderApplications() {
             </div>
         </div>
     `;
-    }).join('');
 }
 
 // Sort functionality
@@ -187,19 +647,18 @@ function sortApplications() {
 // Delete application functionality
 function deleteApplication(appId) {
     if (confirm('Are you sure you want to delete this job application? This action cannot be undone.')) {
-        fetch(`/delete/${appId}`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            }
-        })
-        .then(response => response.json())
+        const deleted = allApplications.find(app => app.id === appId);
+        sendMutation(`/delete/${appId}`)
         .then(result => {
             if (result.success) {
-                showNotification('Application deleted successfully!');
-                // Refresh data
-                loadSummary();
-                loadApplications();
+                showNotification(result.queued ? 'Offline: the delete will be sent when you reconnect' : 'Application deleted successfully!');
+                removeApplication(appId);
+                refreshApplications();
+                if (result.queued) {
+                    applySummaryDelta(deleted ? { total: -1, by_status: { [deleted.status]: -1 } } : { total: 0, by_status: {} });
+                } else {
+                    applySummaryDelta(result.summary_delta);
+                }
             } else {
                 showNotification('Error deleting application: ' + result.message, 'error');
             }
@@ -227,20 +686,23 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
             
-            fetch('/add', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(data)
-            })
-            .then(response => response.json())
+            sendMutation('/add', data)
             .then(result => {
                 if (result.success) {
-                    showNotification('Job application added successfully!');
+                    recordPendingMutation(result);
+                    showNotification(result.queued ? 'Offline: the application will be added when you reconnect' : 'Job application added successfully!');
+                    // Give the user longer to read a duplicate warning before leaving
+                    let redirectDelay = 1000;
+                    if (result.duplicates && result.duplicates.length > 0) {
+                        const names = result.duplicates
+                            .map(dup => `${dup.company_name} - ${dup.job_role} (${dup.applied_date})`)
+                            .join(', ');
+                        showNotification(`Possible duplicate of: ${names}`, 'error');
+                        redirectDelay = 3000;
+                    }
                     setTimeout(() => {
                         window.location.href = '/';
-                    }, 1000);
+                    }, redirectDelay);
                 } else {
                     showNotification('Error adding application: ' + result.message, 'error');
                 }
@@ -274,30 +736,334 @@ fadeOutStyle.textContent = `
 `;
 document.head.appendChild(fadeOutStyle);
 
+// Remember an add/edit response so the dashboard can apply it without a reload
+function recordPendingMutation(result) {
+    if (result.queued) {
+        // Not on the server yet; it shows up once the outbox is replayed
+        return;
+    }
+    try {
+        const pending = JSON.parse(sessionStorage.getItem(PENDING_KEY) || '[]');
+        pending.push({ application: result.application, summary_delta: result.summary_delta });
+        sessionStorage.setItem(PENDING_KEY, JSON.stringify(pending));
+    } catch (e) {
+        // Storage disabled or full; the dashboard does a full load instead
+        sessionStorage.removeItem(SNAPSHOT_KEY);
+    }
+}
+
+// Save the dashboard state when navigating away (e.g. to the add/edit forms)
+function saveDashboardSnapshot() {
+    if (!lastEventId) {
+        return;
+    }
+    try {
+        sessionStorage.setItem(SNAPSHOT_KEY, JSON.stringify({
+            savedAt: Date.now(),
+            sort: document.getElementById('sort-select').value,
+            order: document.getElementById('order-select').value,
+            statusFilter: activeStatusFilter,
+            loadedStatusFilter: loadedStatusFilter,
+            lastEventId: lastEventId,
+            summary: summaryCounts,
+            applications: allApplications
+        }));
+        sessionStorage.removeItem(PENDING_KEY);
+    } catch (e) {
+        sessionStorage.removeItem(SNAPSHOT_KEY);
+    }
+}
+
+// Render from a saved snapshot plus pending add/edit results, then replay
+// changes made elsewhere from /api/events. Returns false if a full load is needed.
+function restoreDashboardSnapshot() {
+    let snapshot;
+    let pending;
+    try {
+        snapshot = JSON.parse(sessionStorage.getItem(SNAPSHOT_KEY));
+        pending = JSON.parse(sessionStorage.getItem(PENDING_KEY) || '[]');
+    } catch (e) {
+        snapshot = null;
+    }
+    sessionStorage.removeItem(SNAPSHOT_KEY);
+    sessionStorage.removeItem(PENDING_KEY);
+    
+    if (!snapshot ||
+        Date.now() - snapshot.savedAt > SNAPSHOT_MAX_AGE_MS ||
+        snapshot.sort !== document.getElementById('sort-select').value ||
+        snapshot.order !== document.getElementById('order-select').value) {
+        return false;
+    }
+    
+    allApplications = snapshot.applications;
+    activeStatusFilter = snapshot.statusFilter;
+    loadedStatusFilter = snapshot.loadedStatusFilter || snapshot.statusFilter;
+    lastEventId = snapshot.lastEventId;
+    updateSummaryActiveState();
+    renderSummary(snapshot.summary);
+    pending.forEach(mutation => {
+        if (mutation.application) {
+            upsertApplication(mutation.application);
+        }
+        applySummaryDelta(mutation.summary_delta);
+    });
+    indexApplications();
+    applyFilters();
+    // Replays our own writes too; upserts are idempotent and the summary is absolute
+    connectEvents(lastEventId);
+    return true;
+}
+
+// IndexedDB mirror of the full application list (with history), so a visit
+// renders from local data and then revalidates with If-None-Match. The
+// 'outbox' store holds writes made while offline.
+const MIRROR_DB = 'job-tracker';
+let mirrorPromise = null;
+
+function openMirror() {
+    if (!mirrorPromise) {
+        mirrorPromise = new Promise((resolve, reject) => {
+            if (!window.indexedDB) {
+                reject(new Error('IndexedDB is not available'));
+                return;
+            }
+            const request = indexedDB.open(MIRROR_DB, 1);
+            request.onupgradeneeded = () => {
+                const db = request.result;
+                db.createObjectStore('applications', { keyPath: 'id' });
+                db.createObjectStore('meta');
+                db.createObjectStore('outbox', { keyPath: 'seq', autoIncrement: true });
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    }
+    return mirrorPromise;
+}
+
+// Run fn(transaction) and resolve with its return value once the transaction commits
+function mirrorTransaction(stores, mode, fn) {
+    return openMirror().then(db => new Promise((resolve, reject) => {
+        const tx = db.transaction(stores, mode);
+        const result = fn(tx);
+        tx.oncomplete = () => resolve(result);
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+    }));
+}
+
+// Best-effort single-row update of the mirror
+function mirrorWrite(fn) {
+    mirrorTransaction(['applications'], 'readwrite', tx => fn(tx.objectStore('applications')))
+        .catch(() => {});
+}
+
+function saveMirror(applications, etag) {
+    mirrorTransaction(['applications', 'meta'], 'readwrite', tx => {
+        const store = tx.objectStore('applications');
+        store.clear();
+        applications.forEach(app => store.put(app));
+        tx.objectStore('meta').put({ etag: etag, savedAt: Date.now() }, 'applications');
+    }).catch(error => console.error('Error saving offline copy:', error));
+}
+
+function readMirror() {
+    return mirrorTransaction(['applications', 'meta'], 'readonly', tx => {
+        const mirrored = {};
+        tx.objectStore('applications').getAll().onsuccess = e => { mirrored.rows = e.target.result; };
+        tx.objectStore('meta').get('applications').onsuccess = e => { mirrored.meta = e.target.result; };
+        return mirrored;
+    });
+}
+
+// Counts for the summary header, from a full list
+function summarizeApplications(applications) {
+    const byStatus = {};
+    applications.forEach(app => {
+        byStatus[app.status] = (byStatus[app.status] || 0) + 1;
+    });
+    return { total: applications.length, by_status: byStatus };
+}
+
+// Render the mirrored list straight away, then revalidate it with the server
+function startFromMirror() {
+    readMirror()
+        .catch(() => ({}))
+        .then(mirrored => {
+            let etag = null;
+            if (mirrored.meta && mirrored.rows) {
+                allApplications = mirrored.rows.sort(applicationComparator());
+                loadedStatusFilter = 'all';
+                renderSummary(summarizeApplications(allApplications));
+                indexApplications();
+                applyFilters();
+                etag = mirrored.meta.etag;
+            }
+            loadSummary();
+            loadApplications(etag);
+            connectEvents();
+        });
+}
+
+// POST a write to /add, /edit/<id> or /delete/<id>. If the network is down
+// the write is queued in the outbox and resolves as {success, queued: true}.
+function sendMutation(url, data) {
+    return fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(data || {})
+    })
+    .then(
+        response => response.json(),
+        () => mirrorTransaction(['outbox'], 'readwrite', tx => {
+            tx.objectStore('outbox').add({ url: url, data: data || {}, queuedAt: Date.now() });
+        }).then(() => ({ success: true, queued: true }))
+    );
+}
+
+// Replay queued writes in order through the same routes
+let flushingOutbox = false;
+
+function flushOutbox() {
+    if (flushingOutbox || navigator.onLine === false) {
+        return;
+    }
+    flushingOutbox = true;
+    let replayed = 0;
+    
+    mirrorTransaction(['outbox'], 'readonly', tx => {
+        const queued = {};
+        tx.objectStore('outbox').getAll().onsuccess = e => { queued.entries = e.target.result; };
+        return queued;
+    })
+    .then(queued => queued.entries.reduce((chain, entry) => chain.then(() =>
+        fetch(entry.url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(entry.data)
+        })
+        .then(response => {
+            if (response.redirected) {
+                // Logged out: keep the queue until the next visit
+                throw new Error('Not logged in');
+            }
+            return response.json().catch(() => ({ success: false, message: `HTTP ${response.status}` }));
+        })
+        .then(result => {
+            // Only network and login failures are retried; a rejected write is dropped
+            if (result.success) {
+                replayed++;
+            } else {
+                showNotification(`Offline change to ${entry.url} was rejected: ${result.message}`, 'error');
+            }
+            return mirrorTransaction(['outbox'], 'readwrite', tx => tx.objectStore('outbox').delete(entry.seq));
+        })
+    ), Promise.resolve()))
+    .catch(() => {
+        // Still offline (or no IndexedDB); retried on the next 'online' event
+    })
+    .then(() => {
+        flushingOutbox = false;
+        if (replayed > 0) {
+            showNotification(`Synced ${replayed} offline change(s)`);
+        }
+    });
+}
+
+// Drop cached pages and data when logging out
+function clearOfflineData() {
+    if (window.indexedDB) {
+        indexedDB.deleteDatabase(MIRROR_DB);
+    }
+    if (window.caches) {
+        caches.keys().then(keys => keys.forEach(key => caches.delete(key)));
+    }
+    sessionStorage.removeItem(SNAPSHOT_KEY);
+    sessionStorage.removeItem(PENDING_KEY);
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.register('/service-worker.js').catch(error => {
+            console.error('Service worker registration failed:', error);
+        });
+    }
+    window.addEventListener('online', flushOutbox);
+    document.querySelectorAll('a[href="/logout"]').forEach(link => {
+        link.addEventListener('click', clearOfflineData);
+    });
+});
+
 // Initialize page
 document.addEventListener('DOMContentLoaded', function() {
     // Load summary and applications on main page
     if (window.location.pathname === '/') {
-        loadSummary();
-        loadApplications();
-    }
-    
-    // Add data attributes to cards for easier selection
-    const cards = document.querySelectorAll('.application-card');
-    cards.forEach(card => {
-        const editLink = card.querySelector('a[href*="/edit/"]');
-        if (editLink) {
-            const appId = editLink.href.match(/\/edit\/(\d+)/)[1];
-            card.setAttribute('data-app-id', appId);
+        startSearchWorker();
+        if (!restoreDashboardSnapshot()) {
+            startFromMirror();
         }
+        loadFollowups();
+        window.addEventListener('pagehide', saveDashboardSnapshot);
+        window.addEventListener('scroll', scheduleWindowUpdate, { passive: true });
+        window.addEventListener('resize', scheduleWindowUpdate);
+        flushOutbox();
+    }
+});
+
+// Suggest company names and roles already in use as the user types,
+// from /api/autocomplete into the input's <datalist>
+const AUTOCOMPLETE_DEBOUNCE_MS = 100;
+
+function attachAutocomplete(input) {
+    const list = document.getElementById(input.getAttribute('list'));
+    let timer = null;
+    let controller = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            // Only the latest keystroke's answer matters
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            const params = new URLSearchParams({ field: input.name, prefix: input.value.trim() });
+            fetch(`/api/autocomplete?${params}`, { signal: controller.signal })
+                .then(response => response.json())
+                .then(data => {
+                    list.innerHTML = data.suggestions
+                        .map(item => `<option value="${escapeHtml(item.value)}"></option>`)
+                        .join('');
+                })
+                .catch(error => {
+                    if (error.name !== 'AbortError') {
+                        console.error('Error loading suggestions:', error);
+                    }
+                });
+        }, AUTOCOMPLETE_DEBOUNCE_MS);
     });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('#application-form input[list]').forEach(attachAutocomplete);
 });
 
 // Set status filter and update UI
 function setStatusFilter(status) {
     activeStatusFilter = status || 'all';
     updateSummaryActiveState();
-    applyFilters();
+    if (activeStatusFilter === FOLLOWUP_FILTER) {
+        loadFollowups();
+    }
+    // With the full list loaded the status filter is answered from the search index
+    if (loadedStatusFilter === 'all') {
+        applyFilters();
+    } else {
+        loadApplications();
+    }
 }
 
 function updateSummaryActiveState() {
@@ -314,6 +1080,7 @@ function updateSummaryActiveState() {
 
 // Make functions globally accessible for inline event handlers
 window.applyFilters = applyFilters;
+window.scheduleFilters = scheduleFilters;
 window.clearSearch = clearSearch;
 window.setStatusFilter = setStatusFilter;
 
@@ -0,0 +1,195 @@
+// Job Application Tracker search index (runs in a Web Worker)
+//
+// The dashboard posts the loaded applications once per data load; the worker
+// lowercases them and builds trigram postings lists so each keystroke is
+// answered by intersecting a few sorted arrays instead of scanning every row
+// on the main thread.
+//
+// Messages in:
+//   {type: 'build', rows: [{id, company_name, job_role, status, notes}]}
+//   {type: 'upsert', row}           one row added or changed
+//   {type: 'remove', id}
+//   {type: 'query', seq, term, status}   status is optional ('all' = any)
+// Messages out:
+//   {type: 'result', seq, ids}      matching ids in load order, null = all rows
+
+// Rows changed after a build are kept in a small overlay and scanned
+// linearly; past this many the index is rebuilt
+const MAX_OVERLAY = 1000;
+
+function rowText(row) {
+    return [row.company_name, row.job_role, row.status, row.notes || ''].join('\n').toLowerCase();
+}
+
+function trigrams(text) {
+    const grams = new Set();
+    for (let i = 0; i + 3 <= text.length; i++) {
+        grams.add(text.substr(i, 3));
+    }
+    return grams;
+}
+
+// Intersect ascending Int32Arrays, smallest first
+function intersect(lists) {
+    lists.sort((a, b) => a.length - b.length);
+    let result = lists[0];
+    for (let i = 1; i < lists.length && result.length > 0; i++) {
+        const other = lists[i];
+        const next = [];
+        let j = 0;
+        for (let k = 0; k < result.length; k++) {
+            const value = result[k];
+            while (j < other.length && other[j] < value) {
+                j++;
+            }
+            if (j === other.length) {
+                break;
+            }
+            if (other[j] === value) {
+                next.push(value);
+            }
+        }
+        result = next;
+    }
+    return result;
+}
+
+class SearchIndex {
+    constructor(rows = []) {
+        this.build(rows);
+    }
+
+    build(rows) {
+        this.ids = new Int32Array(rows.length);
+        this.texts = new Array(rows.length);
+        this.statuses = new Array(rows.length);
+        this.position = new Map();
+        const grams = new Map();
+        const statuses = new Map();
+
+        rows.forEach((row, i) => {
+            // Rows carried over from a previous build are already lowercased
+            const text = row.text !== undefined ? row.text : rowText(row);
+            this.ids[i] = row.id;
+            this.texts[i] = text;
+            this.statuses[i] = row.status;
+            this.position.set(row.id, i);
+            for (let k = 0; k + 3 <= text.length; k++) {
+                const gram = text.substr(k, 3);
+                let list = grams.get(gram);
+                if (!list) {
+                    list = [];
+                    grams.set(gram, list);
+                }
+                // A trigram repeated within the row is posted once
+                if (list[list.length - 1] !== i) {
+                    list.push(i);
+                }
+            }
+            let list = statuses.get(row.status);
+            if (!list) {
+                list = [];
+                statuses.set(row.status, list);
+            }
+            list.push(i);
+        });
+
+        this.grams = new Map();
+        grams.forEach((list, gram) => this.grams.set(gram, Int32Array.from(list)));
+        this.statusPostings = new Map();
+        statuses.forEach((list, status) => this.statusPostings.set(status, Int32Array.from(list)));
+
+        // Overlay: built positions that are stale, and rows changed since the build
+        this.removed = new Set();
+        this.overlay = new Map();
+    }
+
+    // Current rows in load order, for rebuilding
+    rows() {
+        const rows = [];
+        for (let i = 0; i < this.ids.length; i++) {
+            if (!this.removed.has(i)) {
+                rows.push({ id: this.ids[i], text: this.texts[i], status: this.statuses[i] });
+            }
+        }
+        this.overlay.forEach(row => rows.push(row));
+        return rows;
+    }
+
+    upsert(row) {
+        this.remove(row.id);
+        this.overlay.set(row.id, { id: row.id, text: rowText(row), status: row.status });
+        this.compact();
+    }
+
+    remove(id) {
+        const i = this.position.get(id);
+        if (i !== undefined) {
+            this.removed.add(i);
+            this.position.delete(id);
+        }
+        this.overlay.delete(id);
+    }
+
+    compact() {
+        if (this.overlay.size + this.removed.size > MAX_OVERLAY) {
+            this.build(this.rows());
+        }
+    }
+
+    // Ids matching a search term and status; null when nothing is filtered
+    query(term, status) {
+        term = (term || '').toLowerCase().trim();
+        const byStatus = status && status !== 'all';
+        if (term === '' && !byStatus) {
+            return null;
+        }
+
+        const lists = [];
+        if (byStatus) {
+            lists.push(this.statusPostings.get(status) || new Int32Array(0));
+        }
+        trigrams(term).forEach(gram => lists.push(this.grams.get(gram) || new Int32Array(0)));
+
+        const ids = [];
+        if (lists.length > 0) {
+            // Trigrams can match out of order ("abcd" has "abc" and "bcd" but
+            // so does "bcd abc"), so candidates are verified against the text
+            intersect(lists).forEach(i => {
+                if (!this.removed.has(i) && this.texts[i].includes(term)) {
+                    ids.push(this.ids[i]);
+                }
+            });
+        } else {
+            // One or two characters: no trigram to look up, scan the lowercased texts
+            for (let i = 0; i < this.ids.length; i++) {
+                if (!this.removed.has(i) && this.texts[i].includes(term)) {
+                    ids.push(this.ids[i]);
+                }
+            }
+        }
+        this.overlay.forEach(row => {
+            if ((!byStatus || row.status === status) && row.text.includes(term)) {
+                ids.push(row.id);
+            }
+        });
+        return ids;
+    }
+}
+
+// Only wire up messaging when running as a worker
+if (typeof self !== 'undefined' && typeof importScripts === 'function') {
+    let index = new SearchIndex();
+    self.onmessage = e => {
+        const message = e.data;
+        if (message.type === 'build') {
+            index = new SearchIndex(message.rows);
+        } else if (message.type === 'upsert') {
+            index.upsert(message.row);
+        } else if (message.type === 'remove') {
+            index.remove(message.id);
+        } else if (message.type === 'query') {
+            self.postMessage({ type: 'result', seq: message.seq, ids: index.query(message.term, message.status) });
+        }
+    };
+}
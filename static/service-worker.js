@@ -0,0 +1,74 @@
+// Job Application Tracker service worker
+//
+// Keeps the app shell available offline: pages are fetched network-first and
+// the last good copy is cached; static assets are served from the cache and
+// refreshed in the background. API requests and form posts are not touched;
+// the dashboard keeps its own IndexedDB mirror of the data and queues writes
+// made while offline (see static/script.js).
+
+const CACHE = 'job-tracker-shell-v1';
+const STATIC_ASSETS = [
+    '/static/style.css',
+    '/static/script.js',
+    '/static/search-worker.js',
+];
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(CACHE)
+            .then(cache => cache.addAll(STATIC_ASSETS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+// Pages: network first, so the dashboard is never older than it has to be
+function fromNetworkFirst(request) {
+    return fetch(request)
+        .then(response => {
+            // Redirects (e.g. to /login) must not replace a cached page
+            if (response.ok && !response.redirected) {
+                const copy = response.clone();
+                caches.open(CACHE).then(cache => cache.put(request, copy));
+            }
+            return response;
+        })
+        .catch(() => caches.match(request).then(cached => cached || caches.match('/')));
+}
+
+// Static assets: answer from the cache and update it for next time
+function fromCacheRevalidating(request) {
+    return caches.open(CACHE).then(cache => cache.match(request).then(cached => {
+        const refresh = fetch(request).then(response => {
+            if (response.ok) {
+                cache.put(request, response.clone());
+            }
+            return response;
+        });
+        if (cached) {
+            refresh.catch(() => {});
+            return cached;
+        }
+        return refresh;
+    }));
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+    if (url.pathname.startsWith('/static/')) {
+        event.respondWith(fromCacheRevalidating(request));
+    } else if (request.mode === 'navigate' && !['/login', '/logout'].includes(url.pathname)) {
+        event.respondWith(fromNetworkFirst(request));
+    }
+});
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Template precompilation and page caching for Job Application Tracker.
+
+Jinja parses and compiles each template the first time a process renders
+it, which on serverless lands on a user's first request. Running this module
+at build or deploy time compiles every template into Python modules (plus
+their bytecode) under ``templates_compiled/``; ``use_precompiled`` then loads
+those through a ``ModuleLoader`` without parsing anything. A manifest of
+template hashes is written alongside, and a stale build (templates edited
+since) is ignored in favour of the source templates.
+
+``PageCache`` keeps the rendered HTML of pages that only depend on a small
+key, such as ``/login`` and the ``/add`` form. Flash messages are the only
+part rendered per request: the page is rendered once with a slot in their
+place, and ``_flashes.html`` fills the slot.
+
+Usage:
+    python templating.py [--target templates_compiled]
+"""
+
+import argparse
+import compileall
+import hashlib
+import json
+import os
+import threading
+
+from flask import get_flashed_messages, render_template, request
+from jinja2 import ChoiceLoader, ModuleLoader
+from markupsafe import Markup
+
+COMPILED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates_compiled')
+MANIFEST = 'manifest.json'
+
+# Stands in for the flash messages while a cached page is rendered
+FLASH_SLOT = '<!--flashes-->'
+
+def template_hashes(app):
+    """sha256 of every template source, by template name"""
+    # Flask's own loader, which reads sources even once use_precompiled has run
+    loader = app.create_global_jinja_loader()
+    hashes = {}
+    for name in loader.list_templates():
+        source, _, _ = loader.get_source(app.jinja_env, name)
+        hashes[name] = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    return hashes
+
+def compile_templates(app, target=COMPILED_DIR):
+    """Compile every template of ``app`` into modules under ``target``; returns their names"""
+    hashes = template_hashes(app)
+    env = app.jinja_env.overlay(loader=app.create_global_jinja_loader())
+    env.compile_templates(target, zip=None, ignore_errors=False)
+    # Ship bytecode too, so loading a template does not even compile Python
+    compileall.compile_dir(target, quiet=1)
+    with open(os.path.join(target, MANIFEST), 'w') as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+    return sorted(hashes)
+
+def use_precompiled(app, target=COMPILED_DIR):
+    """Load templates from ``target`` when it matches the current sources
+
+    Templates missing from the build still load from source. Returns whether
+    the precompiled templates are in use.
+    """
+    try:
+        with open(os.path.join(target, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if manifest != template_hashes(app):
+        return False
+    app.jinja_env.loader = ChoiceLoader([ModuleLoader(target), app.jinja_env.loader])
+    return True
+
+class PageCache:
+    """Per-process cache of rendered pages, with flash messages rendered per request"""
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self._pages = {}
+
+    @property
+    def enabled(self):
+        # In debug the templates reload on edit, so the cache would serve stale pages
+        return not self.app.jinja_env.auto_reload
+
+    def render(self, name, key=(), **context):
+        """Render template ``name`` once per ``key``; ``context`` must be fixed for a key
+
+        The template places ``{{ flashes }}`` where flash messages go.
+        """
+        if not self.enabled:
+            return render_template(name, flashes=self.flashes(), **context)
+
+        cache_key = (name, request.script_root, key)
+        parts = self._pages.get(cache_key)
+        if parts is None:
+            parts = render_template(name, flashes=Markup(FLASH_SLOT), **context).split(FLASH_SLOT)
+            with self._lock:
+                self._pages[cache_key] = parts
+        if len(parts) == 1:
+            return parts[0]
+        return str(self.flashes()).join(parts)
+
+    def flashes(self):
+        # Skip the partial entirely on the common path with nothing flashed
+        if not get_flashed_messages():
+            return Markup('')
+        return Markup(render_template('_flashes.html'))
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', default=COMPILED_DIR)
+    args = parser.parse_args()
+
+    from app import app
+    names = compile_templates(app, args.target)
+    print(f"Compiled {len(names)} templates into {args.target}: {', '.join(names)}")
+
+if __name__ == '__main__':
+    main()
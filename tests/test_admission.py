@@ -0,0 +1,136 @@
+"""Tests for admission control and load shedding."""
+
+import threading
+import time
+import pytest
+import app as app_module
+from admission import AdmissionController, CostClass, Overloaded
+from conftest import insert_test_data
+
+def test_cost_class_sheds_when_queue_is_full():
+    """Test that a request beyond limit plus queue is rejected immediately."""
+    limiter = CostClass('heavy', limit=1, queue=0, max_wait=5)
+    limiter.acquire()
+
+    start = time.monotonic()
+    with pytest.raises(Overloaded) as excinfo:
+        limiter.acquire()
+    assert time.monotonic() - start < 1
+    assert excinfo.value.reason == 'queue full'
+    assert excinfo.value.retry_after >= 1
+    assert limiter.status()['shed_queue_full'] == 1
+
+def test_cost_class_sheds_after_max_wait():
+    """Test that a queued request gives up after max_wait."""
+    limiter = CostClass('heavy', limit=1, queue=1, max_wait=0.05)
+    limiter.acquire()
+
+    with pytest.raises(Overloaded) as excinfo:
+        limiter.acquire()
+    assert excinfo.value.reason == 'wait timed out'
+
+    status = limiter.status()
+    assert status['queued'] == 1
+    assert status['shed_timeout'] == 1
+    assert status['waiting'] == 0
+    assert status['active'] == 1
+
+def test_cost_class_admits_waiter_on_release():
+    """Test that a queued request takes the slot freed by a finishing one."""
+    limiter = CostClass('heavy', limit=1, queue=1, max_wait=5)
+    limiter.acquire()
+    admitted = threading.Event()
+
+    def wait_for_slot():
+        limiter.acquire()
+        admitted.set()
+
+    waiter = threading.Thread(target=wait_for_slot)
+    waiter.start()
+    while limiter.status()['waiting'] == 0:
+        time.sleep(0.001)
+    assert not admitted.is_set()
+
+    limiter.release(0.2)
+    waiter.join(timeout=5)
+    assert admitted.is_set()
+    status = limiter.status()
+    assert status['active'] == 1
+    assert status['admitted'] == 2
+    assert status['service_time_ms'] == 200.0
+
+def test_retry_after_grows_with_queue():
+    """Test that the Retry-After hint scales with service time and queue depth."""
+    limiter = CostClass('heavy', limit=2, queue=10, max_wait=1)
+    assert limiter.retry_after() == 1
+    limiter.service_time = 3.0
+    limiter.waiting = 3
+    assert limiter.retry_after() == 6
+
+def test_controller_counts_per_endpoint():
+    """Test that the decorator records admitted and shed requests per view."""
+    controller = AdmissionController({'heavy': (1, 0, 0)})
+
+    @controller.limit('heavy')
+    def view(inner=None):
+        return inner() if inner else 'ok'
+
+    assert view() == 'ok'
+    with pytest.raises(Overloaded):
+        view(inner=view)
+    assert controller.status()['endpoints']['view'] == {'class': 'heavy', 'admitted': 2, 'shed': 1}
+    assert controller.status()['classes']['heavy']['active'] == 0
+
+    with pytest.raises(ValueError):
+        controller.limit('unknown')
+
+def test_disabled_controller_admits_everything():
+    """Test that ADMISSION_CONTROL=0 style controllers never shed."""
+    controller = AdmissionController({'heavy': (0, 0, 0)}, enabled=False)
+
+    @controller.limit('heavy')
+    def view():
+        return 'ok'
+
+    assert view() == 'ok'
+
+def test_overloaded_endpoint_returns_503(client, sample_data, monkeypatch):
+    """Test that a saturated class answers 503 with Retry-After, other classes keep serving."""
+    insert_test_data(client, [sample_data])
+    heavy = app_module.admission.classes['heavy']
+    monkeypatch.setattr(heavy, 'limit', 0)
+    monkeypatch.setattr(heavy, 'queue', 0)
+
+    response = client.get('/api/applications')
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    data = response.get_json()
+    assert data['success'] is False
+    assert 'heavy' in data['message']
+
+    assert client.get('/api/summary').status_code == 200
+    assert client.post('/edit/1', json=sample_data, content_type='application/json').status_code == 200
+
+def test_admin_admission_reports_state(client, monkeypatch):
+    """Test that /admin/admission reports classes, endpoints and shed counts."""
+    shed_before = app_module.admission.status()['endpoints']['api_export']['shed']
+    heavy = app_module.admission.classes['heavy']
+    monkeypatch.setattr(heavy, 'limit', 0)
+    monkeypatch.setattr(heavy, 'queue', 0)
+    assert client.get('/api/export?table=job_applications').status_code == 503
+
+    data = client.get('/admin/admission').get_json()
+    assert data['enabled'] is True
+    assert set(data['classes']) == {'heavy', 'light', 'write'}
+    assert data['classes']['heavy']['limit'] == 0
+    assert data['endpoints']['api_export']['class'] == 'heavy'
+    assert data['endpoints']['api_export']['shed'] == shed_before + 1
+    assert data['endpoints']['api_summary']['class'] == 'light'
+    assert data['endpoints']['add_application']['class'] == 'write'
+    assert 'api_events' not in data['endpoints']
+
+def test_admin_admission_requires_login(client):
+    """Test that the admission report is behind login."""
+    client.get('/logout')
+    response = client.get('/admin/admission')
+    assert response.status_code == 302
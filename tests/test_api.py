@@ -10,6 +10,19 @@ def test_index_page(client):
     assert response.status_code == 200
     assert b'Job Application Tracker' in response.data
 
+def test_index_page_leaves_cards_to_the_client(client, sample_data, monkeypatch):
+    """Test that the dashboard shell neither reads nor renders application rows."""
+    import app as app_module
+    insert_test_data(client, [sample_data])
+
+    def no_list(*args, **kwargs):
+        raise AssertionError('/ read the application rows')
+    monkeypatch.setattr(app_module.repository, 'list', no_list)
+    page = client.get('/').data.decode()
+    assert 'class="applications-grid"' in page
+    assert 'application-card' not in page
+    assert 'Test Company' not in page
+
 def test_add_application_get(client):
     """Test GET request to add application page."""
     response = client.get('/add')
@@ -112,9 +125,9 @@ def test_delete_application_nonexistent(client):
     """Test DELETE request for non-existent application."""
     response = client.post('/delete/999')
     
-    assert response.status_code == 200
+    assert response.status_code == 404
     data = json.loads(response.data)
-    assert data['success'] is True  # Should still return success
+    assert data['success'] is False
 
 def test_api_applications_endpoint(client, multiple_applications):
     """Test the API applications endpoint."""
@@ -396,4 +409,297 @@ def test_status_history_multiple_changes(client, sample_data):
     assert apps[0]['status_history'][0]['status'] == 'Applied'
     assert apps[0]['status_history'][1]['status'] == 'Interview 1'
     assert apps[0]['status_history'][2]['status'] == 'Interview 2'
-    assert apps[0]['status_history'][3]['status'] == 'Offer'
\ No newline at end of file
+    assert apps[0]['status_history'][3]['status'] == 'Offer'
+
+def decode_columnar(payload):
+    """Rebuild row objects from a columnar payload (mirrors decodeColumnar in script.js)."""
+    columns = payload['columns']
+    statuses = payload['dictionaries']['status']
+    history = payload.get('status_history')
+    rows = []
+    for i in range(payload['count']):
+        row = {name: values[i] for name, values in columns.items()}
+        if 'status' in row:
+            row['status'] = statuses[row['status']]
+        if 'status_history' in payload:
+            start, end = history['offsets'][i], history['offsets'][i + 1]
+            row['status_history'] = [
+                {'status': statuses[history['status'][j]], 'changed_at': history['changed_at'][j]}
+                for j in range(start, end)
+            ]
+        rows.append(row)
+    return rows
+
+def test_api_applications_columnar_matches_rows(client, multiple_applications):
+    """Test that the columnar format decodes to the same data as the row format."""
+    insert_test_data(client, multiple_applications)
+    client.post('/edit/1', json=dict(multiple_applications[0], status='Interview 1'),
+                content_type='application/json')
+    
+    rows = json.loads(client.get('/api/applications?sort=company_name&order=asc').data)
+    response = client.get('/api/applications?sort=company_name&order=asc&format=columnar')
+    assert response.status_code == 200
+    
+    payload = json.loads(response.data)
+    assert payload['format'] == 'columnar'
+    assert payload['count'] == 4
+    assert len(payload['status_history']['offsets']) == 5
+    assert decode_columnar(payload) == rows
+
+def test_api_applications_columnar_dictionary_encodes_status(client):
+    """Test that each status string appears once in the columnar payload."""
+    for i in range(20):
+        client.post('/add', json={
+            'company_name': f'Company {i}',
+            'job_role': 'Engineer',
+            'applied_date': '2024-01-01',
+            'status': 'Denied without interview (visa related)'
+        }, content_type='application/json')
+    
+    rows_response = client.get('/api/applications')
+    columnar_response = client.get('/api/applications?format=columnar')
+    payload = json.loads(columnar_response.data)
+    
+    assert payload['dictionaries']['status'] == ['Denied without interview (visa related)']
+    assert set(payload['columns']['status']) == {0}
+    assert columnar_response.data.count(b'Denied without interview') == 1
+    assert len(columnar_response.data) * 2 < len(rows_response.data)
+
+def test_api_applications_columnar_empty(client):
+    """Test the columnar format with no applications."""
+    payload = json.loads(client.get('/api/applications?format=columnar').data)
+    assert payload['count'] == 0
+    assert payload['status_history']['offsets'] == [0]
+    assert payload['dictionaries']['status'] == []
+
+def test_api_applications_fields_projection(client, multiple_applications):
+    """Test that fields= limits the returned columns and omits history."""
+    insert_test_data(client, multiple_applications)
+    
+    response = client.get('/api/applications?fields=status&sort=company_name&order=asc')
+    assert response.status_code == 200
+    
+    data = json.loads(response.data)
+    assert data[0] == {'id': 1, 'status': 'Applied'}
+    assert [app['status'] for app in data] == [app['status'] for app in multiple_applications]
+
+def test_api_applications_fields_sort_by_unselected_column(client, multiple_applications):
+    """Test that sorting works on a column that is not projected."""
+    insert_test_data(client, multiple_applications)
+    
+    response = client.get('/api/applications?fields=id,company_name&sort=applied_date&order=asc')
+    data = json.loads(response.data)
+    assert [app['company_name'] for app in data] == ['Company A', 'Company B', 'Company C', 'Company D']
+    assert set(data[0]) == {'id', 'company_name'}
+
+def test_api_applications_fields_with_history(client, sample_data):
+    """Test that include=history adds history to a projected response."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    
+    response = client.get('/api/applications?fields=status&include=history')
+    data = json.loads(response.data)
+    assert set(data[0]) == {'id', 'status', 'status_history'}
+    assert data[0]['status_history'][0]['status'] == 'Applied'
+
+def test_api_applications_include_without_history(client, sample_data):
+    """Test that an include list without history drops it from the full response."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    
+    data = json.loads(client.get('/api/applications?include=').data)
+    assert 'status_history' not in data[0]
+    assert data[0]['notes'] == 'Test notes field'
+
+def test_api_applications_fields_invalid(client):
+    """Test that unknown fields are rejected."""
+    response = client.get('/api/applications?fields=id,password')
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['success'] is False
+    assert 'password' in data['message']
+
+def test_api_applications_fields_columnar(client, multiple_applications):
+    """Test that projection and history expansion apply to the columnar format."""
+    insert_test_data(client, multiple_applications)
+    
+    payload = json.loads(client.get('/api/applications?fields=status&format=columnar').data)
+    assert set(payload['columns']) == {'id', 'status'}
+    assert 'status_history' not in payload
+    
+    rows = json.loads(client.get('/api/applications?fields=status&include=history').data)
+    payload = json.loads(client.get('/api/applications?fields=status&include=history&format=columnar').data)
+    assert decode_columnar(payload) == rows
+
+def test_api_applications_filter_status(client, multiple_applications):
+    """Test filtering by one or more statuses."""
+    insert_test_data(client, multiple_applications)
+    
+    data = json.loads(client.get('/api/applications?status=Offer').data)
+    assert [app['company_name'] for app in data] == ['Company D']
+    
+    data = json.loads(client.get('/api/applications?status=Applied&status=Interview+1&sort=company_name&order=asc').data)
+    assert [app['company_name'] for app in data] == ['Company A', 'Company C']
+
+def test_api_applications_filter_applied_range(client, multiple_applications):
+    """Test filtering by an inclusive applied_date range."""
+    insert_test_data(client, multiple_applications)
+    
+    data = json.loads(client.get('/api/applications?applied_from=2024-01-02&applied_to=2024-01-03&order=asc').data)
+    assert [app['company_name'] for app in data] == ['Company B', 'Company C']
+
+def test_api_applications_filter_updated_since(client, multiple_applications):
+    """Test filtering by last_updated."""
+    insert_test_data(client, multiple_applications)
+    
+    data = json.loads(client.get('/api/applications?updated_since=2000-01-01').data)
+    assert len(data) == 4
+    
+    data = json.loads(client.get('/api/applications?updated_since=2999-01-01T00:00:00').data)
+    assert data == []
+
+def test_api_applications_filter_company_prefix(client, multiple_applications):
+    """Test that company= is a case-insensitive prefix match."""
+    insert_test_data(client, multiple_applications)
+    
+    data = json.loads(client.get('/api/applications?company=company+b').data)
+    assert [app['company_name'] for app in data] == ['Company B']
+    
+    data = json.loads(client.get('/api/applications?company=COMP').data)
+    assert len(data) == 4
+
+def test_api_applications_filter_history_matches_rows(client, multiple_applications):
+    """Test that filtered responses only carry history for the returned rows."""
+    insert_test_data(client, multiple_applications)
+    
+    payload = json.loads(client.get('/api/applications?status=Offer&format=columnar').data)
+    assert payload['count'] == 1
+    assert payload['status_history']['offsets'] == [0, 1]
+    assert payload['dictionaries']['status'] == ['Offer']
+
+def test_api_applications_filter_invalid_date(client):
+    """Test that malformed dates are rejected."""
+    response = client.get('/api/applications?applied_from=last-week')
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['success'] is False
+    assert 'applied_from' in data['message']
+
+def test_add_application_returns_row_and_summary_delta(client, sample_data):
+    """Test that add returns the stored row with history and the summary delta."""
+    data = json.loads(client.post('/add', json=sample_data, content_type='application/json').data)
+    
+    application = data['application']
+    assert application['id'] == data['id'] == 1
+    assert application['company_name'] == 'Test Company'
+    assert application['notes'] == 'Test notes field'
+    assert application['last_updated'] is not None
+    assert [entry['status'] for entry in application['status_history']] == ['Applied']
+    assert data['summary_delta'] == {'total': 1, 'by_status': {'Applied': 1}}
+    
+    # The returned row matches what the list endpoint serves
+    assert json.loads(client.get('/api/applications').data) == [application]
+
+def test_edit_application_returns_row_and_summary_delta(client, sample_data):
+    """Test that edit returns the updated row and moves one count between statuses."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    
+    data = json.loads(client.post('/edit/1', json=dict(sample_data, status='Offer'),
+                                  content_type='application/json').data)
+    assert data['application']['status'] == 'Offer'
+    assert [entry['status'] for entry in data['application']['status_history']] == ['Applied', 'Offer']
+    assert data['summary_delta'] == {'total': 0, 'by_status': {'Applied': -1, 'Offer': 1}}
+    
+    data = json.loads(client.post('/edit/1', json=dict(sample_data, status='Offer', notes='Signed'),
+                                  content_type='application/json').data)
+    assert data['application']['notes'] == 'Signed'
+    assert data['summary_delta'] == {'total': 0, 'by_status': {}}
+
+def test_edit_and_delete_of_missing_id_are_404_without_events(client, sample_data):
+    """Test that writes to an id that does not exist fail with 404 and publish nothing."""
+    import app as app_module
+    published = app_module.events._next_id
+    
+    response = client.post('/edit/999', json=sample_data, content_type='application/json')
+    assert response.status_code == 404
+    assert json.loads(response.data) == {'success': False, 'message': 'Application 999 not found'}
+    
+    response = client.post('/delete/999')
+    assert response.status_code == 404
+    assert json.loads(response.data)['success'] is False
+    
+    assert app_module.events._next_id == published
+    assert client.get('/api/summary').get_json()['total'] == 0
+
+def test_delete_application_returns_summary_delta(client, sample_data):
+    """Test that delete returns the summary delta for the removed row."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    
+    data = json.loads(client.post('/delete/1').data)
+    assert data['id'] == 1
+    assert data['summary_delta'] == {'total': -1, 'by_status': {'Applied': -1}}
+    
+    assert client.post('/delete/1').status_code == 404
+
+@pytest.mark.parametrize('path', [
+    '/api/applications?format=columnar&include=history',
+    '/api/summary',
+])
+def test_read_endpoints_revalidate_with_etag(client, sample_data, path):
+    """Test that If-None-Match gets a 304 until the data changes."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    
+    unchanged = client.get(path, headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+    assert unchanged.headers['ETag'] == etag
+    
+    client.post('/edit/1', json=dict(sample_data, status='Interview 1'), content_type='application/json')
+    changed = client.get(path, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+def test_etag_depends_on_query(client, sample_data):
+    """Test that different query strings never share an ETag."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    
+    rows = client.get('/api/applications')
+    columnar = client.get('/api/applications?format=columnar', headers={'If-None-Match': rows.headers['ETag']})
+    assert columnar.status_code == 200
+    assert columnar.headers['ETag'] != rows.headers['ETag']
+
+def test_service_worker_served_from_root(client):
+    """Test that the service worker is served at / scope and always revalidated."""
+    response = client.get('/service-worker.js')
+    assert response.status_code == 200
+    assert 'javascript' in response.mimetype
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert b'job-tracker-shell' in response.data
+    response.close()
+
+@pytest.mark.parametrize('applied_date, stored', [
+    ('2024-03-05', '2024-03-05'),
+    ('2024-03-05T10:00:00', '2024-03-05'),
+    ('03/05/2024', '2024-03-05'),
+    ('Mar 5, 2024', '2024-03-05'),
+])
+def test_applied_date_is_normalized_on_write(client, sample_data, applied_date, stored):
+    """Test that accepted date formats are stored as YYYY-MM-DD."""
+    response = client.post('/add', json=dict(sample_data, applied_date=applied_date), content_type='application/json')
+    assert response.get_json()['application']['applied_date'] == stored
+
+    response = client.post('/edit/1', json=dict(sample_data, applied_date=applied_date), content_type='application/json')
+    assert response.get_json()['application']['applied_date'] == stored
+
+def test_invalid_applied_date_is_rejected(client, sample_data):
+    """Test that an unparseable applied_date is a 400, on add and edit."""
+    response = client.post('/add', json=dict(sample_data, applied_date='next week'), content_type='application/json')
+    assert response.status_code == 400
+    assert 'applied_date' in response.get_json()['message']
+
+    client.post('/add', json=sample_data, content_type='application/json')
+    response = client.post('/edit/1', json=dict(sample_data, applied_date='2024-13-45'), content_type='application/json')
+    assert response.status_code == 400
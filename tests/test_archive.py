@@ -0,0 +1,129 @@
+"""Test the archive tier for closed applications."""
+
+import pytest
+import json
+from app import archive_applications, get_db_connection
+from conftest import insert_test_data
+
+def set_last_updated(client, app_id, timestamp):
+    """Backdate an application's last_updated timestamp."""
+    with client.application.app_context():
+        conn = get_db_connection()
+        conn.execute('UPDATE job_applications SET last_updated = ? WHERE id = ?', (timestamp, app_id))
+        conn.commit()
+        conn.close()
+
+def table_count(client, table):
+    """Count rows in a table."""
+    with client.application.app_context():
+        conn = get_db_connection()
+        count = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        conn.close()
+    return count
+
+def test_archive_by_ids_moves_rows_and_history(client, multiple_applications):
+    """Test that archiving by id moves the application and its history."""
+    insert_test_data(client, multiple_applications)
+
+    response = client.post('/api/archive', json={'ids': [1, 2]})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['success'] is True
+    assert data['archived'] == 2
+
+    assert table_count(client, 'job_applications') == 2
+    assert table_count(client, 'status_history') == 2
+    assert table_count(client, 'archived_applications') == 2
+    assert table_count(client, 'archived_status_history') == 2
+
+def test_archive_policy_only_moves_old_terminal_applications(client, multiple_applications):
+    """Test that the age policy skips open and recently updated applications."""
+    insert_test_data(client, multiple_applications)
+    for app_id in (1, 2, 3):
+        set_last_updated(client, app_id, '2020-01-01 00:00:00')
+
+    data = json.loads(client.post('/api/archive', json={'older_than_days': 30}).data)
+
+    # Only Company B is both terminal (Denied) and old; D (Offer) is recent, A and C are open
+    assert data['archived'] == 1
+    remaining = json.loads(client.get('/api/applications?sort=company_name&order=asc').data)
+    assert [app['company_name'] for app in remaining] == ['Company A', 'Company C', 'Company D']
+
+def test_archive_in_batches(client, sample_data):
+    """Test that archiving spans several batches."""
+    for i in range(5):
+        client.post('/add', json=dict(sample_data, company_name=f'Company {i}', status='Offer'),
+                    content_type='application/json')
+
+    with client.application.app_context():
+        assert archive_applications(older_than_days=0, batch_size=2) == 5
+
+    assert table_count(client, 'job_applications') == 0
+    assert table_count(client, 'archived_status_history') == 5
+
+def test_include_archived_on_applications(client, multiple_applications):
+    """Test that include_archived returns archived rows and their history."""
+    insert_test_data(client, multiple_applications)
+    client.post('/api/archive', json={'ids': [4]})
+
+    data = json.loads(client.get('/api/applications').data)
+    assert [app['company_name'] for app in data] == ['Company C', 'Company B', 'Company A']
+
+    data = json.loads(client.get('/api/applications?include_archived=1').data)
+    assert len(data) == 4
+    assert data[0]['company_name'] == 'Company D'
+    assert data[0]['archived'] == 1
+    assert data[0]['status_history'][0]['status'] == 'Offer'
+    assert all(app['archived'] == 0 for app in data[1:])
+
+    data = json.loads(client.get('/api/applications?include_archived=1&status=Offer&format=columnar').data)
+    assert data['count'] == 1
+    assert data['status_history']['offsets'] == [0, 1]
+
+def test_include_archived_on_summary(client, multiple_applications):
+    """Test that include_archived adds archived rows to the summary counts."""
+    insert_test_data(client, multiple_applications)
+    client.post('/api/archive', json={'ids': [4]})
+
+    summary = json.loads(client.get('/api/summary').data)
+    assert summary['total'] == 3
+    assert 'Offer' not in summary['by_status']
+
+    summary = json.loads(client.get('/api/summary?include_archived=true').data)
+    assert summary['total'] == 4
+    assert summary['by_status']['Offer'] == 1
+
+def test_delete_archived_application(client, sample_data):
+    """Test that deleting an archived application removes it from the archive and says so."""
+    import app as app_module
+    client.post('/add', json=sample_data, content_type='application/json')
+    client.post('/api/archive', json={'ids': [1]})
+    published = app_module.events._next_id
+
+    response = client.post('/delete/1')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['success'] is True
+    assert data['id'] == 1
+    # Archived applications are not in the summary, so its counts do not change
+    assert data['summary_delta'] == {'total': 0, 'by_status': {}}
+    assert app_module.events._next_id == published + 1
+
+    assert table_count(client, 'archived_applications') == 0
+    assert table_count(client, 'archived_status_history') == 0
+    assert client.post('/delete/1').status_code == 404
+
+def test_archive_invalid_request(client):
+    """Test that malformed archive requests are rejected."""
+    response = client.post('/api/archive', json={'ids': ['abc']})
+    assert response.status_code == 400
+    assert json.loads(response.data)['success'] is False
+
+@pytest.mark.parametrize('ids', ['12', 12, ['1'], [1.0], [True], {'1': 1}, None])
+def test_archive_rejects_ids_that_are_not_a_list_of_integers(client, multiple_applications, ids):
+    """Test that only a JSON list of integers is accepted as ids, and nothing is archived otherwise."""
+    insert_test_data(client, multiple_applications)
+    response = client.post('/api/archive', json={'ids': ids})
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'].startswith('ids must be a list of integers')
+    assert table_count(client, 'archived_applications') == 0
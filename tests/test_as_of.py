@@ -0,0 +1,80 @@
+"""Test point-in-time reads with as_of."""
+
+import json
+import pytest
+from app import app, get_db_connection
+from conftest import clone_database, insert_test_data
+from repository import as_of_source, epoch_seconds
+
+def backdate(client, table, app_id, changed_at):
+    """Move every history entry of one application to changed_at."""
+    with client.application.app_context():
+        conn = get_db_connection()
+        conn.execute(f'UPDATE {table} SET changed_at = ? WHERE application_id = ?', (changed_at, app_id))
+        conn.commit()
+        conn.close()
+
+def test_applications_as_of(client, multiple_applications):
+    """Test that /api/applications?as_of returns the pipeline of that day."""
+    insert_test_data(client, multiple_applications)
+    backdate(client, 'status_history', 1, '2024-01-10 12:00:00')
+    backdate(client, 'status_history', 2, '2024-02-10 12:00:00')
+    backdate(client, 'status_history', 3, '2024-03-10 12:00:00')
+    backdate(client, 'status_history', 4, '2024-03-10 12:00:00')
+
+    data = json.loads(client.get('/api/applications?as_of=2024-02-10&sort=company_name&order=asc').data)
+    assert [app['company_name'] for app in data] == ['Company A', 'Company B']
+    assert all(len(app['status_history']) == 1 for app in data)
+
+    data = json.loads(client.get('/api/applications?as_of=2024-02-10T11:00:00').data)
+    assert [app['company_name'] for app in data] == ['Company A']
+
+    data = json.loads(client.get('/api/summary?as_of=2024-03-01').data)
+    assert data['total'] == 2
+
+def test_as_of_includes_archived(client, multiple_applications):
+    """Test that archived applications are replayed from the archived history."""
+    insert_test_data(client, multiple_applications)
+    client.post('/api/archive', json={'ids': [4]})
+    backdate(client, 'archived_status_history', 4, '2024-01-10 12:00:00')
+
+    data = json.loads(client.get('/api/summary?as_of=2024-01-31&include_archived=1').data)
+    assert data == {'total': 1, 'by_status': {'Offer': 1}}
+    assert json.loads(client.get('/api/summary?as_of=2024-01-31').data)['total'] == 0
+
+    data = json.loads(client.get('/api/applications?as_of=2024-01-31&include_archived=1').data)
+    assert [(app['id'], app['archived']) for app in data] == [(4, 1)]
+
+@pytest.mark.parametrize('url', ['/api/applications?as_of=yesterday', '/api/summary?as_of=2024-13-01'])
+def test_invalid_as_of(client, url):
+    """Test that a malformed as_of is rejected with 400."""
+    response = client.get(url)
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['success'] is False
+    assert 'as_of' in data['message']
+
+def test_as_of_seeks_covering_index(client):
+    """Test that the status at a point in time is one index seek per application."""
+    with client.application.app_context():
+        conn = get_db_connection()
+        plan = conn.execute(f'EXPLAIN QUERY PLAN SELECT * FROM {as_of_source(True)}',
+                            (epoch_seconds('2024-03-01 00:00:00'),)).fetchall()
+        conn.close()
+
+    details = [row[3] for row in plan]
+    for index in ('idx_status_history_app_changed', 'idx_archived_status_history_app_changed'):
+        assert any(detail.startswith('SEARCH') and index in detail for detail in details), details
+    assert not any('TEMP B-TREE' in detail for detail in details), details
+
+def test_as_of_cache_is_per_database(client, template_db, tmp_path, sample_data, monkeypatch):
+    """Test that copies of the template at the same data version do not share cached results."""
+    url = '/api/summary?as_of=2999-01-01'
+    insert_test_data(client, [sample_data])
+    assert json.loads(client.get(url).data)['by_status'] == {'Applied': 1}
+
+    other = str(tmp_path / 'other.db')
+    clone_database(template_db, other)
+    monkeypatch.setitem(app.config, 'DATABASE', other)
+    insert_test_data(client, [dict(sample_data, status='Offer')])
+    assert json.loads(client.get(url).data)['by_status'] == {'Offer': 1}
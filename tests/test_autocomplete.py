@@ -0,0 +1,62 @@
+"""Tests for /api/autocomplete and the field_values table behind it."""
+
+import pytest
+import sqlite3
+from app import app, init_db, get_db_connection
+from conftest import insert_test_data
+
+def suggestions(client, query):
+    response = client.get(f'/api/autocomplete?{query}')
+    assert response.status_code == 200
+    return [(item['value'], item['uses']) for item in response.get_json()['suggestions']]
+
+def test_autocomplete_endpoint(client, sample_data):
+    """Test ranking, the limit and that prefixes ignore case."""
+    for company in ['Google', 'google', 'Goldman Sachs', 'Gopuff', 'Gopuff', 'Meta']:
+        insert_test_data(client, [dict(sample_data, company_name=company)])
+
+    assert suggestions(client, 'field=company_name&prefix=go') == [
+        ('Google', 2), ('Gopuff', 2), ('Goldman Sachs', 1)]
+    assert suggestions(client, 'field=company_name&prefix=GOO&limit=1') == [('Google', 2)]
+    assert suggestions(client, 'field=job_role&prefix=soft') == [('Software Engineer', 6)]
+
+@pytest.mark.parametrize('query', ['field=notes', 'prefix=go', 'field=job_role&limit=0',
+                                   'field=job_role&limit=500', 'field=job_role&limit=ten'])
+def test_autocomplete_rejects_bad_parameters(client, query):
+    """Test validation of field and limit."""
+    response = client.get(f'/api/autocomplete?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_archived_applications_keep_counting(client, sample_data):
+    """Test that archiving moves rows without changing their counts."""
+    insert_test_data(client, [dict(sample_data, company_name='Initech', status='Offer')])
+    client.post('/api/archive', json={'ids': [1]})
+
+    assert suggestions(client, 'field=company_name&prefix=ini') == [('Initech', 1)]
+
+    client.post('/delete/1')
+    assert suggestions(client, 'field=company_name&prefix=ini') == []
+
+def test_field_values_backfilled_for_existing_databases(client, sample_data):
+    """Test that a database from before field_values gets its counts on init."""
+    insert_test_data(client, [sample_data, dict(sample_data, company_name='TEST COMPANY')])
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.execute('DROP TABLE field_values')
+    conn.commit()
+    conn.close()
+
+    init_db()
+    assert suggestions(client, 'field=company_name&prefix=test') == [('TEST COMPANY', 2)]
+
+def test_autocomplete_is_a_primary_key_range_scan(client):
+    """Test that prefix lookups seek the field_values primary key."""
+    conn = get_db_connection()
+    plan = conn.execute('''
+        EXPLAIN QUERY PLAN SELECT value, uses FROM field_values
+        WHERE field = ? AND value >= ? AND value < ?
+        ORDER BY uses DESC, value LIMIT 10
+    ''', ('company_name', 'go', 'go\U0010ffff')).fetchall()
+    conn.close()
+    details = [row[3] for row in plan]
+    assert any('PRIMARY KEY (field=? AND value>? AND value<?)' in detail for detail in details), details
@@ -0,0 +1,191 @@
+"""Tests for online backup, snapshot rotation and restore."""
+
+import io
+import os
+import sqlite3
+import pytest
+import backup
+from backup import BackupError, backup_database, copy_online, integrity_check, list_snapshots, restore_database
+from conftest import insert_test_data
+
+def make_database(path, rows=50):
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)')
+    conn.executemany('INSERT INTO items (body) VALUES (?)', [('x' * 500,)] * rows)
+    conn.commit()
+    conn.close()
+
+def count_items(path):
+    conn = sqlite3.connect(path)
+    count = conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+    conn.close()
+    return count
+
+def test_backup_writes_verified_snapshot(tmp_path):
+    """Test that a snapshot holds the data, passes integrity_check and leaves no partial file."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+
+    result = backup_database(db_path, str(tmp_path / 'snapshots'), step_pages=2, sleep=0)
+    snapshot = tmp_path / 'snapshots' / result['snapshot']
+    assert result['snapshot'].startswith('tracker-')
+    assert result['pages'] > 2
+    assert result['restarts'] == 0
+    assert result['bytes'] == os.path.getsize(snapshot)
+    assert count_items(str(snapshot)) == 50
+    assert integrity_check(str(snapshot)) == []
+    assert os.listdir(tmp_path / 'snapshots') == [result['snapshot']]
+
+def test_backup_rotation_keeps_newest(tmp_path):
+    """Test that only the newest snapshots are kept."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path, rows=1)
+    backup_dir = str(tmp_path / 'snapshots')
+
+    names = [backup_database(db_path, backup_dir, keep=2, sleep=0)['snapshot'] for _ in range(4)]
+    assert [snapshot['name'] for snapshot in list_snapshots(backup_dir, db_path)] == names[:1:-1]
+
+def test_copy_restarts_then_finishes_in_one_step(tmp_path, monkeypatch):
+    """Test that writes during the copy restart it, and it still completes with the latest data."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+    writes = []
+
+    def write_between_steps(seconds):
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO items (body) VALUES ('during backup')")
+        conn.commit()
+        conn.close()
+        writes.append(seconds)
+    monkeypatch.setattr(backup.time, 'sleep', write_between_steps)
+
+    source = sqlite3.connect(db_path)
+    pages, restarts = copy_online(source, str(tmp_path / 'copy.db'), step_pages=1, max_restarts=2)
+    source.close()
+
+    assert restarts == 3
+    assert count_items(str(tmp_path / 'copy.db')) == 50 + len(writes)
+
+def test_failed_verification_discards_snapshot(tmp_path, monkeypatch):
+    """Test that a snapshot failing integrity_check is removed and reported."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+    monkeypatch.setattr(backup, 'integrity_check', lambda path: ['page 3 is never used'])
+
+    with pytest.raises(BackupError, match='page 3 is never used'):
+        backup_database(db_path, str(tmp_path / 'snapshots'), sleep=0)
+    assert os.listdir(tmp_path / 'snapshots') == []
+
+def test_restore_swaps_in_snapshot(tmp_path):
+    """Test that restore replaces the database with the snapshot contents."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+    result = backup_database(db_path, str(tmp_path / 'snapshots'), sleep=0)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('DELETE FROM items')
+    conn.commit()
+    conn.close()
+
+    restore_database(str(tmp_path / 'snapshots' / result['snapshot']), db_path)
+    assert count_items(db_path) == 50
+    assert not os.path.exists(f'{db_path}.restoring')
+
+def test_restore_refuses_corrupt_snapshot(tmp_path):
+    """Test that a damaged snapshot is rejected and the database left alone."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+    corrupt = tmp_path / 'corrupt.db'
+    corrupt.write_bytes(b'not a database' * 100)
+
+    with pytest.raises(BackupError):
+        restore_database(str(corrupt), db_path)
+    assert count_items(db_path) == 50
+
+def test_cli_backup_list_and_verify(tmp_path):
+    """Test the backup, list and verify commands."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+    backup_dir = str(tmp_path / 'snapshots')
+
+    out = io.StringIO()
+    assert backup.main(['--db', db_path, 'backup', '--dir', backup_dir, '--sleep', '0'], out=out) == 0
+    assert 'integrity ok' in out.getvalue()
+
+    out = io.StringIO()
+    assert backup.main(['--db', db_path, 'list', '--dir', backup_dir], out=out) == 0
+    name = out.getvalue().split()[0]
+
+    out = io.StringIO()
+    assert backup.main(['--db', db_path, 'verify', os.path.join(backup_dir, name)], out=out) == 0
+    assert out.getvalue().endswith(': ok\n')
+
+    (tmp_path / 'junk.db').write_bytes(b'junk' * 1000)
+    assert backup.main(['--db', db_path, 'verify', str(tmp_path / 'junk.db')], out=io.StringIO()) == 1
+
+def test_admin_backup_endpoint(client, sample_data, tmp_path, monkeypatch):
+    """Test that POST /admin/backup takes a snapshot and GET lists it."""
+    monkeypatch.setenv('BACKUP_DIR', str(tmp_path))
+    monkeypatch.setenv('BACKUP_KEEP', '3')
+    insert_test_data(client, [sample_data])
+
+    data = client.post('/admin/backup').get_json()
+    assert data['success'] is True
+    assert data['restarts'] == 0
+    snapshot_conn = sqlite3.connect(str(tmp_path / data['snapshot']))
+    assert snapshot_conn.execute('SELECT company_name FROM job_applications').fetchone()[0] == 'Test Company'
+    snapshot_conn.close()
+
+    listing = client.get('/admin/backup').get_json()
+    assert listing['directory'] == str(tmp_path)
+    assert listing['keep'] == 3
+    assert [snapshot['name'] for snapshot in listing['snapshots']] == [data['snapshot']]
+
+def test_wal_copy_is_a_consistent_snapshot(tmp_path, monkeypatch):
+    """Test that a WAL database is copied from one snapshot without restarts."""
+    db_path = str(tmp_path / 'tracker.db')
+    make_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.close()
+
+    def write_between_steps(seconds):
+        conn = sqlite3.connect(db_path, timeout=1)
+        conn.execute("INSERT INTO items (body) VALUES ('during backup')")
+        conn.commit()
+        conn.close()
+    monkeypatch.setattr(backup.time, 'sleep', write_between_steps)
+
+    source = sqlite3.connect(db_path)
+    pages, restarts = copy_online(source, str(tmp_path / 'copy.db'), step_pages=1, max_restarts=0)
+    assert not source.in_transaction
+    source.close()
+
+    assert restarts == 0
+    assert count_items(str(tmp_path / 'copy.db')) == 50
+    assert count_items(db_path) > 50
+
+    # Snapshots of a WAL database are still single files
+    result = backup_database(db_path, str(tmp_path / 'snapshots'), sleep=0)
+    assert os.listdir(tmp_path / 'snapshots') == [result['snapshot']]
+
+def test_restore_does_not_reuse_data_versions(client, sample_data, tmp_path):
+    """Test that ETags and as_of results from before a restore are not served for the restored data."""
+    from app import app
+    db_path = app.config['DATABASE']
+    insert_test_data(client, [sample_data])
+    result = backup_database(db_path, str(tmp_path / 'snapshots'), sleep=0)
+    insert_test_data(client, [dict(sample_data, company_name='After Backup', status='Offer')])
+
+    as_of_url = '/api/summary?as_of=2999-01-01'
+    etag = client.get('/api/summary').headers['ETag']
+    assert client.get(as_of_url).get_json()['by_status'] == {'Applied': 1, 'Offer': 1}
+
+    restore_database(str(tmp_path / 'snapshots' / result['snapshot']), db_path)
+    # The same number of writes as before the restore, on different data
+    insert_test_data(client, [dict(sample_data, company_name='After Restore', status='Interview 1')])
+
+    response = client.get('/api/summary', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['by_status'] == {'Applied': 1, 'Interview 1': 1}
+    assert client.get(as_of_url).get_json()['by_status'] == {'Applied': 1, 'Interview 1': 1}
@@ -24,7 +24,7 @@ def test_database_initialization(client):
         
         expected_columns = [
             'id', 'company_name', 'job_role', 'applied_date', 
-            'url', 'status', 'notes', 'last_updated'
+            'url', 'status_id', 'notes', 'last_updated'
         ]
         
         actual_columns = [col[1] for col in columns]
@@ -56,20 +56,20 @@ def test_database_constraints(client):
         # Test that required fields cannot be NULL
         with pytest.raises(sqlite3.IntegrityError):
             cursor.execute("""
-                INSERT INTO job_applications (company_name, job_role, applied_date, status)
-                VALUES (NULL, 'Test Role', '2024-01-01', 'Waiting for hearback')
+                INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+                VALUES (NULL, 'Test Role', '2024-01-01', 1)
             """)
         
         with pytest.raises(sqlite3.IntegrityError):
             cursor.execute("""
-                INSERT INTO job_applications (company_name, job_role, applied_date, status)
-                VALUES ('Test Company', NULL, '2024-01-01', 'Waiting for hearback')
+                INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+                VALUES ('Test Company', NULL, '2024-01-01', 1)
             """)
         
         with pytest.raises(sqlite3.IntegrityError):
             cursor.execute("""
-                INSERT INTO job_applications (company_name, job_role, applied_date, status)
-                VALUES ('Test Company', 'Test Role', NULL, 'Waiting for hearback')
+                INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+                VALUES ('Test Company', 'Test Role', NULL, 1)
             """)
         
         conn.close()
@@ -82,13 +82,13 @@ def test_auto_increment_id(client):
         
         # Insert test data
         cursor.execute("""
-            INSERT INTO job_applications (company_name, job_role, applied_date, status)
-            VALUES ('Company 1', 'Role 1', '2024-01-01', 'Waiting for hearback')
+            INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+            VALUES ('Company 1', 'Role 1', '2024-01-01', 1)
         """)
         
         cursor.execute("""
-            INSERT INTO job_applications (company_name, job_role, applied_date, status)
-            VALUES ('Company 2', 'Role 2', '2024-01-02', 'Denied')
+            INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+            VALUES ('Company 2', 'Role 2', '2024-01-02', 2)
         """)
         
         conn.commit()
@@ -115,7 +115,9 @@ def test_default_values(client):
         conn.commit()
         
         # Check default status
-        cursor.execute("SELECT status FROM job_applications WHERE id = 1")
+        cursor.execute("""
+            SELECT label FROM job_applications JOIN statuses ON statuses.id = status_id WHERE job_applications.id = 1
+        """)
         result = cursor.fetchone()
         assert result is not None
         status = result[0]
@@ -138,14 +140,14 @@ def test_notes_field_optional(client):
         
         # Insert data without notes (should be NULL)
         cursor.execute("""
-            INSERT INTO job_applications (company_name, job_role, applied_date, status)
-            VALUES ('Test Company', 'Test Role', '2024-01-01', 'Waiting for hearback')
+            INSERT INTO job_applications (company_name, job_role, applied_date, status_id)
+            VALUES ('Test Company', 'Test Role', '2024-01-01', 1)
         """)
         
         # Insert data with notes
         cursor.execute("""
-            INSERT INTO job_applications (company_name, job_role, applied_date, status, notes)
-            VALUES ('Test Company 2', 'Test Role 2', '2024-01-02', 'Interview', 'Application ID: 12345')
+            INSERT INTO job_applications (company_name, job_role, applied_date, status_id, notes)
+            VALUES ('Test Company 2', 'Test Role 2', '2024-01-02', 4, 'Application ID: 12345')
         """)
         
         conn.commit()
@@ -184,9 +186,113 @@ def test_status_history_table_exists(client):
         cursor.execute("PRAGMA table_info(status_history)")
         columns = cursor.fetchall()
         
-        expected_columns = ['id', 'application_id', 'status', 'changed_at']
+        expected_columns = ['id', 'application_id', 'status_id', 'changed_at']
         actual_columns = [col[1] for col in columns]
         for expected_col in expected_columns:
             assert expected_col in actual_columns
         
         conn.close()
+
+@pytest.mark.parametrize('args, index_name', [
+    ({'status': ['Applied', 'Offer']}, 'idx_job_applications_followup'),
+    ({'applied_from': '2024-01-01'}, 'idx_job_applications_applied_day'),
+    ({'applied_to': '2024-01-31'}, 'idx_job_applications_applied_day'),
+    ({'updated_since': '2024-01-01'}, 'idx_job_applications_last_updated_epoch'),
+    ({'company': 'acme'}, 'idx_job_applications_company'),
+])
+def test_application_filters_use_index(client, args, index_name):
+    """Test that each /api/applications filter compiles to an index search."""
+    from werkzeug.datastructures import MultiDict
+    from app import build_application_filters
+    
+    where, params = build_application_filters(MultiDict(args))
+    
+    with client.application.app_context():
+        conn = get_db_connection()
+        plan = conn.execute(f'EXPLAIN QUERY PLAN SELECT * FROM job_applications {where}', params).fetchall()
+        history_plan = conn.execute(f'''
+            EXPLAIN QUERY PLAN SELECT * FROM status_history
+            WHERE application_id IN (SELECT id FROM job_applications {where})
+        ''', params).fetchall()
+        conn.close()
+    
+    details = [row[3] for row in plan]
+    assert any(detail.startswith('SEARCH') and index_name in detail for detail in details), details
+    
+    history_details = [row[3] for row in history_plan]
+    assert any('idx_status_history_app_changed' in detail for detail in history_details), history_details
+    assert any(index_name in detail for detail in history_details), history_details
+
+@pytest.mark.parametrize('sort', ['applied_date', 'last_updated'])
+def test_date_sorts_use_integer_index(client, sort):
+    """Test that date sorts walk the integer index instead of sorting."""
+    shadow = {'applied_date': 'applied_day', 'last_updated': 'last_updated_epoch'}[sort]
+    with client.application.app_context():
+        conn = get_db_connection()
+        plan = conn.execute(f'EXPLAIN QUERY PLAN SELECT * FROM job_applications ORDER BY {shadow} DESC').fetchall()
+        history_plan = conn.execute('''
+            EXPLAIN QUERY PLAN SELECT * FROM status_history
+            ORDER BY application_id, changed_at_epoch ASC, id ASC
+        ''').fetchall()
+        conn.close()
+
+    details = [row[3] for row in plan]
+    assert any(f'idx_job_applications_{shadow}' in detail for detail in details), details
+    assert not any('TEMP B-TREE' in detail for detail in details), details
+    history_details = [row[3] for row in history_plan]
+    assert not any('TEMP B-TREE' in detail for detail in history_details), history_details
+
+def test_migrate_date_columns_normalizes_legacy_rows(client, caplog):
+    """Test that an old database gets ISO text and integer date columns."""
+    from app import migrate_date_columns
+    from repository import julian_day, epoch_seconds
+
+    db_path = client.application.config['DATABASE']
+    conn = sqlite3.connect(db_path)
+    # Rebuild the tables as they were before the integer columns existed
+    conn.executescript('''
+        DROP TABLE job_applications;
+        DROP TABLE status_history;
+        CREATE TABLE job_applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, company_name TEXT NOT NULL, job_role TEXT NOT NULL,
+            applied_date DATE NOT NULL, url TEXT, status TEXT NOT NULL DEFAULT 'Applied', notes TEXT,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, application_id INTEGER NOT NULL,
+            status TEXT NOT NULL, changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO job_applications (company_name, job_role, applied_date, status, last_updated) VALUES
+            ('A', 'Dev', '03/15/2024', 'Applied', '2024-03-16T10:00:00Z'),
+            ('B', 'Dev', '2024-03-01', 'Applied', '2024-03-02 09:30:00'),
+            ('C', 'Dev', 'sometime in March', 'Applied', '2024-03-02T12:00:00+02:00');
+        INSERT INTO status_history (application_id, status, changed_at) VALUES (1, 'Applied', '2024-03-16T10:00:00.123');
+    ''')
+    conn.commit()
+    conn.close()
+
+    with client.application.app_context():
+        init_db()
+    # Operators are told about the rows that date filters will miss
+    assert '1 stored dates could not be parsed' in caplog.text
+    assert client.get('/admin/maintenance').get_json()['unparsed_dates'] == {'job_applications.applied_date': 1}
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute('''
+        SELECT applied_date, applied_day, last_updated, last_updated_epoch FROM job_applications ORDER BY id
+    ''').fetchall()
+    history = conn.execute('SELECT changed_at, changed_at_epoch FROM status_history').fetchone()
+
+    assert rows[0] == ('2024-03-15', julian_day('2024-03-15'), '2024-03-16 10:00:00', epoch_seconds('2024-03-16 10:00:00'))
+    assert rows[1][:2] == ('2024-03-01', julian_day('2024-03-01'))
+    # Unparseable dates are kept, offsets are converted to UTC
+    assert rows[2][:3] == ('sometime in March', None, '2024-03-02 10:00:00')
+    assert history == ('2024-03-16 10:00:00', epoch_seconds('2024-03-16 10:00:00'))
+    # The current stage started at the latest history entry, or last_updated without one
+    stages = conn.execute('SELECT stage_entered_at, stage_entered_epoch FROM job_applications ORDER BY id').fetchall()
+    assert stages[0] == ('2024-03-16 10:00:00', epoch_seconds('2024-03-16 10:00:00'))
+    assert stages[1][0] == '2024-03-02 09:30:00'
+
+    # Already migrated: nothing left to do
+    assert migrate_date_columns(conn.cursor()) == 0
+    conn.close()
@@ -0,0 +1,108 @@
+"""Tests for the read-only database CLI."""
+
+import io
+import json
+import sys
+import sqlite3
+import pytest
+from app import app
+from conftest import insert_test_data
+from db_interact import main, connect_readonly, iter_chunks
+
+def run(*argv):
+    out = io.StringIO()
+    code = main(['--db', app.config['DATABASE'], *argv], out=out)
+    return code, out.getvalue()
+
+def test_dump_csv_streams_in_chunks(client, multiple_applications):
+    """Test that dump writes a header once and every row, whatever the chunk size."""
+    insert_test_data(client, multiple_applications)
+
+    code, output = run('dump', 'job_applications', '--chunk-size', '1')
+    assert code == 0
+    lines = output.splitlines()
+    assert lines[0].startswith('id,company_name,job_role')
+    assert len(lines) == 1 + len(multiple_applications)
+    assert 'pandas' not in sys.modules
+
+def test_iter_chunks_respects_chunk_size(client, multiple_applications):
+    """Test that rows are fetched in chunks of at most chunk_size."""
+    insert_test_data(client, multiple_applications)
+
+    conn = connect_readonly(app.config['DATABASE'])
+    sizes = [len(rows) for _, rows in iter_chunks(conn, 'SELECT * FROM job_applications', chunk_size=3)]
+    conn.close()
+    assert sizes == [3, 1]
+
+def test_query_with_params_as_jsonl(client, multiple_applications):
+    """Test that query binds -p values and writes one JSON object per row."""
+    insert_test_data(client, multiple_applications)
+
+    code, output = run('query', '''
+        SELECT company_name, label AS status FROM job_applications
+        JOIN statuses ON statuses.id = status_id WHERE label = ?
+    ''', '-p', 'Offer', '--format', 'jsonl')
+    assert code == 0
+    assert [json.loads(line) for line in output.splitlines()] == [
+        {'company_name': 'Company D', 'status': 'Offer'}
+    ]
+
+def test_query_cannot_write(client, sample_data, capsys):
+    """Test that the connection is read-only."""
+    insert_test_data(client, [sample_data])
+
+    code, _ = run('query', 'DELETE FROM job_applications')
+    assert code == 1
+    assert 'readonly' in capsys.readouterr().err
+
+    conn = sqlite3.connect(app.config['DATABASE'])
+    assert conn.execute('SELECT COUNT(*) FROM job_applications').fetchone()[0] == 1
+    conn.close()
+
+def test_dump_rejects_unknown_table(client, capsys):
+    """Test that dump only accepts existing table names."""
+    code, _ = run('dump', 'job_applications; DROP TABLE status_history')
+    assert code == 1
+    assert 'Unknown table' in capsys.readouterr().err
+
+def test_missing_database_is_not_created(tmp_path, capsys):
+    """Test that a mistyped path is reported instead of creating an empty database."""
+    path = tmp_path / 'missing.db'
+    assert main(['--db', str(path), 'stats'], out=io.StringIO()) == 1
+    assert not path.exists()
+    assert 'cannot open' in capsys.readouterr().err
+
+def test_stats(client, multiple_applications):
+    """Test the aggregate summary."""
+    insert_test_data(client, multiple_applications)
+
+    code, output = run('stats')
+    assert code == 0
+    assert 'job_applications' in output
+    assert 'Offer' in output
+    assert '2024-01' in output
+    assert 'Status changes: 4 across 4 applications' in output
+
+def test_history_of(client, sample_data, capsys):
+    """Test the timeline for one application and the error for an unknown id."""
+    insert_test_data(client, [sample_data])
+    client.post('/edit/1', json=dict(sample_data, status='Interview 1'), content_type='application/json')
+
+    code, output = run('history-of', '1')
+    assert code == 0
+    assert 'Test Company' in output
+    timeline = output[output.index('Status history'):].splitlines()[1:]
+    assert [line.split('  ')[-1] for line in timeline] == ['Applied', 'Interview 1']
+
+    assert run('history-of', '99')[0] == 1
+    assert 'No application with id 99' in capsys.readouterr().err
+
+def test_dataframe_format_imports_pandas_lazily(client, sample_data, monkeypatch, capsys):
+    """Test that pandas is only needed for --format dataframe."""
+    insert_test_data(client, [sample_data])
+    # Make the import fail whether or not pandas is installed
+    monkeypatch.setitem(sys.modules, 'pandas', None)
+
+    assert run('dump', 'job_applications')[0] == 0
+    assert run('dump', 'job_applications', '--format', 'dataframe')[0] == 1
+    assert 'needs pandas' in capsys.readouterr().err
@@ -0,0 +1,99 @@
+"""Test duplicate application detection."""
+
+import pytest
+import json
+from app import canonicalize_url, make_dedupe_key, get_db_connection, init_db
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://www.Example.com/jobs/123/', 'example.com/jobs/123'),
+    ('http://example.com/jobs/123#apply', 'example.com/jobs/123'),
+    ('example.com/jobs/123', 'example.com/jobs/123'),
+    ('https://example.com/jobs?b=2&a=1&utm_source=linkedin&gclid=x', 'example.com/jobs?a=1&b=2'),
+    ('https://example.com:8443/jobs', 'example.com:8443/jobs'),
+    ('', ''),
+    (None, ''),
+])
+def test_canonicalize_url(url, expected):
+    """Test that equivalent job URLs canonicalize to the same key."""
+    assert canonicalize_url(url) == expected
+
+def test_make_dedupe_key_ignores_case_and_punctuation():
+    """Test that company/role keys ignore case, whitespace and punctuation."""
+    assert make_dedupe_key('Acme, Inc.', 'Sr. Software Engineer') == make_dedupe_key('ACME Inc', 'sr software-engineer')
+    assert make_dedupe_key('Acme', 'Engineer') != make_dedupe_key('Acme', 'Manager')
+
+def test_add_application_reports_duplicates(client, sample_data):
+    """Test that adding a likely duplicate succeeds and returns the existing row."""
+    first = json.loads(client.post('/add', json=sample_data, content_type='application/json').data)
+    assert first['duplicates'] == []
+
+    duplicate = dict(sample_data, company_name='test company', job_role='Software-Engineer ', url='')
+    response = client.post('/add', json=duplicate, content_type='application/json')
+    assert response.status_code == 200
+
+    data = json.loads(response.data)
+    assert data['success'] is True
+    assert data['id'] == 2
+    assert [dup['id'] for dup in data['duplicates']] == [1]
+
+def test_add_application_reports_url_duplicates(client, sample_data):
+    """Test that the same posting under a different role name is reported."""
+    client.post('/add', json=sample_data, content_type='application/json')
+
+    reposted = dict(sample_data, job_role='Backend Engineer', url='https://www.example.com/job/?utm_medium=email')
+    data = json.loads(client.post('/add', json=reposted, content_type='application/json').data)
+    assert [dup['id'] for dup in data['duplicates']] == [1]
+
+def test_edit_application_updates_dedupe_key(client, sample_data):
+    """Test that editing an application refreshes its lookup keys."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    client.post('/edit/1', json=dict(sample_data, company_name='Other Corp', url=''),
+                content_type='application/json')
+
+    data = json.loads(client.post('/add', json=dict(sample_data, url=''), content_type='application/json').data)
+    assert data['duplicates'] == []
+
+def test_duplicates_report_clusters(client, sample_data):
+    """Test that the duplicates report groups matching applications."""
+    client.post('/add', json=sample_data, content_type='application/json')
+    client.post('/add', json=dict(sample_data, company_name='TEST COMPANY', url=''), content_type='application/json')
+    client.post('/add', json=dict(sample_data, company_name='Unrelated', job_role='Analyst', url=''), content_type='application/json')
+    client.post('/add', json=dict(sample_data, company_name='Elsewhere', job_role='Analyst'), content_type='application/json')
+
+    response = client.get('/api/applications/duplicates')
+    assert response.status_code == 200
+
+    data = json.loads(response.data)
+    assert data['total_clusters'] == 2
+    by_match = {cluster['match']: cluster for cluster in data['clusters']}
+    assert [app['id'] for app in by_match['company_role']['applications']] == [1, 2]
+    assert by_match['company_role']['key'] == 'testcompany|softwareengineer'
+    assert [app['id'] for app in by_match['url']['applications']] == [1, 4]
+
+def test_duplicates_report_empty(client, multiple_applications):
+    """Test that distinct applications produce no clusters."""
+    from conftest import insert_test_data
+    insert_test_data(client, multiple_applications)
+
+    data = json.loads(client.get('/api/applications/duplicates').data)
+    assert data == {'total_clusters': 0, 'clusters': []}
+
+def test_init_db_backfills_dedupe_keys(client):
+    """Test that rows written without lookup keys get them on the next init_db."""
+    with client.application.app_context():
+        conn = get_db_connection()
+        conn.execute("""
+            INSERT INTO job_applications (company_name, job_role, applied_date, url, status_id)
+            VALUES ('Acme Inc.', 'Engineer', '2024-01-01', 'https://www.acme.com/jobs/1/', 1)
+        """)
+        conn.commit()
+        conn.close()
+
+        init_db()
+
+        conn = get_db_connection()
+        row = conn.execute('SELECT dedupe_key, url_key FROM job_applications WHERE id = 1').fetchone()
+        conn.close()
+
+    assert row['dedupe_key'] == 'acmeinc|engineer'
+    assert row['url_key'] == 'acme.com/jobs/1'
@@ -0,0 +1,115 @@
+"""Test the Server-Sent Events change feed."""
+
+import pytest
+import json
+from app import app
+from events import EventBroker, stream_events
+
+def read_events(chunks):
+    """Parse SSE text into (event, data) pairs, skipping comments and retry hints."""
+    parsed = []
+    for message in ''.join(chunks).split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.splitlines() if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+@pytest.fixture
+def short_stream(monkeypatch):
+    """Make /api/events streams end quickly."""
+    monkeypatch.setenv('SSE_HEARTBEAT_SECONDS', '0.05')
+    monkeypatch.setenv('SSE_TIMEOUT_SECONDS', '0.2')
+
+def test_events_stream_write_routes(client, sample_data, short_stream):
+    """Test that add, edit and delete publish events with summary counts."""
+    response = client.get('/api/events')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    client.post('/add', json=sample_data, content_type='application/json')
+    client.post('/edit/1', json=dict(sample_data, status='Interview 1'), content_type='application/json')
+    client.post('/delete/1')
+
+    received = read_events(chunk.decode() for chunk in response.response)
+    assert [event for event, _ in received] == ['created', 'updated', 'deleted']
+
+    created, updated, deleted = (data for _, data in received)
+    assert created['application']['company_name'] == 'Test Company'
+    assert created['summary'] == {'total': 1, 'by_status': {'Applied': 1}}
+    assert [entry['status'] for entry in updated['application']['status_history']] == ['Applied', 'Interview 1']
+    assert updated['summary']['by_status'] == {'Interview 1': 1}
+    assert deleted == {'id': 1, 'application': None, 'summary': {'total': 0, 'by_status': {}}}
+
+def test_events_stream_sends_heartbeats(client, short_stream):
+    """Test that an idle stream sends heartbeat comments and then closes."""
+    response = client.get('/api/events')
+    body = ''.join(chunk.decode() for chunk in response.response)
+    assert body.startswith('retry: ')
+    assert ': heartbeat' in body
+    assert read_events([body]) == [('ready', {})]
+
+def test_ready_event_carries_resume_position(client, sample_data, short_stream):
+    """Test that a fresh stream's ready id replays changes made after it."""
+    idle = client.get('/api/events')
+    body = ''.join(chunk.decode() for chunk in idle.response)
+    ready_id = body.split('id: ')[1].split('\n')[0]
+
+    client.post('/add', json=sample_data, content_type='application/json')
+
+    replay = client.get(f'/api/events?last_event_id={ready_id}')
+    received = read_events(chunk.decode() for chunk in replay.response)
+    assert [event for event, _ in received] == ['created']
+
+def test_broker_bounded_queue_triggers_resync():
+    """Test that a subscriber that falls behind is told to resync instead of growing."""
+    broker = EventBroker(queue_size=2)
+    subscription = broker.subscribe()
+    for i in range(3):
+        broker.publish('created', {'id': i})
+
+    assert subscription.overflowed is True
+    assert subscription.queue.qsize() == 2
+
+    received = read_events(stream_events(broker, subscription, heartbeat=0.01, timeout=1))
+    assert received == [('resync', {'reason': 'client fell behind'})]
+    assert broker.subscriber_count() == 0
+
+def test_broker_replays_after_last_event_id():
+    """Test that reconnecting clients get missed events from the replay buffer."""
+    broker = EventBroker(replay_size=3)
+    for i in range(1, 6):
+        broker.publish('created', {'id': i})
+
+    subscription = broker.subscribe(last_event_id=broker.event_id(3))
+    assert [event[0] for event in list(subscription.queue.queue)] == [4, 5]
+
+    # Event 2 has fallen out of the replay buffer
+    assert broker.subscribe(last_event_id=broker.event_id(1)).overflowed is True
+    assert broker.subscribe(last_event_id=broker.event_id(5)).overflowed is False
+
+def test_broker_resyncs_unknown_event_ids():
+    """Test that ids from another broker (process or restart) force a resync."""
+    broker = EventBroker()
+    broker.publish('created', {'id': 1})
+
+    assert broker.subscribe(last_event_id=EventBroker().event_id(1)).overflowed is True
+    assert broker.subscribe(last_event_id='garbage').overflowed is True
+    assert broker.subscribe(last_event_id=None).overflowed is False
+
+def test_events_stream_replays_from_query_parameter(client, sample_data, short_stream):
+    """Test that last_event_id in the query string replays missed events."""
+    first = client.get('/api/events')
+    client.post('/add', json=sample_data, content_type='application/json')
+    client.post('/add', json=dict(sample_data, company_name='Second'), content_type='application/json')
+    body = ''.join(chunk.decode() for chunk in first.response)
+    first_id = body.split('id: ')[1].split('\n')[0]
+
+    replay = client.get(f'/api/events?last_event_id={first_id}')
+    received = read_events(chunk.decode() for chunk in replay.response)
+    assert [data['application']['company_name'] for _, data in received] == ['Second']
+
+def test_events_requires_login():
+    """Test that the stream is not available anonymously."""
+    with app.test_client() as anonymous:
+        response = anonymous.get('/api/events')
+        assert response.status_code == 302
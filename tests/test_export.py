@@ -0,0 +1,111 @@
+"""Tests for columnar (Parquet/Arrow) export."""
+
+import io
+import json
+import sys
+import sqlite3
+import pytest
+from datetime import date
+from app import app
+from conftest import insert_test_data
+from export import export_table, write_snapshot
+
+def test_export_without_pyarrow_is_a_clear_error(client, monkeypatch):
+    """Test that the endpoint explains the missing optional dependency."""
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+    response = client.get('/api/export')
+    assert response.status_code == 400
+    assert 'pyarrow' in response.get_json()['message']
+
+@pytest.mark.parametrize('query', ['table=users', 'format=xlsx', 'table=status_history&since=abc', 'since=yesterday'])
+def test_export_rejects_bad_parameters(client, query):
+    """Test validation of table, format and since."""
+    response = client.get(f'/api/export?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_export_requires_login(client):
+    """Test that the export endpoint is authenticated."""
+    client.get('/logout')
+    assert client.get('/api/export').status_code == 302
+
+class TestWithPyarrow:
+    """Round trips through pyarrow, skipped when it is not installed."""
+
+    @pytest.fixture(autouse=True)
+    def pyarrow(self):
+        return pytest.importorskip('pyarrow')
+
+    def read(self, data, fmt):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if fmt == 'parquet':
+            return pq.read_table(io.BytesIO(data))
+        return pa.ipc.open_file(pa.BufferReader(data)).read_all()
+
+    @pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+    def test_endpoint_types(self, client, multiple_applications, fmt):
+        """Test dictionary-encoded status, date and timestamp columns."""
+        import pyarrow as pa
+        insert_test_data(client, multiple_applications)
+
+        response = client.get(f'/api/export?format={fmt}')
+        assert response.status_code == 200
+        assert response.headers['X-Export-Rows'] == '4'
+        table = self.read(response.data, fmt)
+
+        assert pa.types.is_dictionary(table.schema.field('status').type)
+        assert table.schema.field('applied_date').type == pa.date32()
+        assert pa.types.is_timestamp(table.schema.field('last_updated').type)
+        assert table.column('applied_date').to_pylist()[0] == date(2024, 1, 1)
+        assert table.column('status').to_pylist() == [data['status'] for data in multiple_applications]
+
+    def test_endpoint_since_watermark(self, client, multiple_applications):
+        """Test that passing back the watermark returns only newer history rows."""
+        insert_test_data(client, multiple_applications[:2])
+        first = client.get('/api/export?table=status_history')
+        assert first.headers['X-Export-Watermark'] == '2'
+
+        insert_test_data(client, multiple_applications[2:])
+        response = client.get('/api/export?table=status_history&since=2')
+        assert response.headers['X-Export-Rows'] == '2'
+        assert self.read(response.data, 'parquet').column('id').to_pylist() == [3, 4]
+
+    def test_batches_share_one_dictionary(self, client, multiple_applications, tmp_path):
+        """Test Arrow IPC export across several batches with different statuses."""
+        insert_test_data(client, multiple_applications)
+        conn = sqlite3.connect(app.config['DATABASE'])
+        path = tmp_path / 'applications.arrow'
+
+        rows, watermark = export_table(conn, 'job_applications', str(path), 'arrow', batch_size=1)
+        conn.close()
+        assert rows == 4 and watermark
+        table = self.read(path.read_bytes(), 'arrow')
+        assert table.column('status').to_pylist() == [data['status'] for data in multiple_applications]
+
+    def test_incremental_snapshot(self, client, multiple_applications, sample_data, tmp_path):
+        """Test that incremental snapshots add parts holding only new rows."""
+        insert_test_data(client, multiple_applications)
+        conn = sqlite3.connect(app.config['DATABASE'])
+        directory = str(tmp_path / 'snapshot')
+
+        manifest = write_snapshot(conn, directory, 'parquet')
+        assert manifest['tables']['status_history']['watermark'] == 4
+
+        insert_test_data(client, [sample_data])
+        manifest = write_snapshot(conn, directory, 'parquet', incremental=True)
+        history = manifest['tables']['status_history']
+        assert [part['rows'] for part in history['parts']] == [4, 1]
+        assert history['watermark'] == 5
+        assert json.loads((tmp_path / 'snapshot' / 'manifest.json').read_text()) == manifest
+
+        # Nothing changed: no new history part
+        manifest = write_snapshot(conn, directory, 'parquet', incremental=True)
+        assert len(manifest['tables']['status_history']['parts']) == 2
+
+        # A full export replaces the parts
+        manifest = write_snapshot(conn, directory, 'parquet')
+        conn.close()
+        assert [part['rows'] for part in manifest['tables']['status_history']['parts']] == [5]
+        assert not (tmp_path / 'snapshot' / 'status_history' / 'part-00001.parquet').exists()
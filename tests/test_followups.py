@@ -0,0 +1,87 @@
+"""Tests for the /api/followups queue and the stage_entered_at column."""
+
+import pytest
+import sqlite3
+from app import app, get_db_connection
+from conftest import insert_test_data
+from repository import STATUS_ALIASES
+
+def backdate_stage(app_id, timestamp):
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.execute('UPDATE job_applications SET stage_entered_at = ? WHERE id = ?', (timestamp, app_id))
+    conn.commit()
+    conn.close()
+
+def test_followups_lists_stale_open_applications(client, multiple_applications):
+    """Test that only open applications older than the cutoff are listed, oldest first."""
+    insert_test_data(client, multiple_applications)
+    backdate_stage(1, '2020-01-01 00:00:00')
+    backdate_stage(3, '2019-06-01 12:00:00')
+    # Offer is closed, so never needs a follow-up
+    backdate_stage(4, '2018-01-01 00:00:00')
+
+    data = client.get('/api/followups?older_than=30').get_json()
+    assert data['older_than'] == 30
+    assert data['total'] == 2
+    assert [row['company_name'] for row in data['applications']] == ['Company C', 'Company A']
+    assert data['applications'][0]['stage_entered_at'] == '2019-06-01 12:00:00'
+    assert data['applications'][0]['days_in_stage'] > 365
+
+    data = client.get('/api/followups?older_than=30&status=Applied').get_json()
+    assert [row['company_name'] for row in data['applications']] == ['Company A']
+
+def test_followups_default_window(client, sample_data):
+    """Test that fresh applications are not due yet with the default window."""
+    insert_test_data(client, [sample_data])
+
+    assert client.get('/api/followups').get_json()['total'] == 0
+    assert client.get('/api/followups?older_than=0').get_json()['total'] == 1
+
+def test_stage_resets_only_on_status_change(client, sample_data):
+    """Test that edits keep the stage unless the status changes."""
+    insert_test_data(client, [sample_data])
+    backdate_stage(1, '2020-01-01 00:00:00')
+
+    client.post('/edit/1', json=dict(sample_data, notes='Sent a follow-up email'), content_type='application/json')
+    assert client.get('/api/followups?older_than=30').get_json()['total'] == 1
+
+    client.post('/edit/1', json=dict(sample_data, status='Interview 1'), content_type='application/json')
+    assert client.get('/api/followups?older_than=30').get_json()['total'] == 0
+
+    # Written by the same statement pair as the history entry
+    conn = get_db_connection()
+    stage = conn.execute('SELECT stage_entered_at FROM job_applications WHERE id = 1').fetchone()[0]
+    latest = conn.execute('SELECT changed_at FROM status_history WHERE application_id = 1 ORDER BY id DESC').fetchone()[0]
+    conn.close()
+    assert stage == latest
+
+@pytest.mark.parametrize('older_than', ['-1', 'soon', '1.5'])
+def test_followups_rejects_bad_window(client, older_than):
+    """Test validation of older_than."""
+    response = client.get(f'/api/followups?older_than={older_than}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_followups_rejects_unknown_status(client):
+    """Test that a misspelled status is an error rather than an empty queue."""
+    response = client.get('/api/followups?status=Bogus')
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'message': 'Unknown status: Bogus'}
+
+    # Old labels still map to their current ones
+    response = client.get('/api/followups?status=Interview')
+    assert response.status_code == 200
+    assert response.get_json()['statuses'] == [STATUS_ALIASES['Interview']]
+
+def test_followups_query_is_an_index_range_scan(client):
+    """Test that the followups query seeks the (status_id, stage_entered_epoch) index."""
+    conn = get_db_connection()
+    plan = conn.execute('''
+        EXPLAIN QUERY PLAN SELECT * FROM job_applications
+        WHERE status_id IN (1, 4) AND stage_entered_epoch <= 0
+        ORDER BY stage_entered_epoch, id
+    ''').fetchall()
+    conn.close()
+    details = [row[3] for row in plan]
+    assert any('idx_job_applications_followup (status_id=? AND stage_entered_epoch<?)' in detail
+               for detail in details), details
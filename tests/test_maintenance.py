@@ -0,0 +1,117 @@
+"""Test the background database maintenance scheduler."""
+
+import pytest
+import json
+import time
+from app import app, get_db_connection
+from maintenance import MaintenanceScheduler
+
+@pytest.fixture
+def scheduler(client):
+    """A scheduler pointed at the test database."""
+    db_path = app.config['DATABASE']
+    return MaintenanceScheduler(lambda: db_path, tick=0.05)
+
+def test_admin_maintenance_run_and_report(client):
+    """Test that POST runs every task and GET reports the run."""
+    response = client.post('/admin/maintenance', json={})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['success'] is True
+    assert {result['task'] for result in data['results']} == {'wal_checkpoint', 'optimize', 'analyze', 'vacuum'}
+    # The test database is in rollback mode, so there is no WAL to checkpoint
+    expected = {'wal_checkpoint': 'skipped', 'optimize': 'ok', 'analyze': 'ok', 'vacuum': 'ok'}
+    assert {result['task']: result['status'] for result in data['results']} == expected
+
+    status = json.loads(client.get('/admin/maintenance').data)
+    for name, task in status['tasks'].items():
+        assert task['last_status'] == expected[name]
+        assert task['last_duration_ms'] >= 0
+        assert task['last_finished'] is not None
+        assert task['next_due'] is not None
+    assert status['requests_per_minute'] >= 2
+    assert status['unparsed_dates'] == {}
+
+def test_admin_maintenance_single_task(client):
+    """Test running one named task."""
+    data = json.loads(client.post('/admin/maintenance', json={'task': 'analyze'}).data)
+    assert [result['task'] for result in data['results']] == ['analyze']
+
+    response = client.post('/admin/maintenance', json={'task': 'defragment'})
+    assert response.status_code == 400
+
+def test_wal_checkpoint_runs_only_in_wal_mode(scheduler):
+    """Test that the checkpoint is skipped in rollback mode and runs under WAL."""
+    [result] = scheduler.run_pending(force=True, only='wal_checkpoint')
+    assert result['status'] == 'skipped'
+    assert 'delete' in result['detail']
+
+    conn = get_db_connection()
+    conn.execute('PRAGMA journal_mode = WAL').fetchall()
+    conn.close()
+    [result] = scheduler.run_pending(force=True, only='wal_checkpoint')
+    assert result['status'] == 'ok'
+    assert result['detail'].startswith('log pages')
+
+def test_run_pending_skips_tasks_not_due(scheduler):
+    """Test that a task does not rerun before its interval elapses."""
+    assert len(scheduler.run_pending()) == 4
+    assert scheduler.run_pending() == []
+
+def test_lease_allows_one_worker(scheduler, client):
+    """Test that a second scheduler on the same database stands by while the lease is held."""
+    other = MaintenanceScheduler(scheduler.get_db_path)
+
+    assert scheduler.run_pending(force=True)
+    assert other.run_pending(force=True) == []
+
+def test_heavy_tasks_back_off_when_busy(scheduler):
+    """Test that vacuum is deferred under load and retried later."""
+    scheduler.busy_requests_per_minute = 1
+    for _ in range(5):
+        scheduler.record_request()
+
+    results = {result['task']: result['status'] for result in scheduler.run_pending()}
+    assert results['vacuum'] == 'deferred'
+    assert results['analyze'] == 'ok'
+
+    scheduler.busy_requests_per_minute = 1000
+    results = {result['task']: result['status'] for result in scheduler.run_pending()}
+    assert results == {'vacuum': 'ok'}
+
+def test_incremental_vacuum_releases_deleted_pages(scheduler, client, sample_data):
+    """Test that vacuum returns pages freed by deletes."""
+    with client.application.app_context():
+        conn = get_db_connection()
+        assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        conn.executemany(
+            'INSERT INTO job_applications (company_name, job_role, applied_date, notes) VALUES (?, ?, ?, ?)',
+            [('Company', 'Role', '2024-01-01', 'x' * 2000) for _ in range(200)]
+        )
+        conn.execute('DELETE FROM job_applications')
+        conn.commit()
+        free_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        conn.close()
+
+    assert free_before > 0
+    scheduler.vacuum_pages = 10000
+    scheduler.run_pending(force=True, only='vacuum')
+
+    with client.application.app_context():
+        conn = get_db_connection()
+        assert conn.execute('PRAGMA freelist_count').fetchone()[0] < free_before
+        conn.close()
+
+def test_background_thread_ticks(scheduler):
+    """Test that the thread starts, runs a tick and stops."""
+    assert scheduler.start() is True
+    assert scheduler.start() is False
+    try:
+        deadline = time.time() + 5
+        while scheduler.last_tick is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert scheduler.last_tick is not None
+        assert scheduler.status()['running'] is True
+    finally:
+        scheduler.stop()
+    assert scheduler.status()['running'] is False
@@ -0,0 +1,114 @@
+"""Tests for on-demand request profiling."""
+
+import os
+import pstats
+import pytest
+from app import app
+from conftest import insert_test_data
+from profiling import ROOT, RequestProfile, categorize
+
+@pytest.fixture
+def profiling(tmp_path, monkeypatch):
+    """Allow profiling and keep profiles under tmp_path."""
+    monkeypatch.setenv('PROFILING_ENABLED', '1')
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path / 'profiles'))
+    return tmp_path / 'profiles'
+
+def test_profile_is_saved_and_listed(client, multiple_applications, profiling):
+    """Test that an opted-in request is profiled and summarized by category."""
+    insert_test_data(client, multiple_applications)
+
+    response = client.get('/api/applications?sort=status', headers={'X-Profile': '1'})
+    assert response.status_code == 200
+    name = response.headers['X-Profile-Id']
+    assert sorted(os.listdir(profiling)) == [f'{name}.json', f'{name}.prof']
+
+    listing = client.get('/admin/profiles').get_json()
+    assert listing['enabled'] is True
+    assert listing['keep'] == 20
+    profile, = listing['profiles']
+    assert profile['name'] == name
+    assert profile['path'] == '/api/applications?sort=status'
+    assert profile['status'] == 200
+    assert profile['wall_ms'] > 0
+    assert set(profile['categories']) == {'flask', 'jinja', 'sqlite3', 'app', 'other'}
+    assert profile['categories']['sqlite3'] > 0
+    assert profile['categories']['app'] > 0
+    assert len(profile['top']) <= 15
+    self_times = [function['self_ms'] for function in profile['top']]
+    assert self_times == sorted(self_times, reverse=True)
+
+    download = client.get(f'/admin/profiles/{name}')
+    assert download.status_code == 200
+    (profiling / 'download.prof').write_bytes(download.data)
+    stats = pstats.Stats(str(profiling / 'download.prof'))
+    assert any(funcname == 'api_applications' for _, _, funcname in stats.stats)
+
+def test_profiling_needs_opt_in_login_and_env(client, tmp_path, monkeypatch):
+    """Test that nothing is profiled unless enabled, asked for and logged in."""
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path / 'profiles'))
+
+    response = client.get('/api/summary?_profile=1')
+    assert 'X-Profile-Id' not in response.headers
+    assert response.headers['X-Profile-Skipped'] == 'disabled'
+
+    monkeypatch.setenv('PROFILING_ENABLED', '1')
+    response = client.get('/api/summary')
+    assert 'X-Profile-Id' not in response.headers
+    assert 'X-Profile-Skipped' not in response.headers
+
+    client.get('/logout')
+    response = client.get('/login?_profile=1')
+    assert 'X-Profile-Id' not in response.headers
+    assert 'X-Profile-Skipped' not in response.headers
+    assert not (tmp_path / 'profiles').exists()
+
+def test_profiles_ring_is_bounded(client, profiling, monkeypatch):
+    """Test that only the newest PROFILE_KEEP profiles are kept."""
+    monkeypatch.setenv('PROFILE_KEEP', '2')
+    names = [client.get('/api/summary', headers={'X-Profile': '1'}).headers['X-Profile-Id'] for _ in range(3)]
+
+    listed = [profile['name'] for profile in client.get('/admin/profiles').get_json()['profiles']]
+    assert listed == names[:0:-1]
+    assert len(os.listdir(profiling)) == 4
+    assert client.get(f'/admin/profiles/{names[0]}').status_code == 404
+    assert client.get('/admin/profiles/..%2Fjob_tracker').status_code == 404
+
+def test_one_profile_at_a_time(client, profiling):
+    """Test that an overlapping opt-in is served without a profile."""
+    running = RequestProfile.start()
+    try:
+        response = client.get('/api/summary', headers={'X-Profile': '1'})
+    finally:
+        running.stop()
+    assert response.status_code == 200
+    assert response.headers['X-Profile-Skipped'] == 'busy'
+    assert 'X-Profile-Id' in client.get('/api/summary', headers={'X-Profile': '1'}).headers
+
+def test_failed_request_releases_profiler(client, profiling, monkeypatch):
+    """Test that an exception inside a profiled request does not leave the profiler running."""
+    import app as app_module
+
+    def broken(*args, **kwargs):
+        raise RuntimeError('boom')
+    monkeypatch.setattr(app_module.repository, 'summary', broken)
+    monkeypatch.setitem(app.config, 'PROPAGATE_EXCEPTIONS', False)
+    assert client.get('/api/summary', headers={'X-Profile': '1'}).status_code == 500
+    monkeypatch.undo()
+
+    running = RequestProfile.start()
+    assert running is not None
+    running.stop()
+
+@pytest.mark.parametrize('filename, funcname, category', [
+    ('~', "<method 'execute' of 'sqlite3.Connection' objects>", 'sqlite3'),
+    ('/usr/lib/python3.11/site-packages/flask/app.py', 'dispatch_request', 'flask'),
+    ('/usr/lib/python3.11/site-packages/werkzeug/routing/map.py', 'match', 'flask'),
+    ('/usr/lib/python3.11/site-packages/jinja2/environment.py', 'render', 'jinja'),
+    (os.path.join(ROOT, 'templates', 'index.html'), 'root', 'jinja'),
+    (os.path.join(ROOT, 'repository.py'), 'list', 'app'),
+    ('/usr/lib/python3.11/json/encoder.py', 'iterencode', 'other'),
+])
+def test_categorize(filename, funcname, category):
+    """Test that functions are attributed to Flask, Jinja, sqlite3, our code or other."""
+    assert categorize(filename, funcname) == category
@@ -0,0 +1,356 @@
+"""Conformance tests shared by every storage engine."""
+
+import pytest
+import json
+import sqlite3
+import app as app_module
+from app import app
+from repository import ApplicationRepository, SQLiteRepository, MemoryRepository, SORT_COLUMNS
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def repository(request, tmp_path):
+    """One repository per engine, each starting empty."""
+    if request.param == 'sqlite':
+        # The client fixture creates and initializes a fresh database
+        request.getfixturevalue('client')
+        yield SQLiteRepository(lambda: app.config['DATABASE'])
+    else:
+        store = MemoryRepository(str(tmp_path / 'store.json'))
+        yield store
+        store.close()
+
+def add_many(repository, multiple_applications):
+    return [repository.add(data) for data in multiple_applications]
+
+def test_add_returns_application_with_history(repository, sample_data):
+    """Test that add stores every field and the first history entry."""
+    application = repository.add(sample_data)
+
+    assert application['id'] == 1
+    for field, value in sample_data.items():
+        assert application[field] == value
+    assert application['last_updated']
+    assert [entry['status'] for entry in application['status_history']] == ['Applied']
+    assert repository.get(1) == application
+    assert repository.add(sample_data)['id'] == 2
+
+def test_get_missing_returns_none(repository):
+    """Test that unknown ids are reported as None."""
+    assert repository.get(42) is None
+    assert repository.update(42, {'company_name': 'X', 'job_role': 'Y', 'applied_date': '2024-01-01', 'status': 'Applied'}) == (None, None)
+    assert repository.delete(42) == (None, None)
+
+def test_update_records_status_changes(repository, sample_data):
+    """Test that update returns the old status and appends history only on a change."""
+    repository.add(sample_data)
+
+    old_status, application = repository.update(1, dict(sample_data, status='Interview 1'))
+    assert old_status == 'Applied'
+    assert application['status'] == 'Interview 1'
+    assert [entry['status'] for entry in application['status_history']] == ['Applied', 'Interview 1']
+
+    old_status, application = repository.update(1, dict(sample_data, status='Interview 1', notes='Same status'))
+    assert old_status == 'Interview 1'
+    assert application['notes'] == 'Same status'
+    assert len(application['status_history']) == 2
+
+def test_delete_removes_application_and_history(repository, sample_data):
+    """Test that delete returns the old status and forgets the application."""
+    repository.add(sample_data)
+
+    assert repository.delete(1) == ('Applied', False)
+    assert repository.get(1) is None
+    rows, histories = repository.list()
+    assert rows == [] and histories == {}
+
+@pytest.mark.parametrize('sort', SORT_COLUMNS)
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_list_sorting(repository, multiple_applications, sort, order):
+    """Test that every sort column orders rows like SQL ORDER BY."""
+    add_many(repository, multiple_applications)
+    repository.update(2, dict(multiple_applications[1], status='Applied'))
+
+    rows, _ = repository.list(sort=sort, order=order)
+    values = [row[sort] for row in rows]
+    assert values == sorted(values, reverse=order == 'desc')
+
+@pytest.mark.parametrize('filters, expected', [
+    ({'status': ['Applied', 'Offer']}, ['Company A', 'Company D']),
+    ({'applied_from': '2024-01-02'}, ['Company B', 'Company C', 'Company D']),
+    ({'applied_to': '2024-01-02'}, ['Company A', 'Company B']),
+    ({'applied_from': '2024-01-02', 'applied_to': '2024-01-03'}, ['Company B', 'Company C']),
+    ({'updated_since': '2000-01-01'}, ['Company A', 'Company B', 'Company C', 'Company D']),
+    ({'updated_since': '2999-01-01'}, []),
+    ({'company': 'company c'}, ['Company C']),
+    ({'company': 'Comp', 'status': ['Interview 1']}, ['Company C']),
+])
+def test_list_filters(repository, multiple_applications, filters, expected):
+    """Test that filters select the same rows in every engine."""
+    add_many(repository, multiple_applications)
+
+    rows, histories = repository.list(filters, sort='company_name', order='asc')
+    assert [row['company_name'] for row in rows] == expected
+    assert sorted(histories) == sorted(row['id'] for row in rows)
+
+def test_list_columns_and_history(repository, multiple_applications):
+    """Test that only requested columns are returned and history is optional."""
+    add_many(repository, multiple_applications)
+
+    rows, histories = repository.list(columns=['id', 'status'], include_history=False)
+    assert histories is None
+    assert all(set(row) == {'id', 'status'} for row in rows)
+
+    rows, _ = repository.list(columns=['id', 'archived'], include_history=False, include_archived=True)
+    assert all(row['archived'] == 0 for row in rows)
+
+def test_summary_counts(repository, multiple_applications):
+    """Test that summary counts follow adds, updates and deletes."""
+    add_many(repository, multiple_applications)
+    repository.update(1, dict(multiple_applications[0], status='Offer'))
+    repository.delete(3)
+
+    assert repository.summary() == {
+        'total': 3,
+        'by_status': {'Offer': 2, 'Denied without interview (visa related)': 1}
+    }
+
+def test_find_duplicates(repository, sample_data):
+    """Test duplicate lookup by normalized company/role and by canonical URL."""
+    repository.add(sample_data)
+    repository.add(dict(sample_data, company_name='Other', job_role='Other', url='https://www.example.com/job/?utm_source=x'))
+    repository.add(dict(sample_data, company_name='Unrelated', job_role='Role', url=''))
+
+    by_key = repository.find_duplicates(' test  company ', 'SOFTWARE ENGINEER', '')
+    assert [row['id'] for row in by_key] == [1]
+
+    by_url = repository.find_duplicates('New', 'New', 'example.com/job')
+    assert [row['id'] for row in by_url] == [1, 2]
+    assert set(by_url[0]) == {'id', 'company_name', 'job_role', 'applied_date', 'status', 'url'}
+
+    assert repository.find_duplicates('Test Company', 'Software Engineer', '', exclude_id=1) == []
+
+def test_version_changes_on_every_write(repository, sample_data):
+    """Test that the version (used for ETags) moves with each write."""
+    versions = [repository.version()]
+    repository.add(sample_data)
+    versions.append(repository.version())
+    repository.update(1, dict(sample_data, status='Offer'))
+    versions.append(repository.version())
+    repository.delete(1)
+    versions.append(repository.version())
+
+    assert len(set(versions)) == 4
+    assert repository.version() == versions[-1]
+
+# Memory engine persistence
+
+def test_memory_store_replays_log_after_restart(tmp_path, sample_data):
+    """Test that writes survive a restart through the append log alone."""
+    path = str(tmp_path / 'store.json')
+    store = MemoryRepository(path, snapshot_every=100)
+    store.add(sample_data)
+    store.update(1, dict(sample_data, status='Interview 1'))
+    store.add(dict(sample_data, company_name='Second'))
+    store.delete(2)
+    version = store.version()
+    store.close()
+
+    reopened = MemoryRepository(path)
+    assert reopened.version() == version
+    assert [entry['status'] for entry in reopened.get(1)['status_history']] == ['Applied', 'Interview 1']
+    assert reopened.get(2) is None
+    assert reopened.add(sample_data)['id'] == 3
+    reopened.close()
+
+def test_memory_store_snapshots_and_truncates_log(tmp_path, sample_data):
+    """Test that a snapshot is written every N writes and the log restarts."""
+    path = tmp_path / 'store.json'
+    store = MemoryRepository(str(path), snapshot_every=3)
+    for i in range(4):
+        store.add(dict(sample_data, company_name=f'Company {i}'))
+    store.close()
+
+    snapshot = json.loads(path.read_text())
+    assert len(snapshot['rows']) == 3
+    assert len((tmp_path / 'store.json.log').read_text().splitlines()) == 1
+
+    reopened = MemoryRepository(str(path))
+    assert reopened.summary()['total'] == 4
+    reopened.close()
+
+def test_memory_store_skips_entries_already_in_snapshot(tmp_path, sample_data):
+    """Test that a crash between snapshot and log truncation does not apply writes twice."""
+    path = str(tmp_path / 'store.json')
+    store = MemoryRepository(path, snapshot_every=100)
+    store.add(sample_data)
+    store.update(1, dict(sample_data, status='Offer'))
+    log = open(f'{path}.log').read()
+    store.snapshot()
+    store.close()
+
+    # Simulate the old log surviving the snapshot, plus a torn final write
+    with open(f'{path}.log', 'w') as f:
+        f.write(log + '{"op": "add", "row": {')
+
+    reopened = MemoryRepository(path)
+    assert [entry['status'] for entry in reopened.get(1)['status_history']] == ['Applied', 'Offer']
+    assert reopened.summary()['total'] == 1
+    reopened.close()
+
+def test_memory_store_loads_rows_written_without_archived(tmp_path, sample_data):
+    """Test that snapshots and logs from before rows carried archived still list."""
+    path = tmp_path / 'store.json'
+    store = MemoryRepository(str(path), snapshot_every=100)
+    store.add(sample_data)
+    store.snapshot()
+    store.add(dict(sample_data, company_name='Second'))
+    store.close()
+
+    snapshot = json.loads(path.read_text())
+    for row in snapshot['rows']:
+        del row['archived']
+    path.write_text(json.dumps(snapshot))
+    log = tmp_path / 'store.json.log'
+    entry = json.loads(log.read_text())
+    del entry['row']['archived']
+    log.write_text(json.dumps(entry) + '\n')
+
+    reopened = MemoryRepository(str(path))
+    rows, _ = reopened.list(columns=['id', 'archived'], include_history=False)
+    assert sorted(rows, key=lambda row: row['id']) == [{'id': 1, 'archived': 0}, {'id': 2, 'archived': 0}]
+    reopened.close()
+
+def test_incomplete_engine_fails_on_construction():
+    """Test that an engine missing part of the interface cannot be created."""
+    class Incomplete(ApplicationRepository):
+        def add(self, fields):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_routes_run_on_memory_engine(client, sample_data, monkeypatch):
+    """Test the JSON API end to end with the memory engine plugged in."""
+    monkeypatch.setattr(app_module, 'repository', MemoryRepository())
+
+    response = client.post('/add', json=sample_data, content_type='application/json')
+    assert response.get_json()['application']['id'] == 1
+    client.post('/edit/1', json=dict(sample_data, status='Offer'), content_type='application/json')
+
+    rows = client.get('/api/applications?status=Offer').get_json()
+    assert [row['company_name'] for row in rows] == ['Test Company']
+    assert [entry['status'] for entry in rows[0]['status_history']] == ['Applied', 'Offer']
+    assert client.get('/api/summary').get_json() == {'total': 1, 'by_status': {'Offer': 1}}
+    assert client.get('/').status_code == 200
+
+    # Archiving and duplicate clustering need the SQLite schema
+    assert client.post('/api/archive', json={'ids': [1]}).status_code == 400
+    assert client.get('/api/applications/duplicates').status_code == 400
+
+def test_followups_by_status_and_stage_age(repository, multiple_applications):
+    """Test that followups filters by status and when the stage was entered."""
+    add_many(repository, multiple_applications)
+    repository.update(3, dict(multiple_applications[2], notes='Same stage'))
+
+    rows = repository.followups(['Applied', 'Interview 1'], '2999-01-01 00:00:00')
+    assert [row['company_name'] for row in rows] == ['Company A', 'Company C']
+    assert set(rows[0]) == {'id', 'company_name', 'job_role', 'applied_date', 'url', 'status', 'stage_entered_at'}
+    history = repository.get(1)['status_history']
+    assert rows[0]['stage_entered_at'] == history[-1]['changed_at']
+
+    assert repository.followups(['Applied', 'Interview 1'], '2000-01-01 00:00:00') == []
+    assert repository.followups([], '2999-01-01 00:00:00') == []
+
+    repository.update(1, dict(multiple_applications[0], status='Offer'))
+    rows = repository.followups(['Applied', 'Interview 1'], '2999-01-01 00:00:00')
+    assert [row['company_name'] for row in rows] == ['Company C']
+
+def test_autocomplete_ranks_values_by_use(repository, sample_data):
+    """Test prefix matching, case-insensitive counting and incremental updates."""
+    for company, role in [('Acme', 'Engineer'), ('acme', 'Engineer'), ('Acme', 'Designer'),
+                          ('Acorn', 'Engineer'), ('Beta', 'Engineer')]:
+        repository.add(dict(sample_data, company_name=company, job_role=role))
+
+    assert repository.autocomplete('company_name', 'ac') == [{'value': 'Acme', 'uses': 3},
+                                                             {'value': 'Acorn', 'uses': 1}]
+    assert repository.autocomplete('company_name', 'ACO') == [{'value': 'Acorn', 'uses': 1}]
+    assert repository.autocomplete('company_name', 'x') == []
+    assert repository.autocomplete('job_role', '', limit=1) == [{'value': 'Engineer', 'uses': 4}]
+
+    # Renaming moves the count; the last use of a value removes it
+    repository.update(4, dict(sample_data, company_name='Beta', job_role='Engineer'))
+    repository.delete(1)
+    assert repository.autocomplete('company_name', 'a') == [{'value': 'Acme', 'uses': 2}]
+    assert repository.autocomplete('company_name', 'b') == [{'value': 'Beta', 'uses': 2}]
+
+def test_statuses_in_display_order(repository):
+    """Test that both engines list the seeded statuses with their terminal flags."""
+    statuses = repository.statuses()
+
+    assert [status['label'] for status in statuses][:2] == ['Applied', 'Denied without interview (visa related)']
+    assert [status['ordinal'] for status in statuses] == sorted(status['ordinal'] for status in statuses)
+    terminal = {status['label'] for status in statuses if status['is_terminal']}
+    assert terminal == {'Offer', 'Denied without interview (visa related)',
+                        'Denied without interview (non-visa related)'}
+
+def backdate_history(repository, app_id, times):
+    """Set the changed_at of an application's history entries, oldest first."""
+    if isinstance(repository, MemoryRepository):
+        for entry, changed_at in zip(repository.history[app_id], times):
+            entry['changed_at'] = changed_at
+        return
+    conn = sqlite3.connect(app.config['DATABASE'])
+    ids = [row[0] for row in conn.execute('SELECT id FROM status_history WHERE application_id = ? ORDER BY id', (app_id,))]
+    for entry_id, changed_at in zip(ids, times):
+        conn.execute('UPDATE status_history SET changed_at = ? WHERE id = ?', (changed_at, entry_id))
+    conn.commit()
+    conn.close()
+
+def test_list_and_summary_as_of(repository, sample_data):
+    """Test that as_of replays statuses, filters, sorts and history from the past."""
+    for company in ('A', 'B', 'C'):
+        repository.add(dict(sample_data, company_name=company))
+    repository.update(1, dict(sample_data, company_name='A', status='Interview 1'))
+    repository.update(1, dict(sample_data, company_name='A', status='Offer'))
+    repository.update(2, dict(sample_data, company_name='B', status='Interview 1'))
+    backdate_history(repository, 1, ['2024-01-01 09:00:00', '2024-02-01 09:00:00', '2024-03-01 09:00:00'])
+    # Two changes in the same second: the later entry wins
+    backdate_history(repository, 2, ['2024-01-15 09:00:00', '2024-01-15 09:00:00'])
+    backdate_history(repository, 3, ['2024-03-05 09:00:00'])
+
+    def statuses(as_of, **kwargs):
+        rows, _ = repository.list(sort='company_name', order='asc', include_history=False, as_of=as_of, **kwargs)
+        return [(row['company_name'], row['status']) for row in rows]
+
+    assert statuses('2023-12-31 23:59:59') == []
+    assert statuses('2024-01-10 23:59:59') == [('A', 'Applied')]
+    assert statuses('2024-02-01 09:00:00') == [('A', 'Interview 1'), ('B', 'Interview 1')]
+    assert statuses('2024-03-31 23:59:59') == [('A', 'Offer'), ('B', 'Interview 1'), ('C', 'Applied')]
+    assert statuses('2024-02-15 23:59:59', filters={'status': ['Interview 1']}) == [('A', 'Interview 1'),
+                                                                                    ('B', 'Interview 1')]
+
+    rows, _ = repository.list(sort='status', order='desc', include_history=False, as_of='2024-03-31 23:59:59')
+    assert [row['status'] for row in rows] == ['Offer', 'Interview 1', 'Applied']
+
+    rows, histories = repository.list(as_of='2024-02-15 23:59:59')
+    assert [entry['status'] for entry in histories[1]] == ['Applied', 'Interview 1']
+    assert set(histories) == {1, 2}
+
+    assert repository.summary(as_of='2024-02-15 23:59:59') == {'total': 2, 'by_status': {'Interview 1': 2}}
+    assert repository.summary(as_of='2024-01-10 23:59:59') == {'total': 1, 'by_status': {'Applied': 1}}
+
+def test_as_of_reads_are_cached_until_a_write(repository, sample_data):
+    """Test that repeated as_of reads come from the cache and a write invalidates it."""
+    repository.add(sample_data)
+    as_of = '2999-01-01 00:00:00'
+
+    first, _ = repository.list(as_of=as_of)
+    first[0]['status_history'] = 'changed by the caller'
+    again, _ = repository.list(as_of=as_of)
+    assert repository.as_of_cache.hits == 1
+    assert 'status_history' not in again[0]
+    assert repository.summary(as_of=as_of) == repository.summary(as_of=as_of) == {'total': 1, 'by_status': {'Applied': 1}}
+    assert repository.as_of_cache.hits == 2
+
+    repository.update(1, dict(sample_data, status='Offer'))
+    assert repository.summary(as_of=as_of) == {'total': 1, 'by_status': {'Offer': 1}}
@@ -0,0 +1,94 @@
+"""Tests for the statuses lookup table and the migration to status ids."""
+
+import sqlite3
+from app import app, init_db, migrate_status_ids
+from conftest import insert_test_data
+
+LEGACY_SCHEMA = '''
+    DROP TABLE job_applications;
+    DROP TABLE status_history;
+    CREATE TABLE job_applications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, company_name TEXT NOT NULL, job_role TEXT NOT NULL,
+        applied_date DATE NOT NULL, url TEXT, status TEXT NOT NULL DEFAULT 'Applied', notes TEXT,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE status_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, application_id INTEGER NOT NULL,
+        status TEXT NOT NULL, changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_job_applications_status ON job_applications(status);
+    INSERT INTO job_applications (company_name, job_role, applied_date, status) VALUES
+        ('A', 'Dev', '2024-03-01', 'Offer'),
+        ('B', 'Dev', '2024-03-02', 'Waiting for hearback'),
+        ('C', 'Dev', '2024-03-03', 'Ghosted'),
+        ('D', 'Dev', '2024-03-04', 'Offer');
+    INSERT INTO status_history (application_id, status, changed_at) VALUES
+        (1, 'Applied', '2024-03-01 09:00:00'), (1, 'Offer', '2024-03-05 09:00:00'),
+        (2, 'Waiting for hearback', '2024-03-02 09:00:00'), (3, 'Ghosted', '2024-03-03 09:00:00');
+'''
+
+def make_legacy_database():
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.executescript(LEGACY_SCHEMA)
+    conn.commit()
+    return conn
+
+def columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_xinfo({table})')}
+
+def test_migration_converts_in_batches(client):
+    """Test that text statuses become ids, in batches, and the text column is dropped."""
+    conn = make_legacy_database()
+
+    assert migrate_status_ids(conn, batch_size=3) == 8
+    for table in ('job_applications', 'status_history'):
+        assert 'status' not in columns(conn, table)
+        assert conn.execute(f'SELECT COUNT(*) FROM {table} WHERE status_id IS NULL').fetchone()[0] == 0
+    labels = conn.execute('''
+        SELECT label FROM job_applications JOIN statuses ON statuses.id = status_id ORDER BY job_applications.id
+    ''').fetchall()
+    assert [label for (label,) in labels] == ['Offer', 'Applied', 'Ghosted', 'Offer']
+    # Unknown labels are kept as statuses of their own, after the seeded ones
+    ghosted = conn.execute("SELECT ordinal, is_terminal FROM statuses WHERE label = 'Ghosted'").fetchone()
+    assert ghosted == (conn.execute('SELECT MAX(ordinal) FROM statuses').fetchone()[0], 0)
+
+    # Already migrated: nothing left to do
+    assert migrate_status_ids(conn) == 0
+    conn.close()
+
+def test_legacy_database_serves_labels_after_init(client):
+    """Test that init_db migrates an old database and the API keeps returning labels."""
+    make_legacy_database().close()
+    init_db()
+
+    data = client.get('/api/applications?sort=company_name&order=asc').get_json()
+    assert [app['status'] for app in data] == ['Offer', 'Applied', 'Ghosted', 'Offer']
+    assert [entry['status'] for entry in data[0]['status_history']] == ['Applied', 'Offer']
+    assert client.get('/api/summary').get_json()['by_status'] == {'Offer': 2, 'Applied': 1, 'Ghosted': 1}
+
+def test_writes_validate_status_labels(client, sample_data):
+    """Test that unknown statuses are rejected and old labels are mapped."""
+    response = client.post('/add', json=dict(sample_data, status='Hired?'), content_type='application/json')
+    assert response.status_code == 400
+    assert 'Unknown status' in response.get_json()['message']
+
+    response = client.post('/add', json=dict(sample_data, status='Interview'), content_type='application/json')
+    assert response.get_json()['application']['status'] == 'Interview 1'
+
+    response = client.post('/edit/1', json=dict(sample_data, status='Hired?'), content_type='application/json')
+    assert response.status_code == 400
+
+def test_summary_cards_come_from_the_table(client, sample_data):
+    """Test that a status added to the table gets a summary card and can be used."""
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.execute("INSERT INTO statuses (label, ordinal, is_terminal) VALUES ('Withdrawn', 100, 1)")
+    conn.commit()
+    conn.close()
+
+    page = client.get('/').data.decode()
+    assert 'data-status="Withdrawn"' in page
+    assert page.index('data-status="Applied"') < page.index('data-status="Offer"') < page.index('data-status="Withdrawn"')
+
+    insert_test_data(client, [dict(sample_data, status='Withdrawn')])
+    assert client.get('/api/summary').get_json()['by_status'] == {'Withdrawn': 1}
+    assert client.get('/api/followups?older_than=0').get_json()['total'] == 0
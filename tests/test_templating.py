@@ -0,0 +1,84 @@
+"""Tests for template precompilation and the page cache."""
+
+import json
+import os
+import pytest
+import app as app_module
+from app import app
+from templating import MANIFEST, compile_templates, use_precompiled
+
+@pytest.fixture
+def source_loader(monkeypatch):
+    """Restore the template loader after a test swaps it."""
+    monkeypatch.setattr(app.jinja_env, 'loader', app.jinja_env.loader)
+
+def test_precompiled_templates_render_without_parsing(client, source_loader, tmp_path, monkeypatch):
+    """Test that a matching build is loaded as modules, not parsed from source."""
+    expected = client.get('/add').get_data(as_text=True)
+    names = compile_templates(app, str(tmp_path))
+    assert {'add.html', 'edit.html', 'index.html', 'login.html', '_flashes.html'} <= set(names)
+    assert (tmp_path / MANIFEST).exists()
+
+    assert use_precompiled(app, str(tmp_path))
+
+    def no_parsing(*args, **kwargs):
+        raise AssertionError('template was parsed from source')
+    monkeypatch.setattr(app.jinja_env, '_parse', no_parsing)
+    app_module.pages.clear()
+    assert client.get('/add').get_data(as_text=True) == expected
+
+def test_stale_build_is_ignored(client, source_loader, tmp_path):
+    """Test that templates edited since the build load from source."""
+    compile_templates(app, str(tmp_path))
+    manifest_path = tmp_path / MANIFEST
+    manifest = json.loads(manifest_path.read_text())
+    manifest['login.html'] = 'outdated'
+    manifest_path.write_text(json.dumps(manifest))
+    loader = app.jinja_env.loader
+
+    assert not use_precompiled(app, str(tmp_path))
+    assert not use_precompiled(app, os.path.join(str(tmp_path), 'missing'))
+    assert app.jinja_env.loader is loader
+
+def test_login_page_is_cached_with_flashes_per_request(client):
+    """Test that /login is rendered once but still shows each request's flash messages."""
+    # A fresh session, so nothing is left over from the fixture's login
+    visitor = app.test_client()
+    app_module.pages.clear()
+    first = visitor.get('/login').get_data(as_text=True)
+    assert 'class="alert' not in first
+    assert any(key[0] == 'login.html' for key in app_module.pages._pages)
+
+    page = visitor.post('/login', data={'username': 'test_user', 'password': 'wrong'}).get_data(as_text=True)
+    assert page.count('class="alert') == 1
+    assert '<div class="alert alert-error">' in page
+    assert 'Invalid username or password' in page
+    # Apart from the message the page is the cached one
+    start = page.index('<div class="alert')
+    end = page.index('</div>', start) + len('</div>')
+    assert ''.join((page[:start] + page[end:]).split()) == ''.join(first.split())
+
+    # The message was shown once and is gone on the next request
+    assert visitor.get('/login').get_data(as_text=True) == first
+
+def test_add_page_cache_follows_statuses(client):
+    """Test that the /add form is cached per set of statuses."""
+    app_module.pages.clear()
+    assert client.get('/add').status_code == 200
+    assert client.get('/add').status_code == 200
+    assert len([key for key in app_module.pages._pages if key[0] == 'add.html']) == 1
+
+    with app.app_context():
+        conn = app_module.get_db_connection()
+        conn.execute("INSERT INTO statuses (id, label, is_terminal, ordinal) VALUES (99, 'Withdrawn', 1, 99)")
+        conn.commit()
+        conn.close()
+    assert 'Withdrawn' in client.get('/add').get_data(as_text=True)
+
+def test_page_cache_is_off_when_templates_auto_reload(client, monkeypatch):
+    """Test that debug-style auto reload renders every request from the template."""
+    monkeypatch.setattr(app.jinja_env, 'auto_reload', True)
+    app_module.pages.clear()
+    client.get('/logout')
+    assert client.get('/login').status_code == 200
+    assert app_module.pages._pages == {}
@@ -1,4 +1,6 @@
-from app import app
+from app import app, start_maintenance
+
+start_maintenance()
 
 if __name__ == "__main__":
     app.run()